@@ -12,6 +12,10 @@ import logging
 import sys
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.core.cache import HashStore, SymbolCache
 
 __version__ = "0.1.0"
 
@@ -23,13 +27,16 @@ logger = logging.getLogger(__name__)
 
 def build_parser() -> argparse.ArgumentParser:
     """Build the CLI argument parser."""
+    from src.core.git import HASH_STRATEGY_NAMES
+
     parser = argparse.ArgumentParser(
         prog="codebase-graph",
         description="Generate a live, token-efficient structural map of a codebase.",
         epilog="Examples:\n"
         "  codebase-graph ./my-project\n"
         "  codebase-graph --watch --dir ./my-project\n"
-        "  codebase-graph ./my-project -o /tmp/map.md\n",
+        "  codebase-graph ./my-project -o /tmp/map.md\n"
+        "  codebase-graph ./my-project --jobs 8\n",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
@@ -57,6 +64,64 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Custom output path (default: <project>/.codebase.md).",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes for the initial parse (default: 1, 0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        default=True,
+        help="Don't read or write the symbol cache and hash store in "
+        "<project>/.codebase-graph/.",
+    )
+    parser.add_argument(
+        "--hash",
+        dest="hash_strategy",
+        choices=HASH_STRATEGY_NAMES,
+        default="sha256",
+        help="How file contents are hashed (default: sha256). xxh3 is fastest "
+        "but needs the xxhash package (falls back to blake2b). 'git' reuses "
+        "blob ids from the git index for unmodified files.",
+    )
+    parser.add_argument(
+        "--stable-timestamp",
+        action="store_true",
+        default=False,
+        help="Only update last_indexed, and rewrite the output file, when the "
+        "map's structure changes.",
+    )
+    parser.add_argument(
+        "--debounce-ms",
+        type=int,
+        default=None,
+        help="Watch mode: quiet period that ends a burst of changes "
+        "(default: 100, 0 = update on every batch).",
+    )
+    parser.add_argument(
+        "--max-latency-ms",
+        type=int,
+        default=None,
+        help="Watch mode: longest a change waits for its burst to end "
+        "(default: 1000).",
+    )
+    parser.add_argument(
+        "--no-git",
+        dest="git_aware",
+        action="store_false",
+        default=True,
+        help="Watch mode: don't use git to detect branch switches in bulk.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        default=False,
+        help="Print memory statistics (shared string pool) after indexing.",
+    )
     parser.add_argument(
         "--format",
         choices=["toon", "json"],
@@ -109,27 +174,53 @@ def resolve_project_dir(args: argparse.Namespace) -> Path:
 # ── One-shot mode ──────────────────────────────────────────────────
 
 
-def run_oneshot(project_dir: Path, output_path: Path | None = None) -> None:
+def run_oneshot(
+    project_dir: Path,
+    output_path: Path | None = None,
+    jobs: int = 1,
+    use_cache: bool = True,
+    stable_timestamp: bool = False,
+    hash_strategy: str = "sha256",
+    stats: bool = False,
+) -> None:
     """Run a one-shot index: parse, build graph, write .codebase.md, exit.
 
     Args:
         project_dir: Absolute path to the project directory.
         output_path: Custom output path, or None for <project>/.codebase.md.
+        jobs: Worker processes for parsing (0 = one per CPU).
+        use_cache: Reuse/persist parsed symbols and file hashes on disk.
+        stable_timestamp: Keep last_indexed unless the structure changed.
+        hash_strategy: Name of the content hash strategy (see --hash).
+        stats: Print memory statistics after the summary.
     """
-    from src.core.watcher import FileFilter, IncrementalPipeline
+    from src.core.watcher import FileFilter, IncrementalPipeline, make_hash_strategy
 
     out = output_path or (project_dir / ".codebase.md")
     file_filter = FileFilter(project_dir)
+    cache = _open_cache(project_dir) if use_cache else None
+    hash_store = _open_hash_store(project_dir) if use_cache else None
 
     pipeline = IncrementalPipeline(
         project_root=project_dir,
         output_path=out,
         project_name=project_dir.name,
         file_filter=file_filter,
+        jobs=jobs,
+        cache=cache,
+        stable_timestamp=stable_timestamp,
+        hash_strategy=make_hash_strategy(hash_strategy),
+        hash_store=hash_store,
     )
 
     t0 = time.monotonic()
-    content = pipeline.full_index()
+    try:
+        content = pipeline.full_index()
+    finally:
+        if cache is not None:
+            cache.close()
+        if hash_store is not None:
+            hash_store.close()
     elapsed_ms = (time.monotonic() - t0) * 1000
 
     # Gather summary stats
@@ -146,12 +237,25 @@ def run_oneshot(project_dir: Path, output_path: Path | None = None) -> None:
         f"{num_modules} modules -> {out.name} "
         f"(~{token_estimate} tokens, {elapsed_ms:.0f}ms)"
     )
+    if stats:
+        _print_stats()
 
 
 # ── Watch mode ─────────────────────────────────────────────────────
 
 
-def run_watch(project_dir: Path, output_path: Path | None = None) -> None:
+def run_watch(
+    project_dir: Path,
+    output_path: Path | None = None,
+    jobs: int = 1,
+    use_cache: bool = True,
+    stable_timestamp: bool = False,
+    debounce_ms: int | None = None,
+    max_latency_ms: int | None = None,
+    git_aware: bool = True,
+    hash_strategy: str = "sha256",
+    stats: bool = False,
+) -> None:
     """Run watch mode: initial index then watch for changes.
 
     Handles Ctrl+C gracefully. Prints change notifications.
@@ -159,30 +263,50 @@ def run_watch(project_dir: Path, output_path: Path | None = None) -> None:
     Args:
         project_dir: Absolute path to the project directory.
         output_path: Custom output path, or None for <project>/.codebase.md.
+        jobs: Worker processes for the initial parse (0 = one per CPU).
+        use_cache: Reuse/persist parsed symbols and file hashes on disk.
+        stable_timestamp: Keep last_indexed unless the structure changed.
+        debounce_ms: Quiet period ending a burst of changes (None = default).
+        max_latency_ms: Longest a change is held back (None = default).
+        git_aware: Take the changed files of a branch switch from git.
+        hash_strategy: Name of the content hash strategy (see --hash).
+        stats: Print memory statistics after the initial index and on exit.
     """
-    from src.core.watcher import CodebaseWatcher, FileFilter, IncrementalPipeline
+    from src.core.watcher import (
+        DEFAULT_MAX_LATENCY_MS,
+        DEFAULT_QUIET_MS,
+        CodebaseWatcher,
+        FileFilter,
+        IncrementalPipeline,
+        make_hash_strategy,
+    )
 
     out = output_path or (project_dir / ".codebase.md")
     file_filter = FileFilter(project_dir)
+    cache = _open_cache(project_dir) if use_cache else None
+    hash_store = _open_hash_store(project_dir) if use_cache else None
 
     pipeline = IncrementalPipeline(
         project_root=project_dir,
         output_path=out,
         project_name=project_dir.name,
         file_filter=file_filter,
+        jobs=jobs,
+        cache=cache,
+        stable_timestamp=stable_timestamp,
+        hash_strategy=make_hash_strategy(hash_strategy),
+        hash_store=hash_store,
     )
 
     # Initial full index
     t0 = time.monotonic()
-    pipeline.full_index()
+    content = pipeline.full_index()
     elapsed_ms = (time.monotonic() - t0) * 1000
 
     state = pipeline.state
     num_files = len(state.symbols_by_file)
     num_symbols = sum(len(syms) for syms in state.symbols_by_file.values())
     num_modules = len(state.modules)
-    # Read the file we just wrote for token estimate
-    content = out.read_text(encoding="utf-8") if out.exists() else ""
     token_estimate = len(content) // 4
 
     print(
@@ -190,23 +314,32 @@ def run_watch(project_dir: Path, output_path: Path | None = None) -> None:
         f"{num_modules} modules -> {out.name} "
         f"(~{token_estimate} tokens, {elapsed_ms:.0f}ms)"
     )
+    if stats:
+        _print_stats()
     print(f"Watching {project_dir} for changes... (Ctrl+C to stop)")
 
-    # Set up initial content hashes for the watcher
+    # Share the pipeline's content hashes: the watcher keeps them current for
+    # the files it reports, so updates don't hash them again
     watcher = CodebaseWatcher(
         project_root=project_dir,
         file_filter=file_filter,
+        hasher=pipeline.hasher,
+        quiet_ms=DEFAULT_QUIET_MS if debounce_ms is None else debounce_ms,
+        max_latency_ms=(
+            DEFAULT_MAX_LATENCY_MS if max_latency_ms is None else max_latency_ms
+        ),
+        git_aware=git_aware,
     )
-    watcher.hasher.compute_initial(list(state.symbols_by_file.keys()))
 
     def on_change(changed_files: list[str]) -> None:
         """Handle file changes from the watcher."""
         t_start = time.monotonic()
-        pipeline.update_files(changed_files)
+        pipeline.update_files(changed_files, rehash=False)
         dt_ms = (time.monotonic() - t_start) * 1000
+        outcome = "regenerated" if pipeline.output_changed else "unchanged"
 
         for f in changed_files:
-            print(f"[update] {f} changed -> {out.name} regenerated ({dt_ms:.0f}ms)")
+            print(f"[update] {f} changed -> {out.name} {outcome} ({dt_ms:.0f}ms)")
 
     try:
         watcher.watch(on_change=on_change)
@@ -214,7 +347,44 @@ def run_watch(project_dir: Path, output_path: Path | None = None) -> None:
         pass
     finally:
         watcher.stop()
-        print("\nStopped watching.")
+        if cache is not None:
+            cache.close()
+        if hash_store is not None:
+            hash_store.close()
+        saved = watcher.coalescer.rebuilds_saved
+        print(f"\nStopped watching. ({saved} rebuilds saved by coalescing)")
+        if stats:
+            _print_stats()
+
+
+def _print_stats() -> None:
+    """Print how much memory the shared string pool saves (see --stats)."""
+    from src.core.strings import STRINGS
+
+    stats = STRINGS.stats()
+    print(
+        f"String pool: {stats.strings} strings ({_format_kib(stats.pooled_bytes)}), "
+        f"{stats.shared} of {stats.lookups} lookups reused a pooled copy, "
+        f"~{_format_kib(stats.bytes_saved)} saved"
+    )
+
+
+def _format_kib(num_bytes: int) -> str:
+    return f"{num_bytes / 1024:.1f} KiB"
+
+
+def _open_cache(project_dir: Path) -> SymbolCache:
+    """Open the project's persistent symbol cache."""
+    from src.core.cache import SymbolCache, default_cache_path
+
+    return SymbolCache(default_cache_path(project_dir))
+
+
+def _open_hash_store(project_dir: Path) -> HashStore:
+    """Open the project's persistent file hash store."""
+    from src.core.cache import HashStore, default_hash_store_path
+
+    return HashStore(default_hash_store_path(project_dir))
 
 
 # ── Main ───────────────────────────────────────────────────────────
@@ -247,10 +417,41 @@ def main(argv: list[str] | None = None) -> None:
     project_dir = resolve_project_dir(args)
     output_path = Path(args.output).resolve() if args.output else None
 
+    if args.jobs < 0:
+        print("Error: --jobs must be >= 0.", file=sys.stderr)
+        sys.exit(1)
+
+    for flag, value in (
+        ("--debounce-ms", args.debounce_ms),
+        ("--max-latency-ms", args.max_latency_ms),
+    ):
+        if value is not None and value < 0:
+            print(f"Error: {flag} must be >= 0.", file=sys.stderr)
+            sys.exit(1)
+
     if args.watch:
-        run_watch(project_dir, output_path)
+        run_watch(
+            project_dir,
+            output_path,
+            jobs=args.jobs,
+            use_cache=args.use_cache,
+            stable_timestamp=args.stable_timestamp,
+            debounce_ms=args.debounce_ms,
+            max_latency_ms=args.max_latency_ms,
+            git_aware=args.git_aware,
+            hash_strategy=args.hash_strategy,
+            stats=args.stats,
+        )
     else:
-        run_oneshot(project_dir, output_path)
+        run_oneshot(
+            project_dir,
+            output_path,
+            jobs=args.jobs,
+            use_cache=args.use_cache,
+            stable_timestamp=args.stable_timestamp,
+            hash_strategy=args.hash_strategy,
+            stats=args.stats,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,456 @@
+"""Persistent on-disk caches: symbols keyed by content hash, and file hashes.
+
+Stores the normalized symbol list for every parsed file content in a small
+SQLite database (default: <project>/.codebase-graph/cache.db), so a warm
+restart only re-parses files whose content hash changed since the last run.
+
+Entries are content-addressed: the key is the file's extension plus its
+content hash (the extension picks the grammar, so the same bytes can parse
+differently as .js and .ts), and the value is the file's symbols without
+their path-derived fields (file, fqn), which are rebuilt on load. The whole
+cache is dropped when the cache format, the parser normalization or the
+installed Kit version changes, and the least recently used entries are
+evicted past a configurable size cap.
+
+HashStore (default: <project>/.codebase-graph/hashes.db) records each file's
+content hash together with its stat data, so a restart can trust the hash of
+every file whose mtime, size and inode are unchanged without reading it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Sequence
+from importlib import metadata
+from pathlib import Path, PurePosixPath
+
+from src.core.parser import PARSER_VERSION, Symbol, SymbolTable
+
+logger = logging.getLogger(__name__)
+
+
+# Directory (relative to the project root) holding codebase-graph state
+CACHE_DIR_NAME = ".codebase-graph"
+
+# Bump when the on-disk layout of cache entries changes
+# 2: entries are keyed by tagged digests ("sha256:<hex>")
+# 3: entries hold the symbols' type references next to their rows
+# 4: entries hold the names each symbol calls
+# 5: entries are keyed by file extension and content hash
+CACHE_FORMAT_VERSION = 5
+
+# Default cap on cached file contents before LRU eviction kicks in
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Bump when the layout of the hash store changes
+# 2: hashes are tagged digests, stored per digest tag
+HASH_STORE_VERSION = "2"
+
+# A file's stat data: (st_mtime_ns, st_size, st_ino)
+StatData = tuple[int, int, int]
+
+
+def make_cache_dir(directory: Path) -> None:
+    """Create a cache directory that keeps itself out of git.
+
+    A new directory, or the default one without it, gets a .gitignore
+    ignoring everything, so projects don't need their own entry for it.
+    A custom directory that already exists is left alone.
+
+    Raises:
+        OSError: If the directory can't be created.
+    """
+    if directory.is_dir():
+        if directory.name != CACHE_DIR_NAME:
+            return
+    else:
+        directory.mkdir(parents=True, exist_ok=True)
+    gitignore = directory / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("*\n", encoding="utf-8")
+
+
+def default_cache_path(project_root: str | Path) -> Path:
+    """Return the default cache database path for a project."""
+    return Path(project_root) / CACHE_DIR_NAME / "cache.db"
+
+
+def default_hash_store_path(project_root: str | Path) -> Path:
+    """Return the default hash store database path for a project."""
+    return Path(project_root) / CACHE_DIR_NAME / "hashes.db"
+
+
+def cache_version() -> str:
+    """Version string every cache entry is tied to.
+
+    Combines the cache format, the parser's normalization version and the
+    installed Kit version — a change to any of them invalidates the cache.
+    """
+    try:
+        kit_version = metadata.version("cased-kit")
+    except metadata.PackageNotFoundError:
+        kit_version = "unknown"
+    return f"{CACHE_FORMAT_VERSION}/{PARSER_VERSION}/kit-{kit_version}"
+
+
+class SymbolCache:
+    """SQLite-backed map of (extension, content hash) -> normalized symbols.
+
+    Writes are buffered in the open transaction and committed by flush(),
+    which also applies LRU eviction. The cache is best-effort: any database
+    error disables it for the rest of the session instead of failing the
+    index.
+
+    Usage:
+        cache = SymbolCache(default_cache_path("/path/to/repo"))
+        symbols = cache.get(content_hash, "src/main.py")
+        if symbols is None:
+            symbols = parser.parse_file("src/main.py")
+            cache.put(content_hash, symbols, "src/main.py")
+        cache.flush()
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        version: str | None = None,
+    ) -> None:
+        """Open (or create) the cache database.
+
+        Args:
+            path: Database file path. Parent directories are created
+                  (see make_cache_dir).
+            max_entries: Maximum cached file contents kept after flush().
+            version: Override the cache version (defaults to cache_version()).
+        """
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.version = version or cache_version()
+        self.hits = 0
+        self.misses = 0
+        self._touched: dict[str, int] = {}
+        self._conn: sqlite3.Connection | None = None
+
+        try:
+            self._conn = self._open()
+        except (OSError, sqlite3.DatabaseError) as e:
+            logger.warning("Symbol cache disabled (%s): %s", self.path, e)
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is usable this session."""
+        return self._conn is not None
+
+    def _open(self) -> sqlite3.Connection:
+        """Connect, create the schema, and reset on a version mismatch."""
+        make_cache_dir(self.path.parent)
+        try:
+            conn = self._connect()
+        except sqlite3.DatabaseError:
+            # Corrupt file — start over
+            self.path.unlink(missing_ok=True)
+            conn = self._connect()
+
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            if row is not None:
+                logger.info("Symbol cache version changed; clearing %s", self.path)
+            conn.execute("DELETE FROM entries")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (self.version,),
+            )
+            conn.commit()
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path))
+        # A cache can always be rebuilt, so trade durability for speed
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (hash TEXT PRIMARY KEY, "
+            "symbols TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+        )
+        return conn
+
+    def _disable(self, error: Exception) -> None:
+        logger.warning("Symbol cache disabled after error: %s", error)
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+
+    def __len__(self) -> int:
+        if self._conn is None:
+            return 0
+        try:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except sqlite3.Error as e:
+            self._disable(e)
+            return 0
+
+    def get(self, content_hash: str, file_path: str) -> SymbolTable | None:
+        """Look up the symbols for a file content.
+
+        Args:
+            content_hash: Hash of the file's current content.
+            file_path: Relative path, used to rebuild Symbol.file and fqn.
+
+        Returns:
+            The cached symbols (possibly empty), or None on a miss.
+        """
+        if self._conn is None or not content_hash:
+            return None
+        key = _entry_key(content_hash, file_path)
+        try:
+            row = self._conn.execute(
+                "SELECT symbols FROM entries WHERE hash = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touched[key] = time.time_ns()
+        return _decode_symbols(row[0], file_path)
+
+    def put(
+        self, content_hash: str, symbols: Sequence[Symbol], file_path: str
+    ) -> None:
+        """Store the symbols parsed from a file content.
+
+        Args:
+            content_hash: Hash of the parsed content.
+            symbols: The symbols parsed from it.
+            file_path: Path the content was parsed as; its extension is part
+                of the key.
+        """
+        if self._conn is None or not content_hash:
+            return
+        key = _entry_key(content_hash, file_path)
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (hash, symbols, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, _encode_symbols(symbols), time.time_ns()),
+            )
+        except sqlite3.Error as e:
+            self._disable(e)
+            return
+        self._touched.pop(key, None)
+
+    def flush(self) -> None:
+        """Persist access times and pending writes, then evict LRU entries."""
+        if self._conn is None:
+            return
+        try:
+            if self._touched:
+                self._conn.executemany(
+                    "UPDATE entries SET last_used = ? WHERE hash = ?",
+                    [(used, h) for h, used in self._touched.items()],
+                )
+                self._touched.clear()
+
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE hash IN ("
+                    "SELECT hash FROM entries ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def close(self) -> None:
+        """Flush and close the database."""
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ── HashStore ──────────────────────────────────────────────────────
+
+
+class HashStore:
+    """SQLite-backed map of file path -> (content hash, stat data).
+
+    Hashes are stored per digest tag (see HashStrategy.tag), since different
+    strategies produce different hashes for the same content. Like SymbolCache, the
+    store is best-effort: any database error disables it.
+
+    Usage:
+        store = HashStore(default_hash_store_path("/path/to/repo"))
+        entries = store.load("sha256")  # {path: (hash, stat_data)}
+        ...
+        store.save("sha256", entries)
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (or create) the hash store database.
+
+        Args:
+            path: Database file path. Parent directories are created
+                  (see make_cache_dir).
+        """
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+
+        try:
+            self._conn = self._open()
+        except (OSError, sqlite3.DatabaseError) as e:
+            logger.warning("Hash store disabled (%s): %s", self.path, e)
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the store is usable this session."""
+        return self._conn is not None
+
+    def _open(self) -> sqlite3.Connection:
+        """Connect, create the schema, and reset on a version mismatch."""
+        make_cache_dir(self.path.parent)
+        try:
+            conn = self._connect()
+        except sqlite3.DatabaseError:
+            # Corrupt file — start over
+            self.path.unlink(missing_ok=True)
+            conn = self._connect()
+
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != HASH_STORE_VERSION:
+            conn.execute("DELETE FROM hashes")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (HASH_STORE_VERSION,),
+            )
+            conn.commit()
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path))
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes (path TEXT PRIMARY KEY, "
+            "strategy TEXT NOT NULL, hash TEXT NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, ino INTEGER NOT NULL)"
+        )
+        return conn
+
+    def _disable(self, error: Exception) -> None:
+        logger.warning("Hash store disabled after error: %s", error)
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+        self._conn = None
+
+    def load(self, strategy: str) -> dict[str, tuple[str, StatData]]:
+        """Return the stored hashes recorded with the given digest tag.
+
+        Returns:
+            Dict mapping relative path -> (content hash, stat data).
+        """
+        if self._conn is None:
+            return {}
+        try:
+            rows = self._conn.execute(
+                "SELECT path, hash, mtime_ns, size, ino FROM hashes "
+                "WHERE strategy = ?",
+                (strategy,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return {}
+        return {path: (h, (mtime, size, ino)) for path, h, mtime, size, ino in rows}
+
+    def save(self, strategy: str, entries: dict[str, tuple[str, StatData]]) -> None:
+        """Replace the stored hashes with entries (recorded with digest tag)."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute("DELETE FROM hashes")
+            self._conn.executemany(
+                "INSERT INTO hashes (path, strategy, hash, mtime_ns, size, ino) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (path, strategy, h, *stat)
+                    for path, (h, stat) in entries.items()
+                ],
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def close(self) -> None:
+        """Close the database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ── Entry encoding ─────────────────────────────────────────────────
+
+
+def _entry_key(content_hash: str, file_path: str) -> str:
+    """Cache key of a content parsed as file_path ("<ext>:<hash>")."""
+    return f"{PurePosixPath(file_path).suffix}:{content_hash}"
+
+
+def _encode_symbols(symbols: Sequence[Symbol]) -> str:
+    """Serialize symbols without their path-derived fields.
+
+    The payload is {"rows": [...], "type_refs": [...] or null,
+    "calls": [...] or null}.
+    """
+    type_refs = calls = None
+    if isinstance(symbols, SymbolTable):
+        rows = [
+            [name, kind, line, end_line, signature]
+            for name, kind, _, line, end_line, signature in symbols.rows()
+        ]
+        type_refs = symbols.type_refs
+        calls = symbols.calls
+    else:
+        rows = [[s.name, s.kind, s.line, s.end_line, s.signature] for s in symbols]
+    return json.dumps(
+        {"rows": rows, "type_refs": type_refs, "calls": calls},
+        separators=(",", ":"),
+    )
+
+
+def _decode_symbols(payload: str, file_path: str) -> SymbolTable:
+    """Rebuild the symbol table for file_path from a cache entry."""
+    entry = json.loads(payload)
+    return SymbolTable.from_rows(
+        (
+            (name, kind, file_path, line, end_line, signature)
+            for name, kind, line, end_line, signature in entry["rows"]
+        ),
+        entry["type_refs"],
+        entry["calls"],
+    )
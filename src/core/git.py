@@ -0,0 +1,313 @@
+"""Git integration for bulk change detection.
+
+A branch switch, reset or pull rewrites many files at once. Instead of
+re-hashing every file the watcher reports, GitHeadTracker notices that HEAD
+moved and asks git for the files that differ between the old and new
+commit, using git's own blob ids to drop entries whose content is
+unchanged (mode-only changes).
+
+HEAD is resolved by reading the ref files under the git directory, so
+polling it is a couple of small file reads; git itself is only invoked
+once at startup and once per HEAD move. Everything degrades gracefully:
+outside a git work tree, or without a git executable, the tracker is
+simply disabled.
+
+The blob id helpers let content hashing reuse the ids git already keeps in
+its index for unmodified files (see GitBlobStrategy in the watcher).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.hashing import HASH_ALGORITHM_NAMES, HashAlgorithm, update_from_file
+
+logger = logging.getLogger(__name__)
+
+
+# Git's mode for submodule entries ("gitlinks") — not files in this tree
+_GITLINK_MODE = "160000"
+
+# Git's mode for symlinks — the blob holds the link target, not the content
+_SYMLINK_MODE = "120000"
+
+# Upper bound on any single git invocation
+_GIT_TIMEOUT_S = 30
+
+
+@dataclass(frozen=True, slots=True)
+class TreeChange:
+    """A file that differs between two commits.
+
+    Attributes:
+        path: Path relative to the project root (forward slashes).
+        status: git's status letter: "A" added, "D" deleted, "M" modified,
+                "T" type change.
+        old_oid: Blob id before the change (all zeros if added).
+        new_oid: Blob id after the change (all zeros if deleted).
+    """
+
+    path: str
+    status: str
+    old_oid: str
+    new_oid: str
+
+    @property
+    def deleted(self) -> bool:
+        return self.status == "D"
+
+
+def run_git(project_root: str | Path, *args: str) -> str | None:
+    """Run a git command in project_root and return its stdout.
+
+    Returns None if git is unavailable or the command fails.
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=str(project_root),
+            capture_output=True,
+            text=True,
+            timeout=_GIT_TIMEOUT_S,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug("git %s failed: %s", args[0] if args else "", e)
+        return None
+    if result.returncode != 0:
+        logger.debug("git %s failed: %s", args[0], result.stderr.strip())
+        return None
+    return result.stdout
+
+
+def diff_commits(
+    project_root: str | Path,
+    old: str,
+    new: str,
+) -> list[TreeChange] | None:
+    """List the files under project_root that differ between two commits.
+
+    Renames are reported as a deletion plus an addition. Entries whose blob
+    id didn't change (mode-only changes) and submodules are skipped.
+
+    Returns:
+        The changes, or None if git could not produce the diff.
+    """
+    out = run_git(
+        project_root,
+        "diff",
+        "--raw",
+        "-z",
+        "--no-renames",
+        "--no-abbrev",
+        "--relative",
+        old,
+        new,
+        "--",
+    )
+    if out is None:
+        return None
+    return _parse_raw_diff(out)
+
+
+def _parse_raw_diff(output: str) -> list[TreeChange]:
+    """Parse `git diff --raw -z` output.
+
+    Each entry is ":<old mode> <new mode> <old oid> <new oid> <status>\\0<path>\\0".
+    """
+    changes: list[TreeChange] = []
+    fields = output.split("\0")
+    for i in range(0, len(fields) - 1, 2):
+        meta, path = fields[i], fields[i + 1]
+        parts = meta.lstrip(":").split()
+        if len(parts) < 5:
+            continue
+        old_mode, new_mode, old_oid, new_oid, status = parts[:5]
+        if _GITLINK_MODE in (old_mode, new_mode) or old_oid == new_oid:
+            continue
+        changes.append(TreeChange(path, status[0], old_oid, new_oid))
+    return changes
+
+
+# ── Blob ids ───────────────────────────────────────────────────────
+
+
+def hash_blob(path: str | Path) -> str:
+    """Compute git's blob id (SHA-1 of "blob <size>\\0" + content) for a file.
+
+    Returns an empty string if the file can't be read.
+    """
+    h = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            h.update(f"blob {size}\0".encode())
+            update_from_file(h, f, size)
+    except OSError:
+        return ""
+    return h.hexdigest()
+
+
+class BlobAlgorithm(HashAlgorithm):
+    """git's blob id as a HashAlgorithm ("git-blob:<oid>" digests).
+
+    The blob header needs the file size up front, so files are hashed
+    through hash_blob() rather than by feeding `new()` the bytes alone.
+    """
+
+    __slots__ = ()
+
+    def hex_file(self, path: str | Path) -> str:
+        return hash_blob(path)
+
+
+GIT_BLOB = BlobAlgorithm("git", "git-blob", hashlib.sha1)
+
+# Names accepted by the watcher's make_hash_strategy() (e.g. from the CLI);
+# kept here so the CLI can list them without importing the parser
+HASH_STRATEGY_NAMES: tuple[str, ...] = (*HASH_ALGORITHM_NAMES, GIT_BLOB.name)
+
+
+def index_oids(project_root: str | Path) -> dict[str, str] | None:
+    """Blob ids of the regular files staged in the index under project_root.
+
+    Parses `git ls-files -s`. Conflicted entries, symlinks and submodules
+    are left out — their index blob doesn't describe the file on disk.
+
+    Returns:
+        Dict mapping path (relative to project_root) -> blob id, or None
+        if git is unavailable.
+    """
+    out = run_git(project_root, "ls-files", "-s", "-z")
+    if out is None:
+        return None
+
+    oids: dict[str, str] = {}
+    for entry in out.split("\0"):
+        info, _, path = entry.partition("\t")
+        parts = info.split()
+        if len(parts) != 3:
+            continue
+        mode, oid, stage = parts
+        if stage == "0" and mode not in (_GITLINK_MODE, _SYMLINK_MODE):
+            oids[path] = oid
+    return oids
+
+
+def modified_files(project_root: str | Path) -> set[str] | None:
+    """Files under project_root whose work tree copy may differ from the index.
+
+    Uses `git diff-files`, which compares stat data recorded in the index,
+    so it may over-report (files touched but unchanged) but never misses a
+    modified file.
+
+    Returns:
+        Paths relative to project_root, or None if git is unavailable.
+    """
+    out = run_git(project_root, "diff-files", "--name-only", "-z", "--relative")
+    if out is None:
+        return None
+    return {path for path in out.split("\0") if path}
+
+
+# ── HEAD tracking ──────────────────────────────────────────────────
+
+
+class GitHeadTracker:
+    """Detects HEAD moves and lists the files they changed.
+
+    Usage:
+        tracker = GitHeadTracker("/path/to/repo")
+        ...  # user runs `git checkout other-branch`
+        changes = tracker.poll()  # [TreeChange(...), ...] or None
+    """
+
+    def __init__(self, project_root: str | Path) -> None:
+        """Locate the git directory and record the current HEAD.
+
+        Args:
+            project_root: Directory inside a git work tree.
+        """
+        self._root = Path(project_root).resolve()
+        self._git_dir: Path | None = None
+        self._common_dir: Path | None = None
+
+        out = run_git(
+            self._root, "rev-parse", "--absolute-git-dir", "--git-common-dir"
+        )
+        if out is not None:
+            lines = out.splitlines()
+            if len(lines) >= 2:
+                self._git_dir = Path(lines[0])
+                self._common_dir = (self._root / lines[1]).resolve()
+
+        self.head = self.read_head()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the project is inside a git work tree."""
+        return self._git_dir is not None
+
+    def read_head(self) -> str | None:
+        """Resolve HEAD to a commit id from the ref files, without running git."""
+        if self._git_dir is None or self._common_dir is None:
+            return None
+        try:
+            head = (self._git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+
+        if not head.startswith("ref:"):
+            return head  # detached HEAD
+
+        ref = head[len("ref:"):].strip()
+        for base in (self._git_dir, self._common_dir):
+            try:
+                return (base / ref).read_text(encoding="utf-8").strip()
+            except OSError:
+                continue
+        return _packed_ref(self._common_dir, ref)
+
+    def sync(self) -> None:
+        """Accept the current HEAD without diffing (e.g. after a commit)."""
+        self.head = self.read_head()
+
+    def poll(self) -> list[TreeChange] | None:
+        """Return the files changed by a HEAD move since the last poll/sync.
+
+        Returns:
+            The changes between the previous and current HEAD, or None if
+            HEAD didn't move (or the diff could not be computed).
+        """
+        head = self.read_head()
+        if head is None or head == self.head:
+            return None
+
+        old, self.head = self.head, head
+        if old is None:
+            # Unborn branch got its first commit — nothing to diff against
+            return None
+
+        changes = diff_commits(self._root, old, head)
+        if changes is not None:
+            logger.info(
+                "HEAD moved %s -> %s: %d files changed", old[:8], head[:8], len(changes)
+            )
+        return changes
+
+
+def _packed_ref(common_dir: Path, ref: str) -> str | None:
+    """Look up a ref in packed-refs (refs packed out of loose files)."""
+    try:
+        lines = (common_dir / "packed-refs").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    for line in lines.splitlines():
+        oid, _, name = line.partition(" ")
+        if name == ref:
+            return oid
+    return None
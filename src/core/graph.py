@@ -1,17 +1,21 @@
 """Module clustering and graph building.
 
 Groups symbols into directory-based modules, extracts type hierarchies
-(extends/implements/contains), and detects cross-module dependencies
-by scanning import statements.
+(extends/implements/contains) and resolves their targets to FQNs, and
+detects cross-module dependencies by scanning import statements.
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass, field
-from pathlib import PurePosixPath
+import sys
+from collections.abc import Callable, Container, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path, PurePosixPath
 
-from src.core.parser import Symbol
+from src.core.parser import Symbol, SymbolTable, TypeRef, filter_kinds
+from src.core.strings import STRINGS
 
 
 # ── Dataclasses ────────────────────────────────────────────────────
@@ -33,19 +37,22 @@ class Module:
     path: str
     key_types: list[str] = field(default_factory=list)
     depends_on: list[str] = field(default_factory=list)
-    symbols: list[Symbol] = field(default_factory=list)
+    symbols: Sequence[Symbol] = field(default_factory=list)
 
 
 @dataclass(frozen=True, slots=True)
 class Hierarchy:
-    """A type relationship extracted from symbol signatures.
+    """A type relationship declared by a type.
 
     Attributes:
         symbol: FQN of the source symbol.
         relationship: One of "extends", "implements", "contains".
-        target: Name of the target type.
+        target: Name of the target type, as written (e.g. "Base",
+            "models.Base").
         file: File where the relationship is declared.
         line: Line number of the declaration.
+        target_fqn: FQN of the type the target resolves to, or None if it
+            isn't defined in the codebase or is ambiguous (see TypeResolver).
     """
 
     symbol: str
@@ -53,10 +60,14 @@ class Hierarchy:
     target: str
     file: str
     line: int
+    target_fqn: str | None = None
 
 
 # ── Hierarchy extraction patterns ─────────────────────────────────
 
+# Signature patterns, used for symbols parsed without a syntax tree (Kit's
+# fallback extraction) — parse_file() captures the references otherwise
+
 # Python: class Foo(Bar, Baz):
 _PY_EXTENDS_RE = re.compile(r"^class\s+\w+\s*\(([^)]+)\)\s*:")
 
@@ -183,7 +194,9 @@ class ModuleClusterer:
         """
         self.max_module_symbols = max_module_symbols
 
-    def cluster(self, symbols_by_file: dict[str, list[Symbol]]) -> list[Module]:
+    def cluster(
+        self, symbols_by_file: Mapping[str, Sequence[Symbol]]
+    ) -> list[Module]:
         """Cluster file-grouped symbols into modules.
 
         Args:
@@ -196,36 +209,85 @@ class ModuleClusterer:
         if not symbols_by_file:
             return []
 
-        # Bucket files into base modules, then adaptively split oversized ones.
-        module_files: dict[str, dict[str, list[Symbol]]] = {}
+        module_files = self.assign(symbols_by_file)
+
+        return [
+            self.build_module(mod_path, module_files[mod_path])
+            for mod_path in sorted(module_files)
+        ]
+
+    def assign(
+        self,
+        symbols_by_file: Mapping[str, Sequence[Symbol]],
+    ) -> dict[str, dict[str, Sequence[Symbol]]]:
+        """Assign files to module paths, adaptively splitting large modules.
+
+        Files are bucketed into base modules while the symbol count of every
+        directory below each base module is aggregated in the same pass. A
+        directory is then split into its subdirectories when its subtree
+        holds more than max_module_symbols symbols, deciding top-down from
+        the base module, so each file is placed with one walk down its path.
+
+        Returns:
+            Dict mapping module path -> {file path: symbols}, sorted by
+            module path, with files in symbols_by_file order within each
+            module.
+        """
+        # Pass 1: each file's directory parts and base module depth, and
+        # the aggregated symbol count of every directory under a base module
+        placements: list[tuple[str, Sequence[Symbol], tuple[str, ...], int]] = []
+        subtree_counts: dict[str, int] = {}
 
         for file_path, file_symbols in symbols_by_file.items():
-            module_path = self._module_path_for(file_path)
+            dir_parts = PurePosixPath(file_path).parts[:-1]
+            depth = self._module_depth(dir_parts)
+            placements.append((file_path, file_symbols, dir_parts, depth))
+
+            count = len(file_symbols)
+            directory = "/".join(dir_parts[:depth]) if depth else "."
+            subtree_counts[directory] = subtree_counts.get(directory, 0) + count
+            if depth == 0:
+                # The root module is never split
+                continue
+            for part in dir_parts[depth:]:
+                directory = f"{directory}/{part}"
+                subtree_counts[directory] = subtree_counts.get(directory, 0) + count
+
+        # Pass 2: walk each file down from its base module while the current
+        # directory is oversized (a file below it means it has subdirectories)
+        max_symbols = self.max_module_symbols
+        module_files: dict[str, dict[str, Sequence[Symbol]]] = {}
+
+        for file_path, file_symbols, dir_parts, depth in placements:
+            module_path = "/".join(dir_parts[:depth]) if depth else "."
+            if depth:
+                for part in dir_parts[depth:]:
+                    if subtree_counts[module_path] <= max_symbols:
+                        break
+                    module_path = f"{module_path}/{part}"
+            module_path = STRINGS.intern(module_path)
             module_files.setdefault(module_path, {})[file_path] = file_symbols
 
-        module_files = self._split_large_modules(module_files)
-
-        # Build Module objects
-        modules: list[Module] = []
-        for mod_path in sorted(module_files):
-            name = PurePosixPath(mod_path).name if mod_path != "." else "__root__"
-            syms: list[Symbol] = []
-            for file_symbols in module_files[mod_path].values():
-                syms.extend(file_symbols)
-
-            key_types = sorted({s.name for s in syms if s.kind in _KEY_TYPE_KINDS})
-
-            modules.append(
-                Module(
-                    name=name,
-                    path=mod_path,
-                    key_types=key_types,
-                    depends_on=[],  # filled in by detect_cross_module_deps
-                    symbols=syms,
-                )
-            )
+        return {path: module_files[path] for path in sorted(module_files)}
 
-        return modules
+    @staticmethod
+    def build_module(
+        mod_path: str,
+        file_symbol_map: dict[str, Sequence[Symbol]],
+    ) -> Module:
+        """Build a Module (without dependencies) from its files."""
+        name = PurePosixPath(mod_path).name if mod_path != "." else "__root__"
+        syms = SymbolTable.concat(file_symbol_map.values())
+
+        key_types = sorted({s.name for s in filter_kinds(syms, _KEY_TYPE_KINDS)})
+
+        return Module(
+            name=sys.intern(name),
+            path=STRINGS.intern(mod_path),
+            key_types=key_types,
+            depends_on=[],  # filled in by detect_cross_module_deps
+            symbols=syms,
+        )
 
     @staticmethod
     def _module_path_for(file_path: str) -> str:
@@ -238,75 +300,26 @@ class ModuleClusterer:
           e.g. "lib/utils.py" -> "lib"
         - Root-level files (no directory) -> "."
         """
-        parts = PurePosixPath(file_path).parts
+        dir_parts = PurePosixPath(file_path).parts[:-1]
+        depth = ModuleClusterer._module_depth(dir_parts)
+        return "/".join(dir_parts[:depth]) if depth else "."
 
-        if len(parts) <= 1:
+    @staticmethod
+    def _module_depth(dir_parts: tuple[str, ...]) -> int:
+        """Number of leading directory parts that name a file's base module."""
+        if not dir_parts:
             # Root-level file like "main.py"
-            return "."
+            return 0
 
-        if parts[0] == "src" and len(parts) > 2:
+        if dir_parts[0] == "src" and len(dir_parts) > 1:
             # Under src/ — module is src/<first_subdir>
-            return f"{parts[0]}/{parts[1]}"
+            return 2
 
         # Otherwise module is the first directory
-        return parts[0]
-
-    def _split_large_modules(
-        self,
-        module_files: dict[str, dict[str, list[Symbol]]],
-    ) -> dict[str, dict[str, list[Symbol]]]:
-        """Split oversized modules one directory level at a time."""
-        while True:
-            changed = False
-            next_files: dict[str, dict[str, list[Symbol]]] = {}
-
-            for module_path in sorted(module_files):
-                file_symbol_map = module_files[module_path]
-                symbol_count = self._symbol_count(file_symbol_map)
-
-                if symbol_count <= self.max_module_symbols:
-                    next_files[module_path] = file_symbol_map
-                    continue
-
-                split_map = self._split_one_level(module_path, file_symbol_map)
-                if set(split_map) == {module_path}:
-                    next_files[module_path] = file_symbol_map
-                    continue
-
-                changed = True
-                for split_path, split_files in split_map.items():
-                    next_files.setdefault(split_path, {}).update(split_files)
-
-            module_files = next_files
-            if not changed:
-                return module_files
+        return 1
 
     @staticmethod
-    def _split_one_level(
-        module_path: str,
-        file_symbol_map: dict[str, list[Symbol]],
-    ) -> dict[str, dict[str, list[Symbol]]]:
-        """Split one module by the next directory component."""
-        if module_path == ".":
-            return {module_path: file_symbol_map}
-
-        module_parts = PurePosixPath(module_path).parts
-        split_buckets: dict[str, dict[str, list[Symbol]]] = {}
-
-        for file_path, file_symbols in file_symbol_map.items():
-            parent_parts = PurePosixPath(file_path).parts[:-1]
-            if len(parent_parts) <= len(module_parts):
-                target_path = module_path
-            else:
-                next_part = parent_parts[len(module_parts)]
-                target_path = "/".join((*module_parts, next_part))
-
-            split_buckets.setdefault(target_path, {})[file_path] = file_symbols
-
-        return split_buckets
-
-    @staticmethod
-    def _symbol_count(file_symbol_map: dict[str, list[Symbol]]) -> int:
+    def _symbol_count(file_symbol_map: dict[str, Sequence[Symbol]]) -> int:
         return sum(len(file_symbols) for file_symbols in file_symbol_map.values())
 
 
@@ -314,39 +327,106 @@ class ModuleClusterer:
 
 
 def extract_hierarchies(
-    symbols_by_file: dict[str, list[Symbol]],
+    symbols_by_file: Mapping[str, Sequence[Symbol]],
+    scan_imports: Callable[[str], list[str]] | None = None,
 ) -> list[Hierarchy]:
-    """Extract type hierarchies from symbol signatures.
+    """Extract type hierarchies from each file's symbols.
 
     Detects three relationship types:
     - extends: class inherits from another class
     - implements: class implements an interface (TypeScript)
     - contains: type has fields referencing other known types
 
+    Files parsed from a syntax tree contribute the type references
+    captured by parse_file(); only "contains" needs the repo-wide set of
+    type names. Other symbols are matched against signature patterns.
+
     Args:
         symbols_by_file: Dict mapping file paths to symbols.
+        scan_imports: Callable returning a file's import targets (see
+            scan_file_imports). When given, targets are resolved to FQNs
+            (see TypeResolver).
 
     Returns:
         List of Hierarchy records.
     """
-    # Build a set of all known type names for "contains" matching
-    all_type_names: set[str] = set()
-    all_symbols: list[Symbol] = []
-    for syms in symbols_by_file.values():
-        for s in syms:
-            all_symbols.append(s)
-            if s.kind in _KEY_TYPE_KINDS:
-                all_type_names.add(s.name)
+    # Index all known types, by name, for "contains" matching
+    types = TypeResolver()
+    for path, syms in symbols_by_file.items():
+        types.update(path, syms)
 
     hierarchies: list[Hierarchy] = []
+    for path, syms in symbols_by_file.items():
+        file_hierarchies = extract_file_hierarchies(syms, types)
+        if scan_imports is not None:
+            file_hierarchies = types.resolve_hierarchies(
+                file_hierarchies, path, scan_imports
+            )
+        hierarchies.extend(file_hierarchies)
+
+    return hierarchies
+
+
+def extract_file_hierarchies(
+    symbols: Sequence[Symbol],
+    known_types: Container[str],
+) -> list[Hierarchy]:
+    """Extract the type hierarchies declared by one file's symbols.
+
+    Args:
+        symbols: The file's symbols.
+        known_types: Names of all key types in the codebase, used for
+                     "contains" matching.
+
+    Returns:
+        List of Hierarchy records, in symbol order.
+    """
+    type_refs = symbols.type_refs if isinstance(symbols, SymbolTable) else None
+    if type_refs is not None:
+        return _hierarchies_from_type_refs(symbols, type_refs, known_types)
 
-    for sym in all_symbols:
+    hierarchies: list[Hierarchy] = []
+
+    # Only key types ("class" among them) declare hierarchies
+    for sym in filter_kinds(symbols, _KEY_TYPE_KINDS):
         if sym.kind == "class":
             hierarchies.extend(_extract_extends_implements(sym))
 
-        if sym.kind in _KEY_TYPE_KINDS:
-            hierarchies.extend(_extract_contains(sym, all_type_names))
+        hierarchies.extend(_extract_contains(sym, known_types))
+
+    return hierarchies
+
 
+def _hierarchies_from_type_refs(
+    table: SymbolTable,
+    type_refs: Iterable[TypeRef],
+    known_types: Container[str],
+) -> list[Hierarchy]:
+    """Turn a table's captured type references into Hierarchy records."""
+    hierarchies: list[Hierarchy] = []
+    # Consecutive references usually belong to the same symbol
+    sym: Symbol
+    sym_index = -1
+    for index, relationship, target in type_refs:
+        if relationship == "contains":
+            if target not in known_types or target in _PRIMITIVE_TYPES:
+                continue
+        elif target in _IGNORED_BASES:
+            continue
+
+        if index != sym_index:
+            sym, sym_index = table[index], index
+        if relationship == "contains" and target == sym.name:
+            continue  # don't self-reference
+        hierarchies.append(
+            Hierarchy(
+                symbol=sym.fqn,
+                relationship=relationship,
+                target=target,
+                file=sym.file,
+                line=sym.line,
+            )
+        )
     return hierarchies
 
 
@@ -368,7 +448,7 @@ def _extract_extends_implements(sym: Symbol) -> list[Hierarchy]:
                     Hierarchy(
                         symbol=sym.fqn,
                         relationship="extends",
-                        target=base,
+                        target=sys.intern(base),
                         file=sym.file,
                         line=sym.line,
                     )
@@ -383,7 +463,7 @@ def _extract_extends_implements(sym: Symbol) -> list[Hierarchy]:
             Hierarchy(
                 symbol=sym.fqn,
                 relationship="extends",
-                target=target,
+                target=sys.intern(target),
                 file=sym.file,
                 line=sym.line,
             )
@@ -402,7 +482,7 @@ def _extract_extends_implements(sym: Symbol) -> list[Hierarchy]:
                     Hierarchy(
                         symbol=sym.fqn,
                         relationship="implements",
-                        target=iface,
+                        target=sys.intern(iface),
                         file=sym.file,
                         line=sym.line,
                     )
@@ -411,7 +491,28 @@ def _extract_extends_implements(sym: Symbol) -> list[Hierarchy]:
     return results
 
 
-def _extract_contains(sym: Symbol, known_types: set[str]) -> list[Hierarchy]:
+def _contained_type_names(symbols: Sequence[Symbol]) -> frozenset[str]:
+    """Names a file's "contains" matching looks up in the known types.
+
+    extract_file_hierarchies() only consults known_types for these names,
+    so a file's hierarchies can change with the set of known types only
+    when one of them appears or disappears.
+    """
+    type_refs = symbols.type_refs if isinstance(symbols, SymbolTable) else None
+    if type_refs is not None:
+        return frozenset(
+            target
+            for _, relationship, target in type_refs
+            if relationship == "contains"
+        )
+    return frozenset(
+        type_name.strip()
+        for sym in filter_kinds(symbols, _KEY_TYPE_KINDS)
+        for type_name in _CONTAINS_RE.findall(sym.signature)
+    )
+
+
+def _extract_contains(sym: Symbol, known_types: Container[str]) -> list[Hierarchy]:
     """Extract 'contains' relationships from a type's signature/code.
 
     If a class/interface/struct has fields whose types reference other known
@@ -438,7 +539,7 @@ def _extract_contains(sym: Symbol, known_types: set[str]) -> list[Hierarchy]:
                 Hierarchy(
                     symbol=sym.fqn,
                     relationship="contains",
-                    target=type_name,
+                    target=sys.intern(type_name),
                     file=sym.file,
                     line=sym.line,
                 )
@@ -447,12 +548,207 @@ def _extract_contains(sym: Symbol, known_types: set[str]) -> list[Hierarchy]:
     return results
 
 
+# ── Type Resolution ────────────────────────────────────────────────
+
+
+class TypeResolver:
+    """Index of the codebase's key types by name, resolving names to FQNs.
+
+    Key types (classes, interfaces, structs, enums, type aliases) are
+    indexed per file, so update() only touches the names a file defines
+    and looking a name up is a dict access. A qualified name
+    ("models.Base") only matches types of a module named by the
+    qualifier. A name defined once resolves to that definition; among
+    several, the definitions visible from the referencing file narrow it
+    down, in turn:
+
+    1. a definition in the file itself
+    2. one in a module the file imports
+    3. one in a package the file imports (a module below an import target)
+
+    A name that stays ambiguous is left unresolved rather than guessed.
+
+    Also usable as the set of known type names (`name in resolver`).
+
+    Usage:
+        types = TypeResolver()
+        types.update("src/auth/models.py", symbols)
+        types.resolve("Base", "src/auth/login.py", scan_imports)
+    """
+
+    def __init__(self) -> None:
+        # name -> FQNs of its definitions, in indexing order
+        self._types: dict[str, list[str]] = {}
+        self._file_types: dict[str, tuple[tuple[str, str], ...]] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._types
+
+    def definitions(self, name: str) -> list[str]:
+        """FQNs of the key types named name."""
+        return list(self._types.get(name, ()))
+
+    def update(self, file_path: str, symbols: Sequence[Symbol] | None) -> set[str]:
+        """Re-index the key types a file defines (None: file removed).
+
+        Returns:
+            The names whose definitions changed.
+        """
+        old = self._file_types.pop(file_path, ())
+        new: tuple[tuple[str, str], ...] = ()
+        if symbols is not None:
+            new = tuple(
+                (sym.name, sym.fqn) for sym in filter_kinds(symbols, _KEY_TYPE_KINDS)
+            )
+        if new:
+            self._file_types[file_path] = new
+        if old == new:
+            return set()
+
+        for name, fqn in old:
+            fqns = self._types[name]
+            fqns.remove(fqn)
+            if not fqns:
+                del self._types[name]
+        for name, fqn in new:
+            self._types.setdefault(name, []).append(fqn)
+        return {name for name, _ in set(old) ^ set(new)}
+
+    def resolve(
+        self,
+        target: str,
+        file_path: str,
+        scan_imports: Callable[[str], list[str]],
+    ) -> str | None:
+        """Resolve a type name referenced from file_path to an FQN.
+
+        Args:
+            target: The name as written, possibly qualified ("models.Base").
+            file_path: File the reference appears in.
+            scan_imports: Callable returning a file's import targets; only
+                called when the name has several definitions.
+
+        Returns:
+            The FQN of the definition, or None if there's no definition or
+            no single visible one.
+        """
+        qualifier, _, name = target.rpartition(".")
+        fqns = self._types.get(name)
+        if not fqns:
+            return None
+        candidates = list(dict.fromkeys(fqns))
+        if qualifier:
+            qualified = qualifier.replace(".", "/")
+            candidates = [
+                fqn
+                for fqn in candidates
+                if ("/" + _fqn_module(fqn)).endswith("/" + qualified)
+            ]
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else None
+
+        own_module = _module_path_of(file_path)
+        imports = scan_imports(file_path)
+        packages = tuple(imported + "/" for imported in imports)
+        visible_from: list[Callable[[str], bool]] = [
+            lambda module: module == own_module,
+            lambda module: module in imports,
+            lambda module: module.startswith(packages),
+        ]
+
+        for visible in visible_from:
+            matches = [fqn for fqn in candidates if visible(_fqn_module(fqn))]
+            if len(matches) == 1:
+                return matches[0]
+            if matches:
+                candidates = matches
+        return None
+
+    def resolve_hierarchies(
+        self,
+        hierarchies: list[Hierarchy],
+        file_path: str,
+        scan_imports: Callable[[str], list[str]],
+    ) -> list[Hierarchy]:
+        """Copies of a file's hierarchies with target_fqn filled in."""
+        resolved: dict[str, str | None] = {}
+        result: list[Hierarchy] = []
+        for h in hierarchies:
+            if h.target not in resolved:
+                resolved[h.target] = self.resolve(h.target, file_path, scan_imports)
+            result.append(replace(h, target_fqn=resolved[h.target]))
+        return result
+
+
+def _module_path_of(file_path: str) -> str:
+    """Module part of the FQNs of a file's symbols ("src/auth/login")."""
+    return str(PurePosixPath(file_path).with_suffix(""))
+
+
+def _fqn_module(fqn: str) -> str:
+    return fqn.partition("::")[0]
+
+
+def _target_type_name(target: str) -> str:
+    """The type name a hierarchy target refers to ("Base" for "models.Base")."""
+    return target.rpartition(".")[2]
+
+
 # ── Cross-Module Dependency Detection ──────────────────────────────
 
 
+class _PathTrieNode:
+    """One path component in a ModulePathIndex trie."""
+
+    __slots__ = ("children", "module_name")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _PathTrieNode] = {}
+        self.module_name: str | None = None
+
+
+class ModulePathIndex:
+    """Longest-prefix index from repo paths to the modules that own them.
+
+    Module paths are stored in a trie keyed by path component, so resolving
+    an import target costs O(depth of the target) instead of a scan over
+    every module, and always yields the most specific matching module.
+    Matching is per component: "src/authz/x" does not fall under "src/auth".
+
+    Usage:
+        index = ModulePathIndex(modules)
+        index.resolve("src/auth/login")  # -> "auth"
+    """
+
+    def __init__(self, modules: list[Module]) -> None:
+        self._root = _PathTrieNode()
+        for mod in modules:
+            # The root module would match every path — it's never a target
+            if mod.path == ".":
+                continue
+            node = self._root
+            for part in mod.path.split("/"):
+                node = node.children.setdefault(part, _PathTrieNode())
+            node.module_name = mod.name
+
+    def resolve(self, path: str) -> str | None:
+        """Return the name of the deepest module containing path, if any."""
+        node = self._root
+        best: str | None = None
+        for part in path.split("/"):
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            if node.module_name is not None:
+                best = node.module_name
+        return best
+
+
 def detect_cross_module_deps(
     modules: list[Module],
     project_root: str,
+    scan_imports: Callable[[str], list[str]] | None = None,
 ) -> None:
     """Detect cross-module dependencies by scanning import statements.
 
@@ -463,11 +759,15 @@ def detect_cross_module_deps(
     Args:
         modules: List of Module objects from clustering.
         project_root: Absolute path to the project root.
+        scan_imports: Optional callable returning a file's import targets
+            (see scan_file_imports). Lets callers serve unchanged files
+            from a cache instead of re-reading them from disk.
     """
-    # Build a map of module_path -> module_name for lookup
-    mod_path_to_name: dict[str, str] = {}
-    for mod in modules:
-        mod_path_to_name[mod.path] = mod.name
+    if scan_imports is None:
+        scan_imports = partial(scan_file_imports, project_root=project_root)
+
+    # Index module paths once for this clustering pass
+    path_index = ModulePathIndex(modules)
 
     # For each module, scan its files for imports
     for mod in modules:
@@ -475,59 +775,64 @@ def detect_cross_module_deps(
         files_in_module = {s.file for s in mod.symbols}
 
         for file_path in files_in_module:
-            file_deps = _scan_file_imports(
-                file_path, project_root, mod_path_to_name, mod.name
+            deps.update(
+                _resolve_import_deps(scan_imports(file_path), path_index, mod.name)
             )
-            deps.update(file_deps)
 
         mod.depends_on = sorted(deps)
 
 
-def _scan_file_imports(
-    file_path: str,
-    project_root: str,
-    mod_path_to_name: dict[str, str],
-    own_module_name: str,
-) -> set[str]:
-    """Scan a single file for imports that reference other modules.
+def scan_file_imports(file_path: str, project_root: str) -> list[str]:
+    """Scan a single file for the repo paths its imports point at.
 
-    Returns set of module names this file depends on.
-    """
-    from pathlib import Path
+    The result only depends on the file's content, not on the current
+    module layout, so it can be cached per file content.
 
+    Returns:
+        Import targets as repo-relative slash paths, in source order
+        (e.g. "src/auth/login" for `from src.auth.login import X`).
+    """
     full_path = Path(project_root) / file_path
     if not full_path.exists():
-        return set()
+        return []
 
     try:
         content = full_path.read_text(encoding="utf-8", errors="replace")
     except OSError:
-        return set()
+        return []
 
-    deps: set[str] = set()
     suffix = Path(file_path).suffix
 
     if suffix == ".py":
-        deps.update(_scan_python_imports(content, mod_path_to_name, own_module_name))
-    elif suffix in (".ts", ".tsx", ".js", ".jsx"):
-        deps.update(
-            _scan_ts_imports(content, file_path, mod_path_to_name, own_module_name)
-        )
-
-    return deps
+        return _scan_python_imports(content)
+    if suffix in (".ts", ".tsx", ".js", ".jsx"):
+        return _scan_ts_imports(content, file_path)
+    return []
 
 
-def _scan_python_imports(
-    content: str,
-    mod_path_to_name: dict[str, str],
+def _resolve_import_deps(
+    import_targets: list[str],
+    path_index: ModulePathIndex,
     own_module_name: str,
 ) -> set[str]:
-    """Extract module dependencies from Python import statements.
+    """Map import targets to the names of the other modules they fall under."""
+    deps: set[str] = set()
+
+    for target in import_targets:
+        mod_name = path_index.resolve(target)
+        if mod_name is not None and mod_name != own_module_name:
+            deps.add(mod_name)
+
+    return deps
+
 
-    Matches `from src.auth.login import X` style imports and checks
-    if the import path falls under a known module.
+def _scan_python_imports(content: str) -> list[str]:
+    """Extract import targets from Python import statements.
+
+    Matches `from src.auth.login import X` style imports and converts
+    the dotted path to a slash path.
     """
-    deps: set[str] = set()
+    targets: list[str] = []
 
     for match in _PY_IMPORT_RE.finditer(content):
         import_path = match.group(1) or match.group(2)
@@ -535,31 +840,18 @@ def _scan_python_imports(
             continue
 
         # Convert dotted path to slash path: src.auth.login -> src/auth/login
-        slash_path = import_path.replace(".", "/")
-
-        # Check if this import matches any known module path
-        for mod_path, mod_name in mod_path_to_name.items():
-            if mod_path == ".":
-                continue
-            if slash_path.startswith(mod_path) and mod_name != own_module_name:
-                deps.add(mod_name)
-                break
+        targets.append(import_path.replace(".", "/"))
 
-    return deps
+    return targets
 
 
-def _scan_ts_imports(
-    content: str,
-    file_path: str,
-    mod_path_to_name: dict[str, str],
-    own_module_name: str,
-) -> set[str]:
-    """Extract module dependencies from TypeScript/JS import statements.
+def _scan_ts_imports(content: str, file_path: str) -> list[str]:
+    """Extract import targets from TypeScript/JS import statements.
 
     Matches `import ... from './auth/login'` style imports and resolves
-    the relative path to an absolute module path.
+    the relative path to a path from the repo root.
     """
-    deps: set[str] = set()
+    targets: list[str] = []
     file_dir = str(PurePosixPath(file_path).parent)
 
     for match in _TS_IMPORT_RE.finditer(content):
@@ -572,17 +864,9 @@ def _scan_ts_imports(
         # Normalize .. and . in path
         resolved = str(PurePosixPath(resolved))
         # PurePosixPath doesn't resolve .., do it manually
-        resolved = _normalize_posix_path(resolved)
+        targets.append(_normalize_posix_path(resolved))
 
-        # Check against known module paths
-        for mod_path, mod_name in mod_path_to_name.items():
-            if mod_path == ".":
-                continue
-            if resolved.startswith(mod_path) and mod_name != own_module_name:
-                deps.add(mod_name)
-                break
-
-    return deps
+    return targets
 
 
 def _normalize_posix_path(path: str) -> str:
@@ -596,3 +880,385 @@ def _normalize_posix_path(path: str) -> str:
         elif part != ".":
             result.append(part)
     return "/".join(result)
+
+
+# ── Incremental Graph ──────────────────────────────────────────────
+
+
+class IncrementalGraph:
+    """Module graph maintained incrementally from per-file symbol deltas.
+
+    Keeps the clustered modules together with per-file hierarchies and
+    per-file module dependencies, so apply() only has to patch the modules
+    touched by the changed files. It falls back to a full rebuild when the
+    change would flip one of ModuleClusterer's split decisions (a directory
+    crossing max_module_symbols), since that reshapes the module layout.
+    The result is always identical to clustering from scratch.
+
+    Hierarchy targets are resolved to FQNs through a TypeResolver kept
+    alongside the symbols. An index from each type name to the files whose
+    hierarchies mention it means a type being defined, moved or removed
+    only re-matches and re-resolves those files.
+
+    Usage:
+        graph = IncrementalGraph(ModuleClusterer(), scan_imports)
+        graph.rebuild(symbols_by_file)
+        symbols_by_file["src/auth/login.py"] = new_symbols
+        graph.apply(symbols_by_file, ["src/auth/login.py"])
+        graph.modules, graph.hierarchies
+    """
+
+    def __init__(
+        self,
+        clusterer: ModuleClusterer,
+        scan_imports: Callable[[str], list[str]],
+    ) -> None:
+        """Initialize an empty graph.
+
+        Args:
+            clusterer: Clusterer defining the module layout.
+            scan_imports: Callable returning a file's import targets
+                (see scan_file_imports), typically served from a cache.
+        """
+        self._clusterer = clusterer
+        self._scan_imports = scan_imports
+        self.full_rebuilds = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._modules: dict[str, Module] = {}
+        self._module_list: list[Module] = []
+        self._module_files: dict[str, dict[str, Sequence[Symbol]]] = {}
+        self._module_sizes: dict[str, int] = {}
+        self._bucket_modules: dict[str, set[str]] = {}
+        self._file_module: dict[str, str] = {}
+        self._file_deps: dict[str, set[str]] = {}
+        self._file_hierarchies: dict[str, list[Hierarchy]] = {}
+        self._types = TypeResolver()
+        # The type names each file's hierarchies depend on, and the
+        # reverse index: name -> files whose hierarchies depend on it
+        self._file_type_refs: dict[str, frozenset[str]] = {}
+        self._type_ref_files: dict[str, set[str]] = {}
+        self._path_index = ModulePathIndex([])
+        self._hierarchies: list[Hierarchy] = []
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._file_module
+
+    @property
+    def modules(self) -> list[Module]:
+        """Modules sorted by path, as ModuleClusterer.cluster() returns them."""
+        return self._module_list
+
+    @property
+    def hierarchies(self) -> list[Hierarchy]:
+        """Hierarchies in symbols_by_file order, as extract_hierarchies()."""
+        return self._hierarchies
+
+    # ── Full rebuild ──
+
+    def rebuild(self, symbols_by_file: Mapping[str, Sequence[Symbol]]) -> None:
+        """Recompute the whole graph from scratch."""
+        self._reset()
+        self.full_rebuilds += 1
+
+        module_files = (
+            self._clusterer.assign(symbols_by_file) if symbols_by_file else {}
+        )
+        for mod_path, files in module_files.items():
+            self._module_files[mod_path] = files
+            self._module_sizes[mod_path] = ModuleClusterer._symbol_count(files)
+            for file_path in files:
+                self._file_module[file_path] = mod_path
+            bucket = ModuleClusterer._module_path_for(next(iter(files)))
+            self._bucket_modules.setdefault(bucket, set()).add(mod_path)
+            self._modules[mod_path] = ModuleClusterer.build_module(mod_path, files)
+        self._module_list = [self._modules[p] for p in sorted(self._modules)]
+
+        for path, syms in symbols_by_file.items():
+            self._types.update(path, syms)
+        self._refresh_hierarchies(symbols_by_file, symbols_by_file)
+        self._resolve_all_deps()
+
+    # ── Incremental update ──
+
+    def apply(
+        self,
+        symbols_by_file: Mapping[str, Sequence[Symbol]],
+        changed_files: Iterable[str],
+    ) -> bool:
+        """Absorb changes already applied to symbols_by_file.
+
+        Args:
+            symbols_by_file: The full, updated symbol map.
+            changed_files: Paths whose entry was added, replaced or removed
+                since the last rebuild()/apply().
+
+        Returns:
+            True if the graph was patched in place, False if the change
+            crossed a split threshold and forced a full rebuild.
+        """
+        changed = list(dict.fromkeys(changed_files))
+        targets = {
+            path: self._file_module.get(path) or self._module_for_new_file(path)
+            for path in changed
+            if path in symbols_by_file
+        }
+        if not self._layout_stable(symbols_by_file, changed, targets):
+            self.rebuild(symbols_by_file)
+            return False
+
+        touched_modules: set[str] = set()
+        # Key-type names whose definitions changed
+        redefined: set[str] = set()
+        for path in changed:
+            old_mod = self._file_module.get(path)
+            if old_mod is not None:
+                old_syms = self._module_files[old_mod][path]
+                self._module_sizes[old_mod] -= len(old_syms)
+                touched_modules.add(old_mod)
+
+            new_mod = targets.get(path)
+            if new_mod is None:
+                if old_mod is not None:
+                    del self._module_files[old_mod][path]
+                    del self._file_module[path]
+                self._file_deps.pop(path, None)
+                self._file_hierarchies.pop(path, None)
+                self._index_type_refs(path, None)
+                redefined |= self._types.update(path, None)
+                continue
+
+            # An existing file keeps its module, so this updates it in place
+            syms = symbols_by_file[path]
+            self._module_files.setdefault(new_mod, {})[path] = syms
+            self._module_sizes[new_mod] = self._module_sizes.get(new_mod, 0) + len(syms)
+            self._file_module[path] = new_mod
+            redefined |= self._types.update(path, syms)
+            touched_modules.add(new_mod)
+
+        layout_changed = self._patch_modules(touched_modules)
+
+        # "contains" matching and target resolution depend on the known
+        # types; when a name's definitions change the files that mention
+        # it are re-matched and re-resolved.
+        refresh = set(targets)
+        for name in redefined:
+            refresh.update(self._type_ref_files.get(name, ()))
+
+        self._refresh_hierarchies(symbols_by_file, refresh)
+
+        if layout_changed:
+            self._resolve_all_deps()
+        else:
+            for path, mod_path in targets.items():
+                self._file_deps[path] = _resolve_import_deps(
+                    self._scan_imports(path),
+                    self._path_index,
+                    self._modules[mod_path].name,
+                )
+            for mod_path in touched_modules:
+                if mod_path in self._modules:
+                    self._update_module_deps(mod_path)
+
+        return True
+
+    def _index_type_refs(
+        self,
+        file_path: str,
+        symbols: Sequence[Symbol] | None,
+        hierarchies: Iterable[Hierarchy] = (),
+    ) -> None:
+        """Re-index the type names a file references (None: file removed).
+
+        These are the names its "contains" matching looks up plus the
+        targets of its extends/implements relationships.
+        """
+        for name in self._file_type_refs.pop(file_path, ()):
+            files = self._type_ref_files[name]
+            files.discard(file_path)
+            if not files:
+                del self._type_ref_files[name]
+        if symbols is None:
+            return
+
+        names = _contained_type_names(symbols) | {
+            _target_type_name(h.target)
+            for h in hierarchies
+            if h.relationship != "contains"
+        }
+        if names:
+            self._file_type_refs[file_path] = names
+            for name in names:
+                self._type_ref_files.setdefault(name, set()).add(file_path)
+
+    def _module_for_new_file(self, file_path: str) -> str:
+        """Module a file not yet in the graph lands in under the current splits."""
+        bucket = ModuleClusterer._module_path_for(file_path)
+        if bucket == ".":
+            return bucket
+
+        bucket_modules = self._bucket_modules.get(bucket, set())
+        dir_parts = file_path.split("/")[:-1]
+        mod_path = bucket
+        depth = len(bucket.split("/"))
+        # A directory was split iff some module of the bucket lies below it
+        while depth < len(dir_parts) and _has_submodule(mod_path, bucket_modules):
+            depth += 1
+            mod_path = "/".join(dir_parts[:depth])
+        return mod_path
+
+    def _layout_stable(
+        self,
+        symbols_by_file: Mapping[str, Sequence[Symbol]],
+        changed: list[str],
+        targets: dict[str, str],
+    ) -> bool:
+        """Check that the delta keeps every split decision of the clusterer.
+
+        Only directories on the path of a changed file can change their
+        subtree symbol count, so only those decisions are re-evaluated,
+        top-down from the file's base module.
+        """
+        # Per base module: module path -> symbol count after the delta
+        counts_by_bucket: dict[str, dict[str, int]] = {}
+        files_by_bucket: dict[str, list[str]] = {}
+        for path in changed:
+            bucket = ModuleClusterer._module_path_for(path)
+            files_by_bucket.setdefault(bucket, []).append(path)
+            counts = counts_by_bucket.get(bucket)
+            if counts is None:
+                counts = {
+                    m: self._module_sizes[m]
+                    for m in self._bucket_modules.get(bucket, ())
+                }
+                counts_by_bucket[bucket] = counts
+
+            old_mod = self._file_module.get(path)
+            if old_mod is not None:
+                counts[old_mod] -= len(self._module_files[old_mod][path])
+            new_mod = targets.get(path)
+            if new_mod is not None:
+                counts[new_mod] = counts.get(new_mod, 0) + len(symbols_by_file[path])
+
+        changed_set = set(changed)
+        max_symbols = self._clusterer.max_module_symbols
+
+        for bucket, paths in files_by_bucket.items():
+            if bucket == ".":
+                # The root module is never split
+                continue
+            old_modules = self._bucket_modules.get(bucket, set())
+            counts = counts_by_bucket[bucket]
+            new_modules = {m for m, count in counts.items() if count > 0}
+            depth = len(bucket.split("/"))
+
+            for path in paths:
+                dir_parts = path.split("/")[:-1]
+                for end in range(depth, len(dir_parts) + 1):
+                    directory = "/".join(dir_parts[:end])
+                    was_split = _has_submodule(directory, old_modules)
+
+                    prefix = directory + "/"
+                    subtree = sum(
+                        count
+                        for m, count in counts.items()
+                        if count > 0 and (m == directory or m.startswith(prefix))
+                    )
+                    splits = subtree > max_symbols and (
+                        _has_submodule(directory, new_modules)
+                        or self._has_nested_file(directory, changed_set, targets)
+                    )
+                    if splits != was_split:
+                        return False
+                    if not splits:
+                        break
+        return True
+
+    def _has_nested_file(
+        self,
+        mod_path: str,
+        changed: set[str],
+        targets: dict[str, str],
+    ) -> bool:
+        """Whether a module holds, after the delta, a file below its directory."""
+        files = [f for f in self._module_files.get(mod_path, ()) if f not in changed]
+        files.extend(f for f, target in targets.items() if target == mod_path)
+        return any(f.rsplit("/", 1)[0] != mod_path for f in files)
+
+    def _patch_modules(self, touched_modules: set[str]) -> bool:
+        """Rebuild touched Module objects; return whether modules came or went."""
+        layout_changed = False
+
+        for mod_path in touched_modules:
+            files = self._module_files.get(mod_path)
+            bucket_modules = self._bucket_modules
+            if not files:
+                self._module_files.pop(mod_path, None)
+                self._module_sizes.pop(mod_path, None)
+                if self._modules.pop(mod_path, None) is not None:
+                    layout_changed = True
+                for modules in bucket_modules.values():
+                    modules.discard(mod_path)
+                continue
+
+            module = ModuleClusterer.build_module(mod_path, files)
+            existing = self._modules.get(mod_path)
+            if existing is None:
+                self._modules[mod_path] = module
+                bucket = ModuleClusterer._module_path_for(next(iter(files)))
+                bucket_modules.setdefault(bucket, set()).add(mod_path)
+                layout_changed = True
+            else:
+                existing.symbols = module.symbols
+                existing.key_types = module.key_types
+
+        if layout_changed:
+            self._bucket_modules = {b: m for b, m in self._bucket_modules.items() if m}
+            self._module_list = [self._modules[p] for p in sorted(self._modules)]
+        return layout_changed
+
+    def _refresh_hierarchies(
+        self,
+        symbols_by_file: Mapping[str, Sequence[Symbol]],
+        files: Iterable[str],
+    ) -> None:
+        """Re-extract and resolve hierarchies for files, then reassemble."""
+        for path in files:
+            syms = symbols_by_file[path]
+            hierarchies = extract_file_hierarchies(syms, self._types)
+            self._index_type_refs(path, syms, hierarchies)
+            self._file_hierarchies[path] = self._types.resolve_hierarchies(
+                hierarchies, path, self._scan_imports
+            )
+
+        hierarchies: list[Hierarchy] = []
+        for path in symbols_by_file:
+            hierarchies.extend(self._file_hierarchies[path])
+        self._hierarchies = hierarchies
+
+    def _resolve_all_deps(self) -> None:
+        """Resolve every file's imports against the current module layout."""
+        self._path_index = ModulePathIndex(self._module_list)
+        self._file_deps = {
+            path: _resolve_import_deps(
+                self._scan_imports(path),
+                self._path_index,
+                self._modules[mod_path].name,
+            )
+            for path, mod_path in self._file_module.items()
+        }
+        for mod_path in self._modules:
+            self._update_module_deps(mod_path)
+
+    def _update_module_deps(self, mod_path: str) -> None:
+        deps: set[str] = set()
+        for file_path in self._module_files[mod_path]:
+            deps |= self._file_deps[file_path]
+        self._modules[mod_path].depends_on = sorted(deps)
+
+
+def _has_submodule(directory: str, module_paths: Iterable[str]) -> bool:
+    """Whether any module path lies strictly below directory."""
+    prefix = directory + "/"
+    return any(m.startswith(prefix) for m in module_paths)
@@ -0,0 +1,142 @@
+"""File content hashing shared by the hash strategies.
+
+HashAlgorithm bundles a hash function with the tag that prefixes its
+digests ("sha256:<hex>", "blake2b-128:<hex>", ...), so hashes produced by
+different algorithms — including ones persisted by an earlier run — never
+compare equal by accident. SHA-256 is the default. Change detection doesn't
+need a cryptographic hash, so XXH3-128 (with the optional xxhash package) is
+offered as a much faster alternative, and BLAKE2b with a 128-bit digest as a
+stdlib one — faster than SHA-256 on CPUs without SHA instructions, slower on
+CPUs with them (most current x86 and ARM chips).
+
+Small files (the vast majority of source files) are read with a single
+read() call. Files at or above MMAP_THRESHOLD are memory-mapped and fed to
+the hash in one update() call, which avoids copying them through Python
+buffers. hashlib releases the GIL while hashing, so both paths scale across
+threads (see HashStrategy.hash_many).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD = 1 << 20
+
+# Read size when a large file can't be memory-mapped
+_CHUNK_SIZE = 1 << 20
+
+
+class _Hash(Protocol):
+    def update(self, data: bytes, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+def update_from_file(h: _Hash, f: BinaryIO, size: int) -> None:
+    """Feed the content of an open binary file into a hash object.
+
+    Args:
+        h: A hashlib-style object.
+        f: File opened in binary mode, positioned at the start.
+        size: The file's size (from fstat), used to pick the read strategy.
+
+    Raises:
+        OSError: If the file can't be read.
+    """
+    if size < MMAP_THRESHOLD:
+        h.update(f.read())
+        return
+
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            h.update(mm)
+        return
+    except (OSError, ValueError):
+        # Not mappable (special file, or truncated since fstat) — read it
+        f.seek(0)
+
+    while chunk := f.read(_CHUNK_SIZE):
+        h.update(chunk)
+
+
+# ── Algorithms ─────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True, slots=True)
+class HashAlgorithm:
+    """A content hash function and the tag identifying its digests.
+
+    Attributes:
+        name: Name used to select the algorithm (e.g. "blake2b").
+        tag: Digest format tag prefixed to every digest (e.g. "blake2b-128").
+        new: Factory returning a fresh hashlib-style object.
+    """
+
+    name: str
+    tag: str
+    new: Callable[[], _Hash]
+
+    def hex_file(self, path: str | Path) -> str:
+        """Hex digest of a file's content, or "" if it can't be read."""
+        h = self.new()
+        try:
+            with open(path, "rb") as f:
+                update_from_file(h, f, os.fstat(f.fileno()).st_size)
+        except OSError:
+            return ""
+        return h.hexdigest()
+
+    def digest_file(self, path: str | Path) -> str:
+        """Tagged digest ("<tag>:<hex>") of a file, or "" if it can't be read."""
+        hex_digest = self.hex_file(path)
+        return f"{self.tag}:{hex_digest}" if hex_digest else ""
+
+
+SHA256 = HashAlgorithm("sha256", "sha256", hashlib.sha256)
+
+BLAKE2B = HashAlgorithm(
+    "blake2b", "blake2b-128", lambda: hashlib.blake2b(digest_size=16)
+)
+
+XXH3 = HashAlgorithm("xxh3", "xxh3-128", xxhash.xxh3_128) if xxhash else None
+
+# Algorithm names accepted by get_algorithm()
+HASH_ALGORITHM_NAMES: tuple[str, ...] = ("sha256", "blake2b", "xxh3")
+
+
+def get_algorithm(name: str) -> HashAlgorithm:
+    """Look up a hash algorithm by name.
+
+    "xxh3" falls back to BLAKE2b when the xxhash package isn't installed.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name == "xxh3":
+        if XXH3 is not None:
+            return XXH3
+        logger.warning("xxhash is not installed; hashing with BLAKE2b instead")
+        return BLAKE2B
+    for algorithm in (SHA256, BLAKE2B):
+        if algorithm.name == name:
+            return algorithm
+    raise ValueError(
+        f"Unknown hash algorithm {name!r} "
+        f"(expected one of {', '.join(HASH_ALGORITHM_NAMES)})"
+    )
@@ -16,6 +16,10 @@ except ImportError:
     import tomli as tomllib  # type: ignore[no-redef]
 
 
+# Manifest files (relative to the project root) read by ManifestParser
+MANIFEST_FILES: tuple[str, ...] = ("package.json", "pyproject.toml")
+
+
 @dataclass(frozen=True, slots=True)
 class Dependency:
     """A project dependency extracted from a manifest file.
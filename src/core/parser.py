@@ -2,20 +2,62 @@
 
 Wraps Kit's Repository API to extract symbols from source files,
 normalizing the output into our Symbol dataclass format.
+
+Symbols are extracted with Kit's tree-sitter parsers and queries, but
+only each definition's first line is read from the source: Kit's own
+extract_symbols() decodes the full body of every symbol (a class body
+again for each of its methods) just for the signature to keep one line.
+
+Parsed symbols are kept in SymbolTables: a column per Symbol field, with
+names and paths interned, line numbers in arrays, kinds as small ints, the
+file path stored once per file and the fqn derived on access. Tables are
+Sequence[Symbol]s, so code that iterates or indexes them sees ordinary
+Symbol objects, materialized only while it uses them.
+
+While the syntax tree is at hand, parse_file() also records the type
+references that make up hierarchies — base classes, implemented interfaces
+and the types named in field annotations — in the file's SymbolTable, so
+hierarchy extraction doesn't have to re-read them from signatures. The
+names each symbol calls are matched in the same query pass as the
+definitions; they are what parsing costs beyond Kit's own query, in
+proportion to the number of call sites.
 """
 
 from __future__ import annotations
 
+import functools
+import logging
+import math
 import os
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Container, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import overload
 
+import tree_sitter
 from kit import Repository
+from kit.tree_sitter_symbol_extractor import LANGUAGES, TreeSitterSymbolExtractor
+
+from src.core.strings import STRINGS
+
+logger = logging.getLogger(__name__)
 
 
 # File extensions we support for symbol extraction
 SUPPORTED_EXTENSIONS: set[str] = {".ts", ".tsx", ".js", ".jsx", ".py"}
 
+# Version of the Symbol normalization below. Bump whenever parse_file output
+# changes for the same input so persisted symbol caches are invalidated.
+PARSER_VERSION = 4
+
+# Upper bound on files handed to a worker process per task. Small enough to
+# keep workers evenly loaded, large enough to amortize pickling overhead.
+MAX_CHUNK_SIZE = 64
+
 
 @dataclass(frozen=True, slots=True)
 class Symbol:
@@ -40,6 +82,356 @@ class Symbol:
     fqn: str
 
 
+# ── Columnar symbol storage ───────────────────────────────────────
+
+# Kinds stored in SymbolTable's kind column, by code. Kinds outside
+# _normalize_kind's vocabulary are appended as they're first seen, so codes
+# are only meaningful within one process (pickling stores the strings).
+_KINDS: list[str] = [
+    "fn",
+    "class",
+    "method",
+    "interface",
+    "type",
+    "enum",
+    "variable",
+    "module",
+    "struct",
+    "trait",
+]
+_KIND_CODES: dict[str, int] = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+def _kind_code(kind: str) -> int:
+    """Small-int code for a symbol kind, registering new kinds."""
+    code = _KIND_CODES.get(kind)
+    if code is None:
+        code = _KIND_CODES[kind] = len(_KINDS)
+        _KINDS.append(sys.intern(kind))
+    return code
+
+
+# A SymbolTable row: (name, kind, file, line, end_line, signature)
+SymbolRow = tuple[str, str, str, int, int, str]
+
+# A type reference declared by a symbol: (row index of the symbol,
+# relationship, referenced type name). Relationships are "extends" and
+# "implements" (from class headers) and "contains" (from field types).
+TypeRef = tuple[int, str, str]
+
+# A call made by a symbol: (row index of the calling symbol, called name).
+# Calls through the instance or class (`self.f()`, `cls.f()`, `this.f()`)
+# are recorded as SELF_CALL_PREFIX + name; calls on other objects aren't
+# recorded, since their target can't be told from the name alone.
+CallRef = tuple[int, str]
+SELF_CALL_PREFIX = "self."
+
+
+class SymbolTable(Sequence[Symbol]):
+    """Immutable, column-oriented sequence of symbols.
+
+    Stores each Symbol field in its own column instead of one object per
+    symbol: file paths are interned in the shared StringPool and names
+    with sys.intern(), line numbers live in arrays, kinds are small-int
+    codes, consecutive symbols of the same file share one path entry, and
+    fqn isn't stored at all. Indexing or iterating yields regular Symbol
+    objects built on demand, so a table can be used anywhere a list[Symbol]
+    is read.
+
+    Tables built by parse_file() from a syntax tree also carry the type
+    references their symbols declare and the names they call (see
+    type_refs and calls).
+
+    Usage:
+        table = SymbolTable(symbols)  # from any iterable of Symbols
+        table[0].fqn, len(table), list(table)
+
+        # One table spanning several files, without materializing Symbols
+        module_table = SymbolTable.concat(file_tables)
+    """
+
+    __slots__ = (
+        "_names",
+        "_kinds",
+        "_lines",
+        "_end_lines",
+        "_signatures",
+        "_files",
+        "_file_ends",
+        "_type_refs",
+        "_calls",
+    )
+
+    def __init__(self, symbols: Iterable[Symbol] = ()) -> None:
+        """Build a table from Symbols (their fqn is re-derived on access)."""
+        self._names: list[str] = []
+        self._kinds = array("H")
+        self._lines = array("i")
+        self._end_lines = array("i")
+        self._signatures: list[str] = []
+        # Runs of consecutive rows in the same file: _files[k] covers rows
+        # up to (excluding) _file_ends[k]
+        self._files: list[str] = []
+        self._file_ends = array("I")
+        self._type_refs: tuple[TypeRef, ...] | None = None
+        self._calls: tuple[CallRef, ...] | None = None
+        for sym in symbols:
+            self._append(
+                sym.name, sym.kind, sym.file, sym.line, sym.end_line, sym.signature
+            )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[SymbolRow],
+        type_refs: Iterable[TypeRef] | None = None,
+        calls: Iterable[CallRef] | None = None,
+    ) -> SymbolTable:
+        """Build a table from (name, kind, file, line, end_line, signature) rows.
+
+        Args:
+            rows: The symbol rows.
+            type_refs: The type references the rows declare, or None if
+                they weren't captured.
+            calls: The names the rows call, or None if they weren't
+                captured.
+        """
+        table = cls()
+        for row in rows:
+            table._append(*row)
+        if type_refs is not None:
+            table._type_refs = tuple(
+                (index, sys.intern(relationship), sys.intern(target))
+                for index, relationship, target in type_refs
+            )
+        if calls is not None:
+            table._calls = tuple(
+                (index, sys.intern(name)) for index, name in calls
+            )
+        return table
+
+    @classmethod
+    def concat(cls, tables: Iterable[Sequence[Symbol]]) -> SymbolTable:
+        """Concatenate symbol sequences, copying columns of SymbolTables.
+
+        The result carries type references (and calls) only if every
+        non-empty input is a table that does.
+        """
+        result = cls()
+        type_refs: list[TypeRef] | None = []
+        calls: list[CallRef] | None = []
+        for table in tables:
+            if not isinstance(table, SymbolTable):
+                if table:
+                    type_refs = calls = None
+                for sym in table:
+                    result._append(
+                        sym.name,
+                        sym.kind,
+                        sym.file,
+                        sym.line,
+                        sym.end_line,
+                        sym.signature,
+                    )
+                continue
+
+            offset = len(result._names)
+            if table and (type_refs is None or table._type_refs is None):
+                type_refs = None
+            elif table:
+                type_refs.extend(
+                    (offset + index, relationship, target)
+                    for index, relationship, target in table._type_refs
+                )
+            if table and (calls is None or table._calls is None):
+                calls = None
+            elif table:
+                calls.extend((offset + index, name) for index, name in table._calls)
+
+            for path, end in zip(table._files, table._file_ends):
+                result._add_run(path, offset + end)
+            result._names.extend(table._names)
+            result._kinds.extend(table._kinds)
+            result._lines.extend(table._lines)
+            result._end_lines.extend(table._end_lines)
+            result._signatures.extend(table._signatures)
+        if type_refs is not None:
+            result._type_refs = tuple(type_refs)
+        if calls is not None:
+            result._calls = tuple(calls)
+        return result
+
+    def _append(
+        self,
+        name: str,
+        kind: str,
+        file: str,
+        line: int,
+        end_line: int,
+        signature: str,
+    ) -> None:
+        self._names.append(sys.intern(name))
+        self._kinds.append(_kind_code(kind))
+        self._lines.append(line)
+        self._end_lines.append(end_line)
+        self._signatures.append(signature)
+        self._add_run(file, len(self._names))
+
+    def _add_run(self, file: str, end: int) -> None:
+        """Extend the last file run to end, or start a new run for file."""
+        if self._files and self._files[-1] == file:
+            self._file_ends[-1] = end
+        else:
+            self._files.append(STRINGS.intern(file))
+            self._file_ends.append(end)
+
+    @property
+    def files(self) -> list[str]:
+        """Distinct consecutive file paths, in row order."""
+        return list(self._files)
+
+    @property
+    def type_refs(self) -> tuple[TypeRef, ...] | None:
+        """(row index, relationship, type name) references, in row order.
+
+        None when the table wasn't parsed from a syntax tree (built from
+        Symbols, or by Kit's fallback extraction), as opposed to () for a
+        table whose symbols declare no references.
+        """
+        return self._type_refs
+
+    @property
+    def calls(self) -> tuple[CallRef, ...] | None:
+        """(row index, called name) pairs, in row order.
+
+        Each symbol lists the names called directly in its body, once
+        each (see CallRef). None when the table wasn't parsed from a
+        syntax tree.
+        """
+        return self._calls
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @overload
+    def __getitem__(self, index: int) -> Symbol: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Symbol]: ...
+
+    def __getitem__(self, index: int | slice) -> Symbol | list[Symbol]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SymbolTable index out of range")
+        file = self._files[bisect_right(self._file_ends, index)]
+        return self._symbol(index, file, _module_path(file))
+
+    def __iter__(self) -> Iterator[Symbol]:
+        start = 0
+        for file, end in zip(self._files, self._file_ends):
+            module = _module_path(file)
+            for i in range(start, end):
+                yield self._symbol(i, file, module)
+            start = end
+
+    def of_kinds(self, kinds: Container[str]) -> Iterator[Symbol]:
+        """Iterate the symbols whose kind is in kinds, in row order.
+
+        Scans the kind column and only materializes matching rows.
+        """
+        codes = {code for code, kind in enumerate(_KINDS) if kind in kinds}
+        start = 0
+        for file, end in zip(self._files, self._file_ends):
+            module: str | None = None
+            for i in range(start, end):
+                if self._kinds[i] in codes:
+                    if module is None:
+                        module = _module_path(file)
+                    yield self._symbol(i, file, module)
+            start = end
+
+    def _symbol(self, i: int, file: str, module: str) -> Symbol:
+        name = self._names[i]
+        return Symbol(
+            name,
+            _KINDS[self._kinds[i]],
+            file,
+            self._lines[i],
+            self._end_lines[i],
+            self._signatures[i],
+            f"{module}::{name}",
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SymbolTable):
+            return (
+                self._names == other._names
+                and self._kinds == other._kinds
+                and self._lines == other._lines
+                and self._end_lines == other._end_lines
+                and self._signatures == other._signatures
+                and self._files == other._files
+                and self._file_ends == other._file_ends
+                and self._type_refs == other._type_refs
+                and self._calls == other._calls
+            )
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SymbolTable({list(self)!r})"
+
+    def __reduce__(self) -> tuple:
+        # Kind codes are per-process — ship the kind strings across pickling
+        return (
+            SymbolTable.from_rows,
+            (list(self.rows()), self._type_refs, self._calls),
+        )
+
+    def rows(self) -> Iterator[SymbolRow]:
+        """Iterate (name, kind, file, line, end_line, signature) rows.
+
+        Cheaper than iterating Symbols when the fqn isn't needed.
+        """
+        start = 0
+        for file, end in zip(self._files, self._file_ends):
+            for i in range(start, end):
+                yield (
+                    self._names[i],
+                    _KINDS[self._kinds[i]],
+                    file,
+                    self._lines[i],
+                    self._end_lines[i],
+                    self._signatures[i],
+                )
+            start = end
+
+
+def filter_kinds(symbols: Sequence[Symbol], kinds: Container[str]) -> Iterator[Symbol]:
+    """Iterate the symbols whose kind is in kinds.
+
+    Equivalent to (s for s in symbols if s.kind in kinds), but doesn't
+    materialize the other rows of a SymbolTable.
+    """
+    if isinstance(symbols, SymbolTable):
+        return symbols.of_kinds(kinds)
+    return (sym for sym in symbols if sym.kind in kinds)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _module_path(file_path: str) -> str:
+    """The module part of fqns for symbols in file_path (see _make_fqn)."""
+    return str(Path(file_path).with_suffix(""))
+
+
 def _normalize_kind(raw_type: str) -> str:
     """Normalize Kit's symbol type strings to our kind vocabulary.
 
@@ -83,8 +475,7 @@ def _make_fqn(file_path: str, symbol_name: str) -> str:
     Converts "src/auth/login.ts" + "authenticate" -> "src/auth/login::authenticate"
     """
     # Strip extension from file path for the module part
-    module_path = str(Path(file_path).with_suffix(""))
-    return f"{module_path}::{symbol_name}"
+    return f"{_module_path(file_path)}::{symbol_name}"
 
 
 def _has_supported_extension(file_path: str) -> bool:
@@ -92,6 +483,362 @@ def _has_supported_extension(file_path: str) -> bool:
     return Path(file_path).suffix in SUPPORTED_EXTENSIONS
 
 
+# ── Declaration extraction ────────────────────────────────────────
+
+# (name, raw Kit type, start line, end line, first line of the definition,
+# (relationship, type name) references declared by the definition, names
+# called directly inside it)
+Declaration = tuple[str, str, int, int, str, list[tuple[str, str]], list[str]]
+
+# Class definition nodes whose headers list base classes (Python) or a
+# class_heritage (JavaScript/TypeScript)
+_CLASS_NODE_TYPES = frozenset(
+    {"class_definition", "class_declaration", "abstract_class_declaration", "class"}
+)
+
+# Type definition nodes: classes, interfaces and type aliases
+_TYPE_NODE_TYPES = _CLASS_NODE_TYPES | {
+    "interface_declaration",
+    "type_alias_declaration",
+}
+
+# Member nodes whose "type" field annotates a field of the enclosing type
+_FIELD_NODE_TYPES = frozenset({"public_field_definition", "property_signature"})
+
+# Nodes naming a type inside an annotation
+_TYPE_NAME_NODE_TYPES = frozenset({"identifier", "type_identifier"})
+
+# Call sites: the called name of plain calls (`f()`) and constructions
+# (`new F()`) as @callee, and of calls through the instance or class
+# (`self.f()`, `this.f()`) as @self_callee
+_PY_CALL_QUERY = """
+(call function: [(identifier) @callee
+                 (attribute object: (identifier) @receiver
+                            attribute: (identifier) @self_callee
+                            (#any-of? @receiver "self" "cls"))])
+"""
+_JS_CALL_QUERY = """
+(call_expression function: [(identifier) @callee
+                            (member_expression
+                              object: (this)
+                              property: (property_identifier) @self_callee)])
+(new_expression constructor: (identifier) @callee)
+"""
+_CALL_QUERIES = {
+    ".py": _PY_CALL_QUERY,
+    ".js": _JS_CALL_QUERY,
+    ".jsx": _JS_CALL_QUERY,
+    ".ts": _JS_CALL_QUERY,
+    ".tsx": _JS_CALL_QUERY,
+}
+
+
+def _extract_declarations(ext: str, source: bytes) -> list[Declaration] | None:
+    """Extract symbol declarations from source with Kit's tree-sitter queries.
+
+    Mirrors Kit's TreeSitterSymbolExtractor.extract_symbols() — same
+    captures, types, line spans and de-duplication — except that only the
+    first line of each definition node is decoded, not the whole body.
+    The type references of each definition are read from its node (see
+    _declared_type_refs), and every call site is attributed to the
+    innermost definition around it (see _calls_by_definition).
+
+    Call sites come from the same query pass as the definitions (see
+    _symbol_query), so the tree is only walked once.
+
+    Args:
+        ext: File extension selecting the language (e.g. ".py").
+        source: The file's UTF-8 content.
+
+    Returns:
+        The declarations in match order, or None if the installed
+        tree-sitter lacks the query API (callers then fall back to Kit).
+    """
+    parser = TreeSitterSymbolExtractor.get_parser(ext)
+    symbol_query = _symbol_query(ext)
+    if parser is None or symbol_query is None:
+        return []
+    query, kit_patterns = symbol_query
+    try:
+        cursor = tree_sitter.QueryCursor(query)
+    except AttributeError:
+        return None
+
+    declarations: list[Declaration] = []
+    definition_nodes: list[tree_sitter.Node] = []
+    call_sites: list[tuple[int, str]] = []
+    seen: set[tuple[str, str, int, int]] = set()
+    try:
+        root = parser.parse(source).root_node
+        for pattern, captures in cursor.matches(root):
+            if pattern >= kit_patterns:
+                # A call site (one of the _CALL_QUERIES patterns); slicing
+                # the source is cheaper than Node.text for this many nodes
+                for node in captures.get("callee", ()):
+                    start = node.start_byte
+                    callee = source[start : node.end_byte].decode()
+                    call_sites.append((start, callee))
+                for node in captures.get("self_callee", ()):
+                    start = node.start_byte
+                    callee = source[start : node.end_byte].decode()
+                    call_sites.append((start, SELF_CALL_PREFIX + callee))
+                continue
+
+            # Name node: @name, else @type, else the first capture
+            if "name" in captures:
+                name_nodes = captures["name"]
+            elif "type" in captures:
+                name_nodes = captures["type"]
+            else:
+                name_nodes = next(iter(captures.values()), [])
+            if not name_nodes:
+                continue
+            name_node = name_nodes[0]
+            name = name_node.text.decode() if name_node.text else str(name_node)
+
+            # Type and span come from the @definition.<type> capture
+            body_node = name_node
+            definition = next(
+                (
+                    (capture, nodes)
+                    for capture, nodes in captures.items()
+                    if capture.startswith("definition.")
+                ),
+                None,
+            )
+            if definition is not None:
+                raw_type = definition[0].split(".")[-1]
+                if definition[1]:
+                    body_node = definition[1][0]
+            else:
+                raw_type = next(iter(captures)).removeprefix("definition.")
+
+            start_line = body_node.start_point[0]
+            end_line = body_node.end_point[0]
+            key = (name, raw_type, start_line, end_line)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            start, end = body_node.start_byte, body_node.end_byte
+            newline = source.find(b"\n", start, end)
+            first_line = source[start : end if newline < 0 else newline]
+            declarations.append(
+                (
+                    name,
+                    raw_type,
+                    start_line,
+                    end_line,
+                    first_line.decode("utf-8", errors="ignore"),
+                    _declared_type_refs(body_node),
+                    [],
+                )
+            )
+            definition_nodes.append(body_node)
+
+        calls = _calls_by_definition(call_sites, definition_nodes)
+        for declaration, called in zip(declarations, calls):
+            declaration[6].extend(called)
+    except Exception as e:
+        # Kit treats any extraction failure as "no symbols"
+        logger.warning("Symbol extraction failed (%s): %s", ext, e)
+        return []
+    return declarations
+
+
+@functools.lru_cache(maxsize=None)
+def _symbol_query(ext: str) -> tuple[tree_sitter.Query, int] | None:
+    """Kit's symbol query for a language, with its call-site patterns appended.
+
+    Returns the query and the number of Kit's own patterns in it: matches
+    of any later pattern are call sites. If the language has no call
+    query or the two don't compile together, Kit's query is returned
+    alone and no calls are recorded. None if Kit has no query.
+    """
+    query = TreeSitterSymbolExtractor.get_query(ext)
+    if query is None:
+        return None
+    parser = TreeSitterSymbolExtractor.get_parser(ext)
+    calls = _CALL_QUERIES.get(ext)
+    if parser is None or calls is None:
+        return query, query.pattern_count
+    try:
+        source = TreeSitterSymbolExtractor._load_query_files(LANGUAGES[ext])
+        combined = tree_sitter.Query(parser.language, f"{source}\n{calls}")
+    except Exception as e:
+        logger.warning("Call query unavailable (%s): %s", ext, e)
+        return query, query.pattern_count
+    return combined, query.pattern_count
+
+
+def _calls_by_definition(
+    sites: Iterable[tuple[int, str]],
+    definitions: Sequence[tree_sitter.Node],
+) -> list[list[str]]:
+    """The names called inside each definition, without repeats.
+
+    A call belongs to the innermost definition enclosing it, so a method's
+    calls aren't also attributed to its class. Calls outside every
+    definition (module-level code) are dropped.
+
+    Args:
+        sites: (start byte, called name) of every call site, in any order.
+        definitions: The definition nodes, in declaration order.
+    """
+    calls: list[dict[str, None]] = [{} for _ in definitions]
+    if not definitions:
+        return []
+
+    # Definition spans ordered outermost first, so they nest like a stack
+    spans = sorted(
+        (node.start_byte, -node.end_byte, index)
+        for index, node in enumerate(definitions)
+    )
+
+    open_spans: list[tuple[int, int]] = []  # (end byte, definition index)
+    next_span = 0
+    for position, name in sorted(sites):
+        while next_span < len(spans) and spans[next_span][0] <= position:
+            start, neg_end, index = spans[next_span]
+            while open_spans and open_spans[-1][0] <= start:
+                open_spans.pop()
+            open_spans.append((-neg_end, index))
+            next_span += 1
+        while open_spans and open_spans[-1][0] <= position:
+            open_spans.pop()
+        if open_spans:
+            calls[open_spans[-1][1]][name] = None
+    return [list(called) for called in calls]
+
+
+def _declared_type_refs(node: tree_sitter.Node) -> list[tuple[str, str]]:
+    """The (relationship, type name) references a type definition declares.
+
+    - extends: base classes named in a class header (a Python superclass
+      list or a JS/TS extends clause), generic arguments dropped
+    - implements: interfaces in a TypeScript implements clause
+    - contains: every type named in the annotations of the type's own
+      fields (Python annotated class attributes, TypeScript class fields
+      and interface / object type properties), including string forward
+      references
+
+    Headers and annotations spanning several lines are read whole. Methods
+    and nested types are not searched for fields; filtering the names
+    against known types is left to the graph.
+    """
+    if node.type not in _TYPE_NODE_TYPES:
+        return []
+
+    refs: list[tuple[str, str]] = []
+    if node.type in _CLASS_NODE_TYPES:
+        refs.extend(_class_header_refs(node))
+
+    body = node.child_by_field_name("body") or node.child_by_field_name("value")
+    contained: dict[str, None] = {}
+    for member in body.named_children if body is not None else ():
+        if member.type == "expression_statement":
+            # Python: `name: Type` or `name: Type = value` in a class body
+            member = member.named_children[0] if member.named_children else member
+            if member.type != "assignment":
+                continue
+        elif member.type not in _FIELD_NODE_TYPES:
+            continue
+        annotation = member.child_by_field_name("type")
+        if annotation is not None:
+            contained.update(dict.fromkeys(_type_names(annotation)))
+    refs.extend(("contains", name) for name in contained)
+    return refs
+
+
+def _class_header_refs(node: tree_sitter.Node) -> Iterator[tuple[str, str]]:
+    """extends/implements references from a class definition's header."""
+    superclasses = node.child_by_field_name("superclasses")
+    if superclasses is not None:
+        # Python: class Foo(Base, mod.Other, Generic[T], metaclass=Meta)
+        for base in superclasses.named_children:
+            if base.type == "subscript":
+                base = base.child_by_field_name("value") or base
+            if base.type in ("identifier", "attribute") and base.text:
+                yield "extends", base.text.decode()
+        return
+
+    for heritage in node.named_children:
+        if heritage.type != "class_heritage":
+            continue
+        for clause in heritage.named_children:
+            if clause.type == "extends_clause":
+                values = clause.children_by_field_name("value")
+                yield from (("extends", name) for name in _expression_names(values))
+            elif clause.type == "implements_clause":
+                for type_node in clause.named_children:
+                    if type_node.type == "generic_type":
+                        type_node = type_node.child_by_field_name("name") or type_node
+                    if type_node.text:
+                        yield "implements", type_node.text.decode()
+            else:
+                # JavaScript: class_heritage holds the extended expression
+                yield from (("extends", name) for name in _expression_names([clause]))
+
+
+def _expression_names(nodes: Iterable[tree_sitter.Node]) -> Iterator[str]:
+    """Texts of the plain or dotted names among expression nodes."""
+    for node in nodes:
+        if node.type in ("identifier", "member_expression") and node.text:
+            yield node.text.decode()
+
+
+def _type_names(annotation: tree_sitter.Node) -> Iterator[str]:
+    """Every type name inside a type annotation, in source order."""
+    stack = [annotation]
+    while stack:
+        node = stack.pop()
+        if node.type in _TYPE_NAME_NODE_TYPES and node.text:
+            yield node.text.decode()
+        elif node.type == "string_content" and node.text:
+            # Python forward reference: `items: list["Item"]`
+            name = node.text.decode()
+            if name.isidentifier():
+                yield name
+        else:
+            stack.extend(reversed(node.children))
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """Resolve a requested worker count to a concrete positive number.
+
+    None or values < 1 mean "one worker per CPU".
+    """
+    if jobs is None or jobs < 1:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _chunk(items: list[str], workers: int) -> list[list[str]]:
+    """Split items into ordered batches, ~4 per worker, capped at MAX_CHUNK_SIZE."""
+    size = max(1, min(MAX_CHUNK_SIZE, math.ceil(len(items) / (workers * 4))))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+# ── Worker process state ──────────────────────────────────────────
+
+# Each worker process owns its own CodebaseParser (and thus its own Kit
+# Repository), created once by the pool initializer.
+_worker_parser: CodebaseParser | None = None
+
+
+def _init_worker(repo_path: str) -> None:
+    """Process pool initializer: build this worker's parser."""
+    global _worker_parser
+    _worker_parser = CodebaseParser(repo_path)
+
+
+def _parse_batch(file_paths: list[str]) -> list[tuple[str, SymbolTable]]:
+    """Parse a batch of files inside a worker process."""
+    if _worker_parser is None:
+        raise RuntimeError("worker parser not initialized")
+    return [(path, _worker_parser.parse_file(path)) for path in file_paths]
+
+
 class CodebaseParser:
     """Wraps Kit's Repository to extract and normalize symbols.
 
@@ -99,79 +846,202 @@ class CodebaseParser:
         parser = CodebaseParser("/path/to/repo")
         symbols = parser.parse_file("src/main.py")
         all_symbols = parser.parse_directory()
+
+        # Stream results as files finish instead of building the whole dict
+        for path, symbols in parser.iter_parse_directory():
+            ...
+
+        # Parallel extraction across 8 worker processes
+        parser = CodebaseParser("/path/to/repo", jobs=8)
     """
 
-    def __init__(self, repo_path: str | Path) -> None:
+    def __init__(self, repo_path: str | Path, jobs: int = 1) -> None:
+        """Initialize the parser.
+
+        Args:
+            repo_path: Path to the repository root.
+            jobs: Worker processes used by parse_directory/parse_files.
+                  1 parses serially in-process; 0 means one per CPU.
+        """
         self.repo_path = Path(repo_path).resolve()
+        self.jobs = resolve_jobs(jobs)
         self._repo = Repository(str(self.repo_path))
 
-    def parse_file(self, file_path: str) -> list[Symbol]:
+    def parse_file(self, file_path: str) -> SymbolTable:
         """Extract symbols from a single file.
 
         Args:
             file_path: Path relative to the repo root (e.g. "src/main.py").
 
         Returns:
-            List of Symbol dataclasses extracted from the file.
+            Table of the symbols extracted from the file.
         """
         if not _has_supported_extension(file_path):
-            return []
+            return SymbolTable()
+
+        try:
+            # Decoded and re-encoded as Kit does, so spans match its parse
+            text = (self.repo_path / file_path).read_text(
+                encoding="utf-8", errors="ignore"
+            )
+        except OSError:
+            return SymbolTable()
+
+        declarations = _extract_declarations(Path(file_path).suffix, text.encode())
+        if declarations is None:
+            return self._parse_file_with_kit(file_path)
+
+        rows: list[SymbolRow] = []
+        type_refs: list[TypeRef] = []
+        calls: list[CallRef] = []
+        for declaration in declarations:
+            name, raw_type, start_line, end_line, first_line, refs, called = (
+                declaration
+            )
+            if not name:
+                continue
+            index = len(rows)
+            type_refs.extend((index, rel, target) for rel, target in refs)
+            calls.extend((index, callee) for callee in called)
+            rows.append(
+                (
+                    name,
+                    _normalize_kind(raw_type),
+                    file_path,
+                    start_line,
+                    end_line,
+                    _extract_signature(first_line),
+                )
+            )
+        return SymbolTable.from_rows(rows, type_refs, calls)
 
+    def _parse_file_with_kit(self, file_path: str) -> SymbolTable:
+        """parse_file() through Kit's extract_symbols(), full code included."""
         raw_symbols = self._repo.extract_symbols(file_path=file_path)
         if not raw_symbols:
-            return []
+            return SymbolTable()
 
-        symbols: list[Symbol] = []
+        rows: list[SymbolRow] = []
         for raw in raw_symbols:
             name = raw.get("name", "")
             if not name:
                 continue
 
             raw_type = raw.get("type", "unknown")
-            kind = _normalize_kind(raw_type)
-            file_rel = raw.get("file", file_path)
             start_line = raw.get("start_line", 0)
-            end_line = raw.get("end_line", start_line)
-            code = raw.get("code", "")
-            signature = _extract_signature(code)
-            fqn = _make_fqn(file_rel, name)
-
-            symbols.append(
-                Symbol(
-                    name=name,
-                    kind=kind,
-                    file=file_rel,
-                    line=start_line,
-                    end_line=end_line,
-                    signature=signature,
-                    fqn=fqn,
+            rows.append(
+                (
+                    name,
+                    _normalize_kind(raw_type),
+                    raw.get("file", file_path),
+                    start_line,
+                    raw.get("end_line", start_line),
+                    _extract_signature(raw.get("code", "")),
                 )
             )
 
-        return symbols
+        return SymbolTable.from_rows(rows)
 
-    def parse_directory(self, subpath: str | None = None) -> dict[str, list[Symbol]]:
-        """Extract symbols from all supported files in a directory.
+    def list_files(self, subpath: str | None = None) -> list[str]:
+        """List supported source files from Kit's file tree.
 
         Args:
             subpath: Optional subdirectory to scope to (relative to repo root).
 
         Returns:
-            Dict mapping relative file paths to their extracted symbols.
+            Relative file paths in file-tree order.
         """
         file_tree = self._repo.get_file_tree(subpath=subpath if subpath else None)
 
-        result: dict[str, list[Symbol]] = {}
+        files: list[str] = []
         for entry in file_tree:
             if entry.get("is_dir", False):
                 continue
 
             file_path = entry.get("path", "")
-            if not _has_supported_extension(file_path):
-                continue
+            if _has_supported_extension(file_path):
+                files.append(file_path)
 
-            symbols = self.parse_file(file_path)
-            if symbols:
-                result[file_path] = symbols
+        return files
 
-        return result
+    def iter_parse_files(
+        self, file_paths: list[str]
+    ) -> Iterator[tuple[str, SymbolTable]]:
+        """Extract symbols from many files, yielding each file as it completes.
+
+        Unlike parse_files, nothing is accumulated: callers can hash, cache
+        or cluster each file while later ones are still being parsed. With
+        jobs > 1, batches are parsed on a process pool and yielded as soon
+        as they (and every batch before them) finish, so the order is still
+        the input order.
+
+        Stopping iteration early cancels batches that haven't started.
+
+        Args:
+            file_paths: Paths relative to the repo root.
+
+        Yields:
+            (file_path, symbols) for every input path, in input order —
+            including files without symbols (with an empty table).
+        """
+        workers = min(self.jobs, len(file_paths))
+        if workers <= 1:
+            for path in file_paths:
+                yield path, self.parse_file(path)
+            return
+
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(str(self.repo_path),),
+        )
+        try:
+            for batch in pool.map(_parse_batch, _chunk(file_paths, workers)):
+                yield from batch
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def parse_files(self, file_paths: list[str]) -> dict[str, SymbolTable]:
+        """Extract symbols from many files, in parallel when jobs > 1.
+
+        Files are split into chunked batches and farmed out to a process
+        pool; each worker holds its own Kit Repository. Results are
+        reassembled in input order, so the output is identical to a
+        serial run regardless of which worker finishes first.
+
+        Args:
+            file_paths: Paths relative to the repo root.
+
+        Returns:
+            Dict mapping relative file paths to their extracted symbols,
+            ordered like file_paths. Files without symbols are omitted.
+        """
+        return {
+            file_path: symbols
+            for file_path, symbols in self.iter_parse_files(file_paths)
+            if symbols
+        }
+
+    def iter_parse_directory(
+        self, subpath: str | None = None
+    ) -> Iterator[tuple[str, SymbolTable]]:
+        """Extract symbols from all supported files in a directory, streaming.
+
+        Args:
+            subpath: Optional subdirectory to scope to (relative to repo root).
+
+        Yields:
+            (file_path, symbols) per file, as in iter_parse_files.
+        """
+        yield from self.iter_parse_files(self.list_files(subpath))
+
+    def parse_directory(self, subpath: str | None = None) -> dict[str, SymbolTable]:
+        """Extract symbols from all supported files in a directory.
+
+        Args:
+            subpath: Optional subdirectory to scope to (relative to repo root).
+
+        Returns:
+            Dict mapping relative file paths to their extracted symbols.
+        """
+        return self.parse_files(self.list_files(subpath))
@@ -0,0 +1,343 @@
+"""Symbol-level call graph.
+
+parse_file() records the names each symbol calls (SymbolTable.calls).
+ReferenceGraph resolves those names to the FQNs of the symbols they refer
+to and keeps the resulting caller -> callee edges, together with the
+inverted index callee -> callers, up to date as files change.
+
+Plain calls (`f()`) are resolved to functions and classes: a definition
+in the calling file wins, otherwise the name must be defined exactly once
+in the rest of the codebase. Names defined in several other places stay
+unresolved rather than guessed. Calls through the instance (`self.f()`)
+only resolve to a method of the caller's own class. Calls on other
+objects aren't recorded by the parser at all, since `conn.close()` says
+nothing about which `close` is meant.
+
+Storage is sized for millions of edges: every FQN and file gets an integer
+id, a file's edges are one array of packed (caller id, callee id) pairs,
+and the inverted indexes map each callee id to an array of caller ids and
+each called name to an array of calling file ids.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+
+from src.core.parser import SELF_CALL_PREFIX, Symbol, SymbolTable, filter_kinds
+
+# Kinds a plain call can resolve to (methods are only called through self)
+_CALLABLE_KINDS = frozenset({"fn", "class"})
+
+# Packed edge: caller id in the high 32 bits, callee id in the low 32
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+@dataclass(frozen=True, slots=True)
+class CallEdge:
+    """A resolved call from one symbol to another.
+
+    Attributes:
+        caller: FQN of the calling symbol.
+        callee: FQN of the called symbol.
+    """
+
+    caller: str
+    callee: str
+
+
+class ReferenceGraph:
+    """Caller -> callee edges between symbols, maintained per file.
+
+    Each file's edges are resolved from its symbols' calls and stored
+    under the file, so apply() only re-resolves the changed files — plus
+    the files calling a name whose definitions changed, found through an
+    index from each called name to its calling files.
+
+    FQN and file ids are never reused, so ids of symbols and files that
+    disappear stay allocated for the lifetime of the graph.
+
+    Usage:
+        graph = ReferenceGraph()
+        graph.rebuild(symbols_by_file)
+        symbols_by_file["src/auth/login.py"] = new_symbols
+        graph.apply(symbols_by_file, ["src/auth/login.py"])
+        graph.callers("src/auth/login::login"), graph.top_edges(100)
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._fqns: list[str] = []
+        self._file_ids: dict[str, int] = {}
+        self._paths: list[str] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        # name -> callee ids, once per definition
+        self._definitions: dict[str, array] = {}
+        self._file_definitions: dict[str, list[tuple[str, int]]] = {}
+        # Called names per file, and the reverse index name -> file ids
+        self._file_names: dict[str, tuple[str, ...]] = {}
+        self._name_files: dict[str, array] = {}
+        # Packed (caller, callee) edges per file, and callee -> caller ids
+        self._file_edges: dict[str, array] = {}
+        self._callers: dict[int, array] = {}
+        self._edge_count = 0
+        self._version = 0
+        self._top_edges: tuple[int, int, list[CallEdge]] | None = None
+
+    def __len__(self) -> int:
+        """Number of edges (a caller calling a callee counts once per file)."""
+        return self._edge_count
+
+    # ── Building ──
+
+    def rebuild(self, symbols_by_file: Mapping[str, Sequence[Symbol]]) -> None:
+        """Recompute every edge from scratch."""
+        self._reset()
+        for path, symbols in symbols_by_file.items():
+            self._add_definitions(path, symbols)
+        for path, symbols in symbols_by_file.items():
+            self._add_file(path, symbols)
+
+    def apply(
+        self,
+        symbols_by_file: Mapping[str, Sequence[Symbol]],
+        changed_files: Iterable[str],
+    ) -> None:
+        """Absorb changes already applied to symbols_by_file.
+
+        Args:
+            symbols_by_file: The full, updated symbol map.
+            changed_files: Paths whose entry was added, replaced or removed
+                since the last rebuild()/apply().
+        """
+        changed = list(dict.fromkeys(changed_files))
+
+        # Definitions of each touched name before the change
+        before: dict[str, frozenset[int]] = {}
+        for path in changed:
+            for name, _ in self._file_definitions.get(path, ()):
+                before.setdefault(name, frozenset(self._definitions[name]))
+            self._remove_definitions(path)
+            self._remove_file(path)
+        for path in changed:
+            symbols = symbols_by_file.get(path)
+            if symbols is None:
+                continue
+            for name in self._callable_names(symbols):
+                before.setdefault(
+                    name, frozenset(self._definitions.get(name, ()))
+                )
+            self._add_definitions(path, symbols)
+
+        # Calls to a name resolve differently once its definitions change
+        stale = {path for path in changed if path in symbols_by_file}
+        for name, definitions in before.items():
+            if frozenset(self._definitions.get(name, ())) != definitions:
+                stale.update(self._paths[i] for i in self._name_files.get(name, ()))
+
+        for path in stale:
+            self._remove_file(path)
+            self._add_file(path, symbols_by_file[path])
+
+    def _add_definitions(self, path: str, symbols: Sequence[Symbol]) -> None:
+        definitions = [
+            (sym.name, self._id(sym.fqn))
+            for sym in filter_kinds(symbols, _CALLABLE_KINDS)
+        ]
+        if not definitions:
+            return
+        self._file_definitions[path] = definitions
+        for name, fqn_id in definitions:
+            ids = self._definitions.get(name)
+            if ids is None:
+                ids = self._definitions[name] = array("I")
+            ids.append(fqn_id)
+
+    def _remove_definitions(self, path: str) -> None:
+        for name, fqn_id in self._file_definitions.pop(path, ()):
+            ids = self._definitions[name]
+            ids.remove(fqn_id)
+            if not ids:
+                del self._definitions[name]
+
+    def _add_file(self, path: str, symbols: Sequence[Symbol]) -> None:
+        """Resolve and index one file's calls."""
+        calls = symbols.calls if isinstance(symbols, SymbolTable) else None
+        if not calls:
+            return
+
+        # Self calls resolve within the file, so only other names are indexed
+        names = tuple(
+            dict.fromkeys(
+                name for _, name in calls if not name.startswith(SELF_CALL_PREFIX)
+            )
+        )
+        if names:
+            self._file_names[path] = names
+            file_id = self._file_id(path)
+            for name in names:
+                files = self._name_files.get(name)
+                if files is None:
+                    files = self._name_files[name] = array("I")
+                files.append(file_id)
+
+        local: dict[str, int] = {}
+        for name, fqn_id in self._file_definitions.get(path, ()):
+            local.setdefault(name, fqn_id)
+        row_ids = [self._id(sym.fqn) for sym in symbols]
+        classes: list[int | None] = []
+        methods: dict[tuple[int, str], int] | None = None
+
+        edges: dict[int, None] = {}
+        for row, name in calls:
+            if name.startswith(SELF_CALL_PREFIX):
+                if methods is None:
+                    classes, methods = _class_members(symbols, row_ids)
+                class_row = classes[row]
+                if class_row is None:
+                    continue
+                callee = methods.get((class_row, name[len(SELF_CALL_PREFIX) :]))
+                if callee is None:
+                    continue
+            elif (callee := local.get(name)) is None:
+                definitions = self._definitions.get(name)
+                if definitions is None:
+                    continue
+                callee = definitions[0]
+                if definitions.count(callee) != len(definitions):
+                    continue
+            caller = row_ids[row]
+            if caller != callee:
+                edges[caller << _ID_BITS | callee] = None
+        if not edges:
+            return
+
+        packed = array("Q", edges)
+        self._file_edges[path] = packed
+        for edge in packed:
+            callee = edge & _ID_MASK
+            callers = self._callers.get(callee)
+            if callers is None:
+                callers = self._callers[callee] = array("I")
+            callers.append(edge >> _ID_BITS)
+        self._edge_count += len(packed)
+        self._version += 1
+
+    def _remove_file(self, path: str) -> None:
+        """Drop one file's edges and called-name index entries."""
+        names = self._file_names.pop(path, ())
+        if names:
+            file_id = self._file_ids[path]
+            for name in names:
+                files = self._name_files[name]
+                files.remove(file_id)
+                if not files:
+                    del self._name_files[name]
+
+        packed = self._file_edges.pop(path, None)
+        if packed is None:
+            return
+        for edge in packed:
+            callee = edge & _ID_MASK
+            callers = self._callers[callee]
+            callers.remove(edge >> _ID_BITS)
+            if not callers:
+                del self._callers[callee]
+        self._edge_count -= len(packed)
+        self._version += 1
+
+    def _id(self, fqn: str) -> int:
+        fqn_id = self._ids.get(fqn)
+        if fqn_id is None:
+            fqn_id = self._ids[fqn] = len(self._fqns)
+            self._fqns.append(fqn)
+        return fqn_id
+
+    def _file_id(self, path: str) -> int:
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            file_id = self._file_ids[path] = len(self._paths)
+            self._paths.append(path)
+        return file_id
+
+    @staticmethod
+    def _callable_names(symbols: Sequence[Symbol]) -> Iterator[str]:
+        return (sym.name for sym in filter_kinds(symbols, _CALLABLE_KINDS))
+
+    # ── Queries ──
+
+    def callers(self, fqn: str) -> list[str]:
+        """FQNs of the symbols calling fqn, sorted."""
+        fqn_id = self._ids.get(fqn)
+        callers = self._callers.get(fqn_id, ()) if fqn_id is not None else ()
+        return sorted({self._fqns[caller] for caller in callers})
+
+    def edges(self) -> set[CallEdge]:
+        """Every distinct edge."""
+        return {
+            CallEdge(self._fqns[caller], self._fqns[callee])
+            for callee, callers in self._callers.items()
+            for caller in callers
+        }
+
+    def top_edges(self, limit: int) -> list[CallEdge]:
+        """Up to limit edges into the most-called symbols.
+
+        Callees are ranked by their number of callers (ties by FQN), and
+        each contributes its callers in FQN order until limit is reached.
+        """
+        if limit <= 0:
+            return []
+        cached = self._top_edges
+        if cached is not None and cached[:2] == (self._version, limit):
+            return cached[2]
+
+        fqns = self._fqns
+        ranked = heapq.nsmallest(
+            limit,
+            self._callers.items(),
+            key=lambda item: (-len(item[1]), fqns[item[0]]),
+        )
+        edges: list[CallEdge] = []
+        for callee, callers in ranked:
+            caller_fqns = heapq.nsmallest(
+                limit - len(edges), {fqns[caller] for caller in callers}
+            )
+            edges.extend(CallEdge(caller, fqns[callee]) for caller in caller_fqns)
+            if len(edges) >= limit:
+                break
+
+        self._top_edges = (self._version, limit, edges)
+        return edges
+
+
+def _class_members(
+    symbols: Sequence[Symbol], row_ids: Sequence[int]
+) -> tuple[list[int | None], dict[tuple[int, str], int]]:
+    """Each row's innermost enclosing class, and the classes' methods.
+
+    Returns:
+        (class row of each row or None, {(class row, method name): id})
+    """
+    classes: list[int | None] = [None] * len(symbols)
+    methods: dict[tuple[int, str], int] = {}
+    open_classes: list[tuple[int, int]] = []  # (end line, row)
+    order = sorted(
+        range(len(symbols)), key=lambda i: (symbols[i].line, -symbols[i].end_line)
+    )
+    for row in order:
+        sym = symbols[row]
+        while open_classes and open_classes[-1][0] < sym.end_line:
+            open_classes.pop()
+        if open_classes:
+            class_row = classes[row] = open_classes[-1][1]
+            if sym.kind == "method":
+                methods.setdefault((class_row, sym.name), row_ids[row])
+        if sym.kind == "class":
+            open_classes.append((sym.end_line, row))
+    return classes, methods
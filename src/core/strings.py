@@ -0,0 +1,85 @@
+"""Shared string interning pool.
+
+File paths and module paths repeat throughout the in-memory graph: every
+symbol table and module bucket of a file refers to the same path, and each
+parse or cache load produces fresh copies of it. Passing them through one
+StringPool makes equal strings share a single object, so the duplicates
+can be freed, and lets --stats report how much that saves.
+
+The pool keeps a strong reference to every string it has seen, so it only
+grows. It's meant for the bounded set of paths in the indexed tree; symbol
+names, call names and hierarchy targets are open-ended and go through
+sys.intern() instead, which lets them be freed once no symbol uses them.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    """A snapshot of a StringPool's counters.
+
+    Attributes:
+        strings: Distinct strings held by the pool.
+        pooled_bytes: Memory held by those strings.
+        lookups: Calls to intern().
+        shared: Lookups that returned an existing, different object.
+        bytes_saved: Combined size of the duplicate copies those lookups
+            replaced (memory freed once callers drop their copies).
+    """
+
+    strings: int
+    pooled_bytes: int
+    lookups: int
+    shared: int
+    bytes_saved: int
+
+
+class StringPool:
+    """Maps each distinct string to one shared instance.
+
+    Usage:
+        pool = StringPool()
+        a = pool.intern("".join(["src/", "main.py"]))
+        b = pool.intern("".join(["src/", "main.py"]))
+        assert a is b
+        pool.stats().bytes_saved  # size of the copy that b replaced
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+        self._lookups = 0
+        self._shared = 0
+        self._bytes_saved = 0
+
+    def intern(self, value: str) -> str:
+        """Return the pool's instance of value, adding value if it's new."""
+        self._lookups += 1
+        pooled = self._strings.setdefault(value, value)
+        if pooled is not value:
+            self._shared += 1
+            self._bytes_saved += sys.getsizeof(value)
+        return pooled
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._strings
+
+    def stats(self) -> PoolStats:
+        """Current counters (pooled_bytes is computed on each call)."""
+        return PoolStats(
+            strings=len(self._strings),
+            pooled_bytes=sum(map(sys.getsizeof, self._strings)),
+            lookups=self._lookups,
+            shared=self._shared,
+            bytes_saved=self._bytes_saved,
+        )
+
+
+# The pool shared by the parser, symbol cache and graph
+STRINGS = StringPool()
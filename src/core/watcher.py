@@ -2,35 +2,69 @@
 
 Components:
 - FileFilter: Combines .gitignore + hardcoded ignores + .codebasegraphignore
-- ContentHasher: SHA-256 based content-hash diffing to skip unchanged files
+- ContentHasher: content-hash diffing to skip unchanged files, with a
+  pluggable HashStrategy (SHA-256, or git blob ids reused from the index)
 - IncrementalPipeline: Re-parse changed files, rebuild graph, re-serialize
-- CodebaseWatcher: watchfiles-based file change detection
+- ChangeCoalescer: Merges bursts of change batches into one update
+- CodebaseWatcher: watchfiles-based file change detection, with git-aware
+  bulk detection of branch switches
 """
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
+import math
 import os
+import re
 import tempfile
 import threading
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
 import pathspec
 import watchfiles
+from watchfiles._rust_notify import RustNotify
+from watchfiles.main import (
+    _default_debug,
+    _default_force_polling,
+    _default_ignore_permission_denied,
+    _default_poll_delay_ms,
+)
 
+from src.core.cache import CACHE_DIR_NAME, HashStore, StatData, SymbolCache
+from src.core.git import (
+    GIT_BLOB,
+    GitHeadTracker,
+    index_oids,
+    modified_files,
+)
 from src.core.graph import (
     Hierarchy,
+    IncrementalGraph,
     Module,
     ModuleClusterer,
-    detect_cross_module_deps,
-    extract_hierarchies,
+    scan_file_imports,
+)
+from src.core.hashing import (
+    SHA256,
+    HashAlgorithm,
+    get_algorithm,
+)
+from src.core.manifest import MANIFEST_FILES, Dependency, ManifestParser
+from src.core.parser import (
+    SUPPORTED_EXTENSIONS,
+    CodebaseParser,
+    SymbolTable,
+    resolve_jobs,
 )
-from src.core.manifest import Dependency, ManifestParser
-from src.core.parser import SUPPORTED_EXTENSIONS, CodebaseParser, Symbol
-from src.core.writer import CodebaseMeta, CodebaseWriter
+from src.core.references import ReferenceGraph
+from src.core.strings import STRINGS
+from src.core.writer import CodebaseMeta, CodebaseWriter, split_last_indexed
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +86,16 @@ HARDCODED_IGNORES: frozenset[str] = frozenset(
     }
 )
 
+# Ignore files read by FileFilter (.gitignore also in subdirectories)
+GITIGNORE_FILE = ".gitignore"
+CUSTOM_IGNORE_FILE = ".codebasegraphignore"
+
+# A nested .gitignore: (its directory, its spec)
+_NestedSpec = tuple[str, pathspec.PathSpec]
+
+# Default cap on memoized FileFilter decisions
+DEFAULT_FILTER_CACHE_SIZE = 1 << 16
+
 
 # ── FileFilter ─────────────────────────────────────────────────────
 
@@ -62,19 +106,62 @@ class FileFilter:
     Used by both the watcher and initial full-directory parse to decide
     which files to include or exclude.
 
+    Nested .gitignore files are honored like git does: their patterns are
+    relative to their own directory, and the deepest file with a matching
+    pattern decides (so a nested "!pattern" can re-include a file). As in
+    git, a pattern only matches the path it names: a file below an ignored
+    directory is excluded because the directory is, so a directory-only
+    pattern ("gen/", "!gen/") decides for the directory but never for the
+    files inside it, and nothing below an excluded directory can be
+    re-included. Each
+    directory's .gitignore is loaded once, on first use, and cached;
+    invalidate() drops the cached spec when an ignore file changes.
+
+    Decisions are cached at two levels. A directory is excluded once, when
+    it is a hardcoded ignore or matches an ignore pattern, and every path
+    below it short-circuits on that cached decision. Per-path results are
+    memoized in a bounded LRU. When neither root ignore file uses negation
+    ("!pattern"), both are compiled into a single regex, so each lookup is
+    one match instead of one per pattern.
+
     Usage:
         filt = FileFilter(project_root="/path/to/repo")
         if filt.should_include("src/main.py"):
             # process file
     """
 
-    def __init__(self, project_root: str | Path) -> None:
+    def __init__(
+        self,
+        project_root: str | Path,
+        cache_size: int = DEFAULT_FILTER_CACHE_SIZE,
+    ) -> None:
+        """Load the root ignore files and compile the matcher.
+
+        Args:
+            project_root: Directory the ignore files are read from.
+            cache_size: Maximum memoized per-path (and per-directory) results.
+        """
         self._root = Path(project_root).resolve()
-        self._gitignore_spec = self._load_spec(".gitignore")
-        self._custom_spec = self._load_spec(".codebasegraphignore")
+        self._load_root_specs()
+        # Applicable nested .gitignore specs, by directory
+        self._chains: dict[str, tuple[_NestedSpec, ...]] = {}
+        self._cached_include = functools.lru_cache(maxsize=cache_size)(
+            self._compute_include
+        )
+        self._dir_excluded = functools.lru_cache(maxsize=cache_size)(
+            self._compute_dir_excluded
+        )
+
+    def _load_root_specs(self) -> None:
+        """(Re)load the root ignore files and compile their merged regex."""
+        self._gitignore_spec = self._load_spec(GITIGNORE_FILE)
+        self._custom_spec = self._load_spec(CUSTOM_IGNORE_FILE)
+        self._ignore_regex = _compile_ignore_regex(
+            [self._gitignore_spec, self._custom_spec]
+        )
 
     def _load_spec(self, filename: str) -> pathspec.PathSpec | None:
-        """Load a gitignore-style spec file from the project root."""
+        """Load a gitignore-style spec file (relative to the project root)."""
         ignore_file = self._root / filename
         if not ignore_file.is_file():
             return None
@@ -85,12 +172,42 @@ class FileFilter:
         except OSError:
             return None
 
+    def invalidate(self, rel_path: str) -> bool:
+        """Drop cached decisions if rel_path is an ignore file.
+
+        Call when a file changes in watch mode. A changed root ignore file
+        is reloaded immediately; a nested .gitignore on its next use.
+
+        Args:
+            rel_path: Relative path of the changed file.
+
+        Returns:
+            True if rel_path is an ignore file the filter reads.
+        """
+        rel_dir, _, name = rel_path.replace("\\", "/").rpartition("/")
+        if not rel_dir and name in (GITIGNORE_FILE, CUSTOM_IGNORE_FILE):
+            self._load_root_specs()
+        elif rel_dir and name == GITIGNORE_FILE:
+            # Chains of the directory and everything below it are stale
+            prefix = rel_dir + "/"
+            self._chains = {
+                d: chain
+                for d, chain in self._chains.items()
+                if d != rel_dir and not d.startswith(prefix)
+            }
+        else:
+            return False
+
+        self._cached_include.cache_clear()
+        self._dir_excluded.cache_clear()
+        return True
+
     def should_include(self, rel_path: str) -> bool:
         """Check if a file (relative to project root) should be included.
 
         Returns False if the file matches any ignore pattern:
         1. Hardcoded directory ignores (node_modules, .git, etc.)
-        2. .gitignore patterns
+        2. .gitignore patterns (root and nested)
         3. .codebasegraphignore patterns
 
         Args:
@@ -100,23 +217,129 @@ class FileFilter:
             True if the file should be processed.
         """
         # Normalize to forward slashes (handles Windows backslashes too)
-        rel_path = rel_path.replace("\\", "/")
+        return self._cached_include(rel_path.replace("\\", "/"))
 
-        # Check hardcoded directory ignores — any path component matches
-        parts = rel_path.split("/")
-        for part in parts:
-            if part in HARDCODED_IGNORES:
-                return False
+    def should_include_dir(self, rel_dir: str) -> bool:
+        """Check if anything below a directory can be included.
 
-        # Check .gitignore patterns
-        if self._gitignore_spec and self._gitignore_spec.match_file(rel_path):
-            return False
+        False means the whole directory is ignored and can be pruned from
+        a traversal without looking inside.
 
-        # Check .codebasegraphignore patterns
-        if self._custom_spec and self._custom_spec.match_file(rel_path):
+        Args:
+            rel_dir: Relative directory path from the project root.
+        """
+        rel_dir = rel_dir.replace("\\", "/").strip("/")
+        return not rel_dir or not self._dir_excluded(rel_dir)
+
+    def _compute_include(self, rel_path: str) -> bool:
+        """Uncached should_include() for a normalized path."""
+        parent, _, name = rel_path.rpartition("/")
+        if parent and self._dir_excluded(parent):
+            return False
+        if name in HARDCODED_IGNORES:
             return False
+        return not self._matches_ignore(rel_path)
 
-        return True
+    def _compute_dir_excluded(self, rel_dir: str) -> bool:
+        """Whether a directory (and so everything below it) is excluded."""
+        parent, _, name = rel_dir.rpartition("/")
+        if parent and self._dir_excluded(parent):
+            return True
+        if name in HARDCODED_IGNORES:
+            return True
+        return self._matches_ignore(rel_dir, is_dir=True)
+
+    def _nested_chain(self, rel_path: str) -> tuple[_NestedSpec, ...]:
+        """Nested .gitignore specs that apply to rel_path, deepest first."""
+        return self._dir_chain(rel_path.rpartition("/")[0])
+
+    def _dir_chain(self, rel_dir: str) -> tuple[_NestedSpec, ...]:
+        """Nested .gitignore specs of rel_dir and its ancestors, deepest first.
+
+        Returns:
+            (directory, spec) for every such directory (excluding the
+            root) that has a .gitignore.
+        """
+        if not rel_dir:
+            return ()
+        chain = self._chains.get(rel_dir)
+        if chain is None:
+            chain = self._dir_chain(rel_dir.rpartition("/")[0])
+            spec = self._load_spec(f"{rel_dir}/{GITIGNORE_FILE}")
+            if spec is not None:
+                chain = ((rel_dir, spec), *chain)
+            self._chains[rel_dir] = chain
+        return chain
+
+    def _matches_ignore(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Whether a path is ignored by .gitignore or .codebasegraphignore.
+
+        Only patterns naming the path itself count; the caller has already
+        checked the directories above it.
+        """
+        candidate = rel_path + "/" if is_dir else rel_path
+
+        # The deepest nested .gitignore with a matching pattern decides
+        for rel_dir, spec in self._nested_chain(rel_path):
+            ignored = _last_match(spec, candidate[len(rel_dir) + 1 :])
+            if ignored is not None:
+                # A nested negation can't override .codebasegraphignore
+                return ignored or _last_match(self._custom_spec, candidate) is True
+
+        if self._ignore_regex is not None:
+            return self._ignore_regex.fullmatch(candidate) is not None
+
+        return (
+            _last_match(self._gitignore_spec, candidate) is True
+            or _last_match(self._custom_spec, candidate) is True
+        )
+
+    def walk(
+        self, extensions: Collection[str] = SUPPORTED_EXTENSIONS
+    ) -> Iterator[str]:
+        """Yield the included files under the project root.
+
+        Ignored directories are pruned before they are read, so nothing
+        below node_modules/, build/ or a gitignored directory is listed.
+        Directory entries are visited in name order (depth-first), and
+        symlinked directories are not followed.
+
+        Args:
+            extensions: Only files with one of these suffixes are yielded.
+
+        Yields:
+            Relative file paths (forward slashes).
+        """
+        stack: list[tuple[str, Iterator[os.DirEntry[str]]]] = []
+        top = _sorted_scandir(self._root)
+        if top is not None:
+            stack.append(("", top))
+
+        while stack:
+            rel_dir, entries = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+
+            if is_dir:
+                if self.should_include_dir(rel_path):
+                    children = _sorted_scandir(entry.path)
+                    if children is not None:
+                        stack.append((rel_path, children))
+            elif (
+                is_file
+                and os.path.splitext(entry.name)[1] in extensions
+                and self.should_include(rel_path)
+            ):
+                yield rel_path
 
     def should_include_abs(self, abs_path: str | Path) -> bool:
         """Check if an absolute path should be included.
@@ -131,30 +354,240 @@ class FileFilter:
             return False
 
 
+def _sorted_scandir(path: str | Path) -> Iterator[os.DirEntry[str]] | None:
+    """A directory's entries sorted by name, or None if it can't be read."""
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return None
+    return iter(entries)
+
+
+def _last_match(spec: pathspec.PathSpec | None, candidate: str) -> bool | None:
+    """Whether the last pattern of spec naming candidate ignores it.
+
+    pathspec's patterns also match everything below a path they match
+    ("gen/" matches "gen/g.py"). git doesn't: it excludes gen/g.py because
+    gen/ is excluded. Matching the whole candidate keeps a directory-only
+    pattern, negated or not, from deciding for the files inside.
+
+    Args:
+        spec: Patterns in file order, or None.
+        candidate: Path relative to the spec's directory, with a trailing
+            slash for directories.
+
+    Returns:
+        True if ignored, False if re-included, None if no pattern matches.
+    """
+    if spec is None:
+        return None
+    for pattern in reversed(spec.patterns):
+        regex = getattr(pattern, "regex", None)
+        if pattern.include is not None and regex is not None:
+            if regex.fullmatch(candidate):
+                return pattern.include
+    return None
+
+
+def _compile_ignore_regex(
+    specs: list[pathspec.PathSpec | None],
+) -> re.Pattern[str] | None:
+    """Merge the patterns of gitignore specs into a single regex.
+
+    Only possible without negated patterns: then a path is ignored exactly
+    when any pattern matches it, regardless of order. Match it with
+    fullmatch(), like _last_match().
+
+    Returns:
+        The compiled alternation, or None if a spec has negated patterns.
+    """
+    sources: list[str] = []
+    for spec in specs:
+        if spec is None:
+            continue
+        for pattern in spec.patterns:
+            if pattern.include is None:
+                continue  # comment or blank line
+            regex = getattr(pattern, "regex", None)
+            if not pattern.include or regex is None:
+                return None
+            # Named groups would clash once the patterns are merged
+            sources.append(_NAMED_GROUP.sub("(?:", regex.pattern))
+    if not sources:
+        return re.compile(r"(?!)")  # matches nothing
+    return re.compile("|".join(f"(?:{source})" for source in sources))
+
+
+# Start of a named regex group, e.g. "(?P<ps_d>"
+_NAMED_GROUP = re.compile(r"\(\?P<\w+>")
+
+
 # ── Content Hash Diffing ───────────────────────────────────────────
 
+# Files modified less than this long before they were hashed are "racily
+# clean": their stat data is not trusted to detect the next change. Two
+# seconds covers the coarsest common timestamp granularity (FAT).
+RACY_WINDOW_NS = 2_000_000_000
+
+# Below this many files per thread, a thread pool costs more than it saves
+_MIN_FILES_PER_HASH_WORKER = 16
+
 
 def _hash_file(path: Path) -> str:
     """Compute SHA-256 hash of file content."""
-    h = hashlib.sha256()
-    try:
-        with open(path, "rb") as f:
-            while True:
-                chunk = f.read(65536)
-                if not chunk:
-                    break
-                h.update(chunk)
-    except OSError:
-        return ""
-    return h.hexdigest()
+    return SHA256.hex_file(path)
+
+
+class HashStrategy:
+    """How ContentHasher turns file contents into hashes.
+
+    The default implementation hashes the file bytes with a HashAlgorithm
+    (SHA-256 unless another is given). Hashes carry the algorithm's digest
+    tag ("sha256:<hex>"), so hashes from different strategies never match.
+    Subclasses override hash_file(), and may override hash_many() to hash
+    a whole file set more cheaply than one file at a time.
+    """
+
+    def __init__(self, algorithm: HashAlgorithm | str = SHA256) -> None:
+        """Create a strategy hashing with the given algorithm (or its name).
+
+        Raises:
+            ValueError: If the algorithm name is unknown.
+        """
+        if isinstance(algorithm, str):
+            algorithm = get_algorithm(algorithm)
+        self.algorithm = algorithm
+
+    @property
+    def name(self) -> str:
+        """Name the strategy is selected by."""
+        return self.algorithm.name
+
+    @property
+    def tag(self) -> str:
+        """Digest format tag prefixed to every hash this strategy produces."""
+        return self.algorithm.tag
+
+    def hash_file(self, path: Path) -> str:
+        """Hash one file. Returns an empty string if it can't be read.
+
+        Must be thread-safe: hash_many() calls it from a thread pool.
+        """
+        return self.algorithm.digest_file(path)
+
+    def blob_hash(self, oid: str) -> str | None:
+        """The hash of content whose git blob id is oid, if derivable.
+
+        Lets callers that learn blob ids from git (e.g. a tree diff) skip
+        reading files. Content hashes can't be derived from a blob id, so
+        the default returns None.
+        """
+        return None
+
+    def hash_many(
+        self,
+        project_root: Path,
+        rel_paths: list[str],
+        workers: int = 1,
+    ) -> dict[str, str]:
+        """Hash a batch of files (relative to project_root).
+
+        Args:
+            project_root: Directory the paths are relative to.
+            rel_paths: Files to hash.
+            workers: Threads to hash with. hashlib releases the GIL while
+                     hashing, so reads and hashing overlap across threads.
+
+        Returns:
+            Dict mapping each path to its hash ("" if unreadable).
+        """
+        paths = [project_root / rel_path for rel_path in rel_paths]
+        workers = min(workers, len(paths) // _MIN_FILES_PER_HASH_WORKER)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                digests = list(pool.map(self.hash_file, paths))
+        else:
+            digests = [self.hash_file(path) for path in paths]
+        return dict(zip(rel_paths, digests))
+
+
+class GitBlobStrategy(HashStrategy):
+    """Hashes files as git blob ids, reusing the ids git already stored.
+
+    For the initial hash of a tree, files that are staged and unmodified
+    take their blob id straight from the index (`git ls-files -s`), so they
+    are never read. Modified, untracked and conflicted files — and every
+    single-file check while watching — are hashed in-process with git's
+    blob format, so both paths produce the same id for the same content.
+
+    Falls back to hashing every file when git is unavailable. Files whose
+    index blob differs from the work tree bytes (clean/smudge filters,
+    autocrlf) just look changed once and get re-parsed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(GIT_BLOB)
+        # Files hash_many() took from the index vs. read and hashed
+        self.reused = 0
+        self.hashed = 0
+
+    def blob_hash(self, oid: str) -> str:
+        return f"{self.tag}:{oid}"
+
+    def hash_many(
+        self,
+        project_root: Path,
+        rel_paths: list[str],
+        workers: int = 1,
+    ) -> dict[str, str]:
+        oids = index_oids(project_root)
+        dirty = modified_files(project_root) if oids else None
+        if oids is None or dirty is None:
+            self.hashed += len(rel_paths)
+            return super().hash_many(project_root, rel_paths, workers)
+
+        hashes: dict[str, str] = {}
+        to_hash: list[str] = []
+        for rel_path in rel_paths:
+            oid = oids.get(rel_path)
+            if oid is None or rel_path in dirty:
+                to_hash.append(rel_path)
+            else:
+                hashes[rel_path] = self.blob_hash(oid)
+        self.reused += len(hashes)
+        self.hashed += len(to_hash)
+        hashes.update(super().hash_many(project_root, to_hash, workers))
+        return hashes
+
+
+def make_hash_strategy(name: str) -> HashStrategy:
+    """Create the hash strategy selected by name (see HASH_STRATEGY_NAMES).
+
+    "git" selects GitBlobStrategy; any other name is a hash algorithm.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name == GIT_BLOB.name:
+        return GitBlobStrategy()
+    return HashStrategy(name)
 
 
 class ContentHasher:
     """Tracks file content hashes to skip re-parsing unchanged files.
 
-    Maintains a dict mapping relative file paths to their SHA-256 hash.
-    When a file change event arrives, computes the new hash and compares
-    to the stored one — returns True only if the content actually changed.
+    Maintains a dict mapping relative file paths to their tagged content
+    hash (SHA-256 by default; see HashStrategy). When a file change event
+    arrives, computes the new hash and compares to the stored one —
+    returns True only if the content actually changed.
+
+    Next to each hash it keeps the file's stat data (mtime_ns, size, inode),
+    like git's index: if those are unchanged the file isn't read at all.
+    A file modified within RACY_WINDOW_NS of being hashed could change again
+    without its stat data changing, so such "racily clean" entries are
+    always re-hashed. With a HashStore, compute_initial() reuses the hashes
+    of files whose stat data matches the previous run.
 
     Usage:
         hasher = ContentHasher(project_root="/path/to/repo")
@@ -162,27 +595,89 @@ class ContentHasher:
         changed = hasher.check_and_update("src/main.py")  # True if content changed
     """
 
-    def __init__(self, project_root: str | Path) -> None:
+    def __init__(
+        self,
+        project_root: str | Path,
+        strategy: HashStrategy | None = None,
+        store: HashStore | None = None,
+        workers: int = 1,
+    ) -> None:
+        """Create an empty hasher.
+
+        Args:
+            project_root: Directory file paths are relative to.
+            strategy: How files are hashed (default: SHA-256).
+            store: Persisted hashes to reuse in compute_initial().
+            workers: Threads used by compute_initial() (0 = one per CPU).
+        """
         self._root = Path(project_root).resolve()
+        self._strategy = strategy or HashStrategy()
+        self._store = store
+        self._workers = resolve_jobs(workers)
         self._hashes: dict[str, str] = {}
+        # Stat data of files whose hash can be trusted while it's unchanged
+        self._stats: dict[str, StatData] = {}
+        # Files whose hash was taken from their stat data instead of reading them
+        self.stat_hits = 0
+
+    @property
+    def strategy(self) -> HashStrategy:
+        """The strategy used to hash file contents."""
+        return self._strategy
 
     @property
     def hashes(self) -> dict[str, str]:
         """Read-only access to the current hash map."""
         return dict(self._hashes)
 
+    def get(self, rel_path: str) -> str | None:
+        """Return the stored hash for a file, or None if untracked."""
+        return self._hashes.get(rel_path)
+
     def compute_initial(self, rel_paths: list[str]) -> None:
-        """Compute and store hashes for a list of files."""
+        """Compute and store hashes for a list of files.
+
+        Files recorded in the hash store with unchanged stat data keep their
+        stored hash; the rest are hashed and the store is rewritten.
+        """
+        stored = self._store.load(self._strategy.tag) if self._store else {}
+        stats = {rel_path: _stat_data(self._root / rel_path) for rel_path in rel_paths}
+
+        to_hash: list[str] = []
         for rel_path in rel_paths:
-            full_path = self._root / rel_path
-            self._hashes[rel_path] = _hash_file(full_path)
+            entry = stored.get(rel_path)
+            stat = stats[rel_path]
+            if entry is not None and stat is not None and entry[1] == stat:
+                self._hashes[rel_path] = entry[0]
+                self._stats[rel_path] = stat
+                self.stat_hits += 1
+            else:
+                to_hash.append(rel_path)
+
+        hashed_at = time.time_ns()
+        self._hashes.update(
+            self._strategy.hash_many(self._root, to_hash, self._workers)
+        )
+        for rel_path in to_hash:
+            self._record_stat(rel_path, stats[rel_path], hashed_at)
+
+        if self._store is not None:
+            self._store.save(
+                self._strategy.tag,
+                {
+                    rel_path: (self._hashes[rel_path], self._stats[rel_path])
+                    for rel_path in rel_paths
+                    if rel_path in self._stats
+                },
+            )
 
     def check_and_update(self, rel_path: str) -> bool:
         """Check if a file's content has changed since last hash.
 
-        Computes the current hash and compares with the stored one.
-        If changed (or new file), updates the stored hash and returns True.
-        If unchanged, returns False.
+        Skips reading the file if its stat data is unchanged (and wasn't
+        racily clean). Otherwise computes the current hash and compares
+        with the stored one. If changed (or new file), updates the stored
+        hash and returns True. If unchanged, returns False.
 
         Args:
             rel_path: Relative path from project root.
@@ -191,24 +686,75 @@ class ContentHasher:
             True if content changed, False if unchanged.
         """
         full_path = self._root / rel_path
-        new_hash = _hash_file(full_path)
+        stat = _stat_data(full_path)
+        if stat is not None and self._stats.get(rel_path) == stat:
+            self.stat_hits += 1
+            return False
+
+        hashed_at = time.time_ns()
+        new_hash = self._strategy.hash_file(full_path) if stat is not None else ""
 
         if not new_hash:
             # File was deleted or unreadable — treat as changed
+            self._stats.pop(rel_path, None)
             old = self._hashes.pop(rel_path, None)
             return old is not None
 
         old_hash = self._hashes.get(rel_path)
         self._hashes[rel_path] = new_hash
+        self._record_stat(rel_path, stat, hashed_at)
         return new_hash != old_hash
 
+    def seed(self, rel_path: str, content_hash: str) -> None:
+        """Record a file's current hash, obtained without reading the file.
+
+        For hashes another source vouches for, such as git's blob id of a
+        file that is clean in the work tree. The file's stat data is
+        recorded as if it had been hashed now.
+        """
+        stat = _stat_data(self._root / rel_path)
+        if stat is None:
+            self.remove(rel_path)
+            return
+        self._hashes[rel_path] = content_hash
+        self._record_stat(rel_path, stat, time.time_ns())
+
     def remove(self, rel_path: str) -> bool:
         """Remove a file from the hash tracker.
 
         Returns True if the file was previously tracked.
         """
+        self._stats.pop(rel_path, None)
         return self._hashes.pop(rel_path, None) is not None
 
+    def _record_stat(
+        self, rel_path: str, stat: StatData | None, hashed_at: int
+    ) -> None:
+        """Remember a file's stat data unless its hash could be racily clean.
+
+        Args:
+            rel_path: Relative path from project root.
+            stat: Stat data taken before the file was hashed.
+            hashed_at: Wall clock time (ns) just before the file was hashed.
+        """
+        if stat is None or not self._hashes.get(rel_path):
+            self._stats.pop(rel_path, None)
+        elif stat[0] >= hashed_at - RACY_WINDOW_NS:
+            # Modified too close to the read — a same-size rewrite within
+            # the filesystem's timestamp granularity would go unnoticed
+            self._stats.pop(rel_path, None)
+        else:
+            self._stats[rel_path] = stat
+
+
+def _stat_data(path: Path) -> StatData | None:
+    """(mtime_ns, size, inode) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
 
 # ── Incremental Pipeline ──────────────────────────────────────────
 
@@ -217,13 +763,20 @@ class ContentHasher:
 class PipelineState:
     """Full in-memory state for the incremental pipeline.
 
-    Holds all parsed symbols, clustered modules, hierarchies, and
-    dependencies so that incremental updates can rebuild only what changed.
+    Holds all parsed symbols, clustered modules, hierarchies, the symbol
+    call graph and dependencies so that incremental updates can rebuild
+    only what changed.
+
+    imports_by_file caches each file's import targets together with the
+    content hash they were scanned from, so rebuilding module dependencies
+    only re-reads files that changed.
     """
 
-    symbols_by_file: dict[str, list[Symbol]] = field(default_factory=dict)
+    symbols_by_file: dict[str, SymbolTable] = field(default_factory=dict)
+    imports_by_file: dict[str, tuple[str, list[str]]] = field(default_factory=dict)
     modules: list[Module] = field(default_factory=list)
     hierarchies: list[Hierarchy] = field(default_factory=list)
+    references: ReferenceGraph = field(default_factory=ReferenceGraph)
     dependencies: list[Dependency] = field(default_factory=list)
     metadata: CodebaseMeta | None = None
 
@@ -233,10 +786,11 @@ class IncrementalPipeline:
 
     Maintains full state in memory. On file changes:
     1. Re-parse only changed files
-    2. Rebuild modules (full re-cluster — fast since it's just dict grouping)
-    3. Re-extract hierarchies
-    4. Re-serialize the full .codebase.md
-    5. Write atomically (temp file + rename)
+    2. Patch the modules, hierarchies and module dependencies touched by
+       those files (full re-cluster only when a module split threshold
+       is crossed — see IncrementalGraph), and their call graph edges
+    3. Re-serialize the full .codebase.md
+    4. Write atomically (temp file + rename)
 
     Usage:
         pipeline = IncrementalPipeline(
@@ -245,6 +799,20 @@ class IncrementalPipeline:
         )
         pipeline.full_index()  # initial parse
         pipeline.update_files(["src/main.py"])  # incremental update
+
+    Pass jobs > 1 (or 0 for one per CPU) to run the initial parse across
+    a process pool. With a SymbolCache, files whose content hash is already
+    cached are not re-parsed (warm restarts only parse what changed).
+    With a GitBlobStrategy, files that are clean in git aren't even read to
+    compute their hash; with a HashStore, neither are files whose stat data
+    is unchanged since the previous run. The remaining files are hashed on
+    hash_workers threads (default: one per CPU).
+
+    The output file is rewritten whenever its content changes, which
+    includes a new last_indexed. With stable_timestamp, last_indexed keeps
+    its previous value until the structure changes, so edits that don't
+    change the map skip the write entirely; the returned content always
+    matches the file on disk.
     """
 
     def __init__(
@@ -253,37 +821,88 @@ class IncrementalPipeline:
         output_path: str | Path | None = None,
         project_name: str | None = None,
         file_filter: FileFilter | None = None,
+        jobs: int = 1,
+        cache: SymbolCache | None = None,
+        stable_timestamp: bool = False,
+        hash_strategy: HashStrategy | None = None,
+        hash_store: HashStore | None = None,
+        hash_workers: int = 0,
     ) -> None:
         self._root = Path(project_root).resolve()
         self._output = Path(output_path) if output_path else self._root / ".codebase.md"
         self._project_name = project_name or self._root.name
-        self._parser = CodebaseParser(self._root)
-        self._clusterer = ModuleClusterer()
+        self._parser = CodebaseParser(self._root, jobs=jobs)
+        self._graph = IncrementalGraph(ModuleClusterer(), self._file_imports)
         self._manifest_parser = ManifestParser()
+        self._manifest_stamp: tuple[tuple[int, int] | None, ...] | None = None
+        self._languages: list[str] = []
         self._writer = CodebaseWriter()
         self._filter = file_filter or FileFilter(self._root)
+        self._cache = cache
+        self._hasher = ContentHasher(
+            self._root, hash_strategy, hash_store, workers=hash_workers
+        )
+        self._stable_timestamp = stable_timestamp
+        self._output_state: _OutputState | None = None
         self.state = PipelineState()
+        # Whether the last rebuild rewrote the output file, and how many
+        # rebuilds skipped the write because the file already held the content
+        self.output_changed = False
+        self.writes_skipped = 0
+
+    @property
+    def hasher(self) -> ContentHasher:
+        """Content hashes of all indexed files (shareable with the watcher)."""
+        return self._hasher
 
     def full_index(self) -> str:
         """Run a full parse of the entire project.
 
         Returns the generated .codebase.md content.
         """
-        # Parse all files
-        raw_symbols = self._parser.parse_directory()
-
-        # Filter through our file filter
-        symbols_by_file: dict[str, list[Symbol]] = {}
-        for file_path, syms in raw_symbols.items():
-            if self._filter.should_include(file_path):
+        # List included files, pruning ignored directories during the walk.
+        # Pooled paths are shared by state keys, hashes and symbol tables.
+        files = [STRINGS.intern(path) for path in self._filter.walk()]
+
+        # Hash everything, then parse only contents missing from the cache
+        self._hasher.compute_initial(files)
+
+        cached: dict[str, SymbolTable] = {}
+        to_parse: list[str] = []
+        for file_path in files:
+            syms = self._cache_get(file_path)
+            if syms is None:
+                to_parse.append(file_path)
+            else:
+                cached[file_path] = syms
+
+        # Cache each parse as it streams in rather than after the whole batch
+        parsed: dict[str, SymbolTable] = {}
+        for file_path, syms in self._parser.iter_parse_files(to_parse):
+            self._cache_put(file_path, syms)
+            if syms:
+                parsed[file_path] = syms
+        if self._cache is not None:
+            self._cache.flush()
+
+        # Keep walk order regardless of where the symbols came from
+        symbols_by_file: dict[str, SymbolTable] = {}
+        for file_path in files:
+            syms = cached.get(file_path) or parsed.get(file_path)
+            if syms:
                 symbols_by_file[file_path] = syms
 
         self.state.symbols_by_file = symbols_by_file
+        self.state.imports_by_file = {
+            path: entry
+            for path, entry in self.state.imports_by_file.items()
+            if path in symbols_by_file
+        }
 
         # Rebuild graph from symbols
         return self._rebuild_and_write()
 
-    def update_files(self, changed_files: list[str]) -> str:
+    def update_files(self, changed_files: list[str], rehash: bool = True) -> str:
         """Incrementally update after file changes.
 
         Re-parses only the specified files, updates state,
@@ -291,25 +910,40 @@ class IncrementalPipeline:
 
         Args:
             changed_files: List of relative file paths that changed.
+            rehash: Re-check each file's content hash first. A
+                CodebaseWatcher sharing this pipeline's hasher has already
+                hashed the files it reports, so its callback passes False.
 
         Returns:
             The generated .codebase.md content.
         """
-        for rel_path in changed_files:
+        for rel_path in map(STRINGS.intern, changed_files):
+            self.state.imports_by_file.pop(rel_path, None)
+
             if not self._filter.should_include(rel_path):
                 # File is ignored — remove from state if present
                 self.state.symbols_by_file.pop(rel_path, None)
+                self._hasher.remove(rel_path)
                 continue
 
-            # Re-parse just this file
-            new_symbols = self._parser.parse_file(rel_path)
+            # Re-parse just this file (or reuse a cached parse of this content)
+            if rehash:
+                self._hasher.check_and_update(rel_path)
+            new_symbols = self._cache_get(rel_path)
+            if new_symbols is None:
+                new_symbols = self._parser.parse_file(rel_path)
+                self._cache_put(rel_path, new_symbols)
+
             if new_symbols:
                 self.state.symbols_by_file[rel_path] = new_symbols
             else:
                 # File was deleted or has no symbols
                 self.state.symbols_by_file.pop(rel_path, None)
 
-        return self._rebuild_and_write()
+        if self._cache is not None:
+            self._cache.flush()
+
+        return self._rebuild_and_write(changed_files)
 
     def remove_files(self, deleted_files: list[str]) -> str:
         """Handle file deletions.
@@ -324,35 +958,67 @@ class IncrementalPipeline:
         """
         for rel_path in deleted_files:
             self.state.symbols_by_file.pop(rel_path, None)
+            self.state.imports_by_file.pop(rel_path, None)
+            self._hasher.remove(rel_path)
 
-        return self._rebuild_and_write()
-
-    def _rebuild_and_write(self) -> str:
-        """Rebuild the full graph from current state and write output.
+        return self._rebuild_and_write(deleted_files)
 
-        This is called after any state change (full index or incremental).
-        Re-clustering and re-serialization are fast operations, so we always
-        rebuild the full graph rather than trying to patch it.
-        """
-        # Detect languages from file extensions
-        languages = self._detect_languages()
+    def _cache_get(self, rel_path: str) -> SymbolTable | None:
+        """Look up a file's symbols in the cache by its current content hash."""
+        if self._cache is None:
+            return None
+        content_hash = self._hasher.get(rel_path)
+        if not content_hash:
+            return None
+        return self._cache.get(content_hash, rel_path)
 
-        # Cluster into modules
-        self.state.modules = self._clusterer.cluster(self.state.symbols_by_file)
+    def _cache_put(self, rel_path: str, symbols: SymbolTable) -> None:
+        """Store a freshly parsed file under its current content hash."""
+        if self._cache is None:
+            return
+        content_hash = self._hasher.get(rel_path)
+        if content_hash:
+            self._cache.put(content_hash, symbols, rel_path)
 
-        # Extract hierarchies
-        self.state.hierarchies = extract_hierarchies(self.state.symbols_by_file)
+    def _rebuild_and_write(self, changed_files: list[str] | None = None) -> str:
+        """Bring the graph up to date with current state and write output.
 
-        # Detect cross-module dependencies
-        detect_cross_module_deps(self.state.modules, str(self._root))
+        This is called after any state change. With changed_files, only the
+        graph parts touched by those files are recomputed; without, the whole
+        graph (modules, hierarchies, module dependencies, call graph) is
+        rebuilt.
 
-        # Parse manifest for external dependencies
-        self.state.dependencies = self._manifest_parser.parse(self._root)
+        Args:
+            changed_files: Paths whose symbols_by_file entry changed, or
+                None after a full index.
+        """
+        symbols_by_file = self.state.symbols_by_file
+
+        if changed_files is None:
+            self._languages = self._detect_languages()
+            self._graph.rebuild(symbols_by_file)
+            self.state.references.rebuild(symbols_by_file)
+        else:
+            # Languages only change when files enter or leave the index
+            if any((path in symbols_by_file) != (path in self._graph)
+                   for path in changed_files):
+                self._languages = self._detect_languages()
+            self._graph.apply(symbols_by_file, changed_files)
+            self.state.references.apply(symbols_by_file, changed_files)
+
+        self.state.modules = self._graph.modules
+        self.state.hierarchies = self._graph.hierarchies
+
+        # Parse manifests for external dependencies (only when they changed)
+        manifest_stamp = self._stat_manifests()
+        if manifest_stamp != self._manifest_stamp:
+            self.state.dependencies = self._manifest_parser.parse(self._root)
+            self._manifest_stamp = manifest_stamp
 
         # Build metadata
         self.state.metadata = CodebaseMeta(
             name=self._project_name,
-            languages=languages,
+            languages=self._languages,
         )
 
         # Serialize
@@ -361,13 +1027,78 @@ class IncrementalPipeline:
             hierarchies=self.state.hierarchies,
             dependencies=self.state.dependencies,
             metadata=self.state.metadata,
+            calls=self.state.references.top_edges(self._writer.max_call_edges),
         )
 
-        # Write atomically
-        self._write_atomic(content)
+        # Write atomically, unless the file already holds this content
+        return self._write_if_changed(content)
+
+    def _write_if_changed(self, content: str) -> str:
+        """Write content unless the output file already holds it.
+
+        With stable_timestamp, a file with the same structure counts as
+        holding it whatever its last_indexed.
+
+        Returns:
+            The content as it stands on disk — with the previous last_indexed
+            if stable_timestamp is set and the write was skipped.
+        """
+        before, timestamp, after = split_last_indexed(content)
+        digest = _structural_digest(before, after)
+
+        previous = self._current_output()
+        if (
+            previous is not None
+            and previous.digest == digest
+            and (self._stable_timestamp or previous.last_indexed == timestamp)
+        ):
+            self.output_changed = False
+            self.writes_skipped += 1
+            if self._stable_timestamp and previous.last_indexed is not None:
+                if self.state.metadata is not None:
+                    self.state.metadata.last_indexed = previous.last_indexed
+                return f"{before}{previous.last_indexed}{after}"
+            return content
 
+        self._write_atomic(content)
+        self._output_state = _OutputState(digest, timestamp, _stat_key(self._output))
+        self.output_changed = True
         return content
 
+    def _current_output(self) -> _OutputState | None:
+        """Digest of the output file, reading it only if we didn't write it last."""
+        stamp = _stat_key(self._output)
+        if stamp is None:
+            return None
+        if self._output_state is not None and self._output_state.stamp == stamp:
+            return self._output_state
+
+        # First rebuild, or the file changed behind our back
+        try:
+            existing = self._output.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        before, timestamp, after = split_last_indexed(existing)
+        self._output_state = _OutputState(
+            _structural_digest(before, after), timestamp, stamp
+        )
+        return self._output_state
+
+    def _file_imports(self, rel_path: str) -> list[str]:
+        """Return a file's import targets, rescanning only if its hash changed."""
+        content_hash = self._hasher.get(rel_path) or ""
+        cached = self.state.imports_by_file.get(rel_path)
+        if cached is not None and content_hash and cached[0] == content_hash:
+            return cached[1]
+
+        targets = scan_file_imports(rel_path, str(self._root))
+        self.state.imports_by_file[rel_path] = (content_hash, targets)
+        return targets
+
+    def _stat_manifests(self) -> tuple[tuple[int, int] | None, ...]:
+        """(mtime_ns, size) of each manifest file, None for missing ones."""
+        return tuple(_stat_key(self._root / name) for name in MANIFEST_FILES)
+
     def _detect_languages(self) -> list[str]:
         """Detect programming languages from file extensions in the index."""
         extensions: set[str] = set()
@@ -421,15 +1152,161 @@ class IncrementalPipeline:
             raise
 
 
+@dataclass(frozen=True, slots=True)
+class _OutputState:
+    """What the output file on disk holds, as of its last write or read."""
+
+    digest: str
+    last_indexed: str | None
+    stamp: tuple[int, int] | None
+
+
+def _structural_digest(before: str, after: str) -> str:
+    """SHA-256 of rendered content with its last_indexed value cut out."""
+    h = hashlib.sha256(before.encode("utf-8"))
+    h.update(after.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# ── ChangeCoalescer ────────────────────────────────────────────────
+
+# Default coalescing window: flush after this much quiet...
+DEFAULT_QUIET_MS = 100
+# ...but never hold a change back longer than this
+DEFAULT_MAX_LATENCY_MS = 1000
+
+
+class ChangeCoalescer:
+    """Merges change batches into one deduplicated set per burst.
+
+    A burst is flushed once no new batch arrived for quiet_ms, or once its
+    first batch is max_latency_ms old — so a long-running formatter or a
+    `git checkout` still produces updates at a bounded rate.
+
+    Usage:
+        coalescer = ChangeCoalescer(quiet_ms=100, max_latency_ms=1000)
+        coalescer.add(["src/a.py", "src/b.py"])
+        coalescer.add(["src/a.py"])
+        if coalescer.ready():
+            update(coalescer.drain())  # ["src/a.py", "src/b.py"]
+    """
+
+    def __init__(
+        self,
+        quiet_ms: int = DEFAULT_QUIET_MS,
+        max_latency_ms: int = DEFAULT_MAX_LATENCY_MS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the coalescer.
+
+        Args:
+            quiet_ms: Quiet period that ends a burst (0 = flush every batch).
+            max_latency_ms: Upper bound on how long a change is held back.
+            clock: Monotonic time source in seconds (injectable for tests).
+        """
+        self.quiet_ms = max(0, quiet_ms)
+        self.max_latency_ms = max(self.quiet_ms, max_latency_ms)
+        self._clock = clock
+        self._pending: dict[str, None] = {}
+        self._first_at = 0.0
+        self._last_at = 0.0
+
+        # Metrics
+        self.batches = 0
+        self.flushes = 0
+        self.paths_received = 0
+        self.paths_flushed = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of distinct paths waiting to be flushed."""
+        return len(self._pending)
+
+    @property
+    def rebuilds_saved(self) -> int:
+        """Batches merged into another batch's flush instead of their own."""
+        return self.batches - self.flushes - (1 if self._pending else 0)
+
+    def add(self, paths: list[str]) -> None:
+        """Merge one batch of changed paths into the pending burst."""
+        if not paths:
+            return
+        now = self._clock()
+        if not self._pending:
+            self._first_at = now
+        self._last_at = now
+        self._pending.update(dict.fromkeys(paths))
+        self.batches += 1
+        self.paths_received += len(paths)
+
+    def ready(self) -> bool:
+        """Whether the pending burst should be flushed now."""
+        if not self._pending:
+            return False
+        now = self._clock()
+        return (
+            (now - self._last_at) * 1000 >= self.quiet_ms
+            or (now - self._first_at) * 1000 >= self.max_latency_ms
+        )
+
+    def due_in_ms(self) -> int | None:
+        """Milliseconds until the pending burst is ready, or None if idle."""
+        if not self._pending:
+            return None
+        now = self._clock()
+        due = min(
+            self._last_at + self.quiet_ms / 1000,
+            self._first_at + self.max_latency_ms / 1000,
+        )
+        return max(0, math.ceil((due - now) * 1000))
+
+    def drain(self) -> list[str]:
+        """Return the pending paths (first-seen order) and start a new burst."""
+        paths = list(self._pending)
+        self._pending = {}
+        if paths:
+            self.flushes += 1
+            self.paths_flushed += len(paths)
+        return paths
+
+
 # ── CodebaseWatcher ────────────────────────────────────────────────
 
+# How long an idle watcher sleeps before re-reading HEAD (commits move it
+# without touching watched files)
+IDLE_TIMEOUT_MS = 30_000
+
+# How often the notifier checks the stop event while it waits
+_WATCH_STEP_MS = 50
+
+# Polling interval when watchfiles falls back to polling (its default)
+_POLL_DELAY_MS = 300
+
 
 class CodebaseWatcher:
     """Watches a directory for file changes and triggers incremental updates.
 
     Uses watchfiles (Rust-backed, cross-platform) for efficient change
     detection. Integrates with FileFilter for ignore patterns and
-    ContentHasher for content-based deduplication.
+    ContentHasher for content-based deduplication. Change batches are
+    merged by a ChangeCoalescer, so a burst of events (a `git checkout`,
+    a formatter run) results in a single callback.
+
+    Files are hashed only when a burst is flushed. In a git work tree, if
+    HEAD moved during the burst (checkout, reset, pull), the files changed
+    between the old and new commit are taken from `git diff`. With a
+    GitBlobStrategy, those that are clean in the work tree take their hash
+    from the diff's blob ids instead of being read. The callback receives
+    files whose current hashes the hasher already holds.
 
     Usage:
         watcher = CodebaseWatcher(
@@ -446,11 +1323,18 @@ class CodebaseWatcher:
         project_root: str | Path,
         on_change: Callable[[list[str]], None] | None = None,
         file_filter: FileFilter | None = None,
+        hasher: ContentHasher | None = None,
+        quiet_ms: int = DEFAULT_QUIET_MS,
+        max_latency_ms: int = DEFAULT_MAX_LATENCY_MS,
+        git_aware: bool = True,
     ) -> None:
         self._root = Path(project_root).resolve()
         self._on_change = on_change
         self._filter = file_filter or FileFilter(self._root)
-        self._hasher = ContentHasher(self._root)
+        self._hasher = hasher or ContentHasher(self._root)
+        self.coalescer = ChangeCoalescer(quiet_ms, max_latency_ms)
+        self._git_aware = git_aware
+        self._git: GitHeadTracker | None = None
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
 
@@ -470,43 +1354,144 @@ class CodebaseWatcher:
         if callback is None:
             raise ValueError("on_change callback is required")
 
-        for changes in watchfiles.watch(
-            str(self._root),
-            stop_event=self._stop_event,
-            watch_filter=self._make_filter(),
-        ):
-            if self._stop_event.is_set():
-                break
+        if self._git_aware:
+            tracker = GitHeadTracker(self._root)
+            self._git = tracker if tracker.enabled else None
+
+        coalescer = self.coalescer
+        watch_filter = self._make_filter()
+        with self._open_notifier() as notify:
+            while not self._stop_event.is_set():
+                # Sleep until something changes while idle; with a burst
+                # pending, wake up when it's due so it gets flushed
+                due_in = coalescer.due_in_ms()
+                raw_changes = notify.watch(
+                    # Hand batches over at least as often as the latency
+                    # ceiling; 0 returns each batch as soon as it's seen
+                    coalescer.max_latency_ms,
+                    _WATCH_STEP_MS,
+                    IDLE_TIMEOUT_MS if due_in is None else max(1, due_in),
+                    self._stop_event,
+                )
+                if raw_changes == "stop":
+                    break
+                if raw_changes == "signal":
+                    raise KeyboardInterrupt
+                if raw_changes != "timeout":
+                    changes = {
+                        (change, path)
+                        for change, path in (
+                            (watchfiles.Change(raw), path) for raw, path in raw_changes
+                        )
+                        if watch_filter(change, path)
+                    }
+                    coalescer.add(self._relevant_paths(changes))
+
+                if coalescer.ready():
+                    changed_files = self._resolve_changes(coalescer.drain())
+                    if changed_files:
+                        callback(changed_files)
+                elif not coalescer.pending and self._git is not None:
+                    # HEAD moves without file events (commits) need no update
+                    self._git.sync()
+
+    def _open_notifier(self) -> RustNotify:
+        """The Rust notifier behind watchfiles.watch(), set up the same way.
+
+        watchfiles.watch() fixes its timeout up front, so watch() drives the
+        notifier directly to pick the timeout per wait. The settings come
+        from watchfiles' own defaults, so WATCHFILES_FORCE_POLLING, WSL
+        detection, WATCHFILES_DEBUG and WATCHFILES_IGNORE_PERMISSION_DENIED
+        apply as they would to watchfiles.watch().
+        """
+        return RustNotify(
+            [str(self._root)],
+            _default_debug(None),
+            _default_force_polling(None),
+            _default_poll_delay_ms(_POLL_DELAY_MS),
+            True,  # recursive
+            _default_ignore_permission_denied(None),
+        )
 
-            # Process changes: filter + content-hash dedup
-            changed_files: list[str] = []
-            for change_type, abs_path in changes:
-                try:
-                    rel_path = str(Path(abs_path).resolve().relative_to(self._root))
-                except ValueError:
-                    continue
+    def _relevant_paths(
+        self,
+        changes: set[tuple[watchfiles.Change, str]],
+    ) -> list[str]:
+        """Map one watchfiles batch to the relative paths we index.
 
-                # Normalize to forward slashes
-                rel_path = rel_path.replace(os.sep, "/")
+        Changed ignore files invalidate the filter first, so the rest of
+        the batch is filtered with the new rules.
+        """
+        changed: list[str] = []
+        for _change_type, abs_path in changes:
+            try:
+                rel_path = str(Path(abs_path).resolve().relative_to(self._root))
+            except ValueError:
+                continue
+
+            # Normalize to forward slashes
+            changed.append(rel_path.replace(os.sep, "/"))
+
+        for rel_path in changed:
+            if self._filter.invalidate(rel_path):
+                logger.info("Ignore rules changed: %s", rel_path)
+
+        return [rel_path for rel_path in changed if self._is_relevant(rel_path)]
+
+    def _is_relevant(self, rel_path: str) -> bool:
+        """Whether a path passes the file filter and has a supported extension."""
+        return (
+            self._filter.should_include(rel_path)
+            and Path(rel_path).suffix in SUPPORTED_EXTENSIONS
+        )
 
-                # Apply file filter
-                if not self._filter.should_include(rel_path):
-                    continue
+    def _resolve_changes(self, rel_paths: list[str]) -> list[str]:
+        """Reduce a flushed burst to the files whose content really changed."""
+        changed: dict[str, None] = {}
+
+        # A HEAD move during the burst: trust git for the files it rewrote
+        tree_changes = self._git.poll() if self._git is not None else None
+        tree_changes = [c for c in tree_changes or () if self._is_relevant(c.path)]
+        # Files still clean in the work tree hold the new commit's blobs, so
+        # a strategy hashing blob ids takes their hashes from the diff
+        blob_hashes = {
+            change.path: self._hasher.strategy.blob_hash(change.new_oid)
+            for change in tree_changes
+            if not change.deleted
+        }
+        clean = self._clean_blob_ids() if any(blob_hashes.values()) else {}
+        for change in tree_changes:
+            changed[change.path] = None
+            content_hash = blob_hashes.get(change.path)
+            if change.deleted:
+                self._hasher.remove(change.path)
+            elif content_hash and clean.get(change.path) == change.new_oid:
+                self._hasher.seed(change.path, content_hash)
+            else:
+                self._hasher.check_and_update(change.path)
 
-                # Only track supported extensions
-                if Path(rel_path).suffix not in SUPPORTED_EXTENSIONS:
-                    continue
+        # Content-hash dedup for everything else
+        for rel_path in rel_paths:
+            if rel_path in changed:
+                continue
+            if not (self._root / rel_path).exists():
+                self._hasher.remove(rel_path)
+                changed[rel_path] = None
+            elif self._hasher.check_and_update(rel_path):
+                changed[rel_path] = None
+
+        return list(changed)
 
-                # Content-hash dedup
-                if change_type == watchfiles.Change.deleted:
-                    self._hasher.remove(rel_path)
-                    changed_files.append(rel_path)
-                else:
-                    if self._hasher.check_and_update(rel_path):
-                        changed_files.append(rel_path)
+    def _clean_blob_ids(self) -> dict[str, str]:
+        """Blob ids of the files whose work tree copy matches the index.
 
-            if changed_files:
-                callback(changed_files)
+        Empty if git fails.
+        """
+        oids = index_oids(self._root)
+        dirty = modified_files(self._root) if oids else None
+        if oids is None or dirty is None:
+            return {}
+        return {path: oid for path, oid in oids.items() if path not in dirty}
 
     def stop(self) -> None:
         """Stop watching for file changes."""
@@ -534,5 +1519,5 @@ class CodebaseWatcher:
         # watchfiles.DefaultFilter already ignores common dirs like .git, __pycache__
         # We add our custom ignored directories
         return watchfiles.DefaultFilter(
-            ignore_dirs=tuple(HARDCODED_IGNORES),
+            ignore_dirs=(*HARDCODED_IGNORES, CACHE_DIR_NAME),
         )
@@ -2,25 +2,32 @@
 
 Generates the final .codebase.md file containing:
 - Markdown prompt framing (tells the model this is live data)
-- TOON-encoded codeblock with modules, symbols, hierarchies,
-  and dependencies
+- TOON-encoded codeblock with modules, symbols, hierarchies, the
+  most-called symbols' call edges, and dependencies
 
 TOON format rules:
 - Table header declares field names: table_name[count]{field1,field2,...}:
 - Each row is comma-separated values on its own line, indented 2 spaces
 - Pipe | for multi-value fields (e.g. key_types: User|Session)
 - Strings are unquoted unless they contain commas or pipes
+
+The writer caches rendered fragments (module rows, each module's symbol
+rows, the hierarchies, calls and dependencies tables) and only re-renders the
+ones whose inputs changed since the previous write(), so regenerating the
+map after a single-file edit mostly stitches cached strings together.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
 
 from src.core.graph import Hierarchy, Module
 from src.core.manifest import Dependency
-from src.core.parser import Symbol
+from src.core.parser import Symbol, SymbolTable
+from src.core.references import CallEdge
 
 
 # ── Prompt framing ─────────────────────────────────────────────────
@@ -39,7 +46,9 @@ searching. Trust these locations — they are current.
 
 **How to use this map:**
 - `symbols[]` — exact locations of classes, functions, methods (cite as `file:line`)
-- `hierarchies[]` — inheritance and interface relationships
+- `hierarchies[]` — inheritance and interface relationships (target_fqn
+  locates targets defined in this codebase)
+- `calls[]` — who calls the most-called functions, methods and classes
 - `modules[]` — top-level component boundaries and their dependencies
 - `dependencies[]` — external library requirements
 
@@ -72,8 +81,57 @@ def _pipe_join(items: list[str]) -> str:
     return "|".join(items)
 
 
+def _symbol_row(sym: Symbol) -> str:
+    """Render one symbols table row."""
+    # Line numbers: Kit uses 0-indexed, add 1 for human-readable
+    line_num = sym.line + 1
+
+    fqn = _escape_value(sym.fqn)
+    kind = sym.kind
+    file = _escape_value(sym.file)
+    sig = _escape_value(sym.signature)
+
+    return f"  {fqn},{kind},{file},{line_num},{sig}"
+
+
+def _snapshot(symbols: Sequence[Symbol]) -> Sequence[Symbol]:
+    """Immutable copy of a module's symbols for cache keys."""
+    # SymbolTables are immutable and compare column-wise without
+    # materializing Symbols; lists may be edited in place later
+    return symbols if isinstance(symbols, SymbolTable) else tuple(symbols)
+
+
+def _hierarchy_row(h: Hierarchy) -> str:
+    """Render one hierarchies table row."""
+    # Line numbers: Kit uses 0-indexed, add 1 for human-readable
+    line_num = h.line + 1
+
+    symbol = _escape_value(h.symbol)
+    target = _escape_value(h.target)
+    # Left empty when the target isn't defined in the codebase (or ambiguous)
+    target_fqn = _escape_value(h.target_fqn or "")
+    file = _escape_value(h.file)
+
+    return f"  {symbol},{h.relationship},{target},{target_fqn},{file},{line_num}"
+
+
+def _call_row(edge: CallEdge) -> str:
+    """Render one calls table row."""
+    return f"  {_escape_value(edge.caller)},{_escape_value(edge.callee)}"
+
+
+def _dependency_row(dep: Dependency) -> str:
+    """Render one dependencies table row."""
+    name = _escape_value(dep.name)
+    version = _escape_value(dep.version)
+    return f"  {name},{version},{dep.category}"
+
+
 # ── Metadata ───────────────────────────────────────────────────────
 
+# Start of the timestamp line inside the codebase: block
+_LAST_INDEXED_PREFIX = "\n  last_indexed: "
+
 
 @dataclass
 class CodebaseMeta:
@@ -103,14 +161,21 @@ class CodebaseWriter:
             hierarchies=hierarchies,
             dependencies=deps,
             metadata=CodebaseMeta(name="my-project", languages=["python"]),
+            calls=reference_graph.top_edges(writer.max_call_edges),
         )
         writer.write_to_file(Path(".codebase.md"), ...)
+
+    Rendered fragments are cached between calls, so reuse one writer for
+    repeated writes of the same codebase. With verify=True every write()
+    is also rendered from scratch and compared byte for byte.
     """
 
     def __init__(
         self,
         max_symbols: int = 500,
         min_symbols_per_module: int = 3,
+        verify: bool = False,
+        max_call_edges: int = 100,
     ) -> None:
         """Initialize the writer.
 
@@ -120,9 +185,20 @@ class CodebaseWriter:
                          and a truncation comment is added.
             min_symbols_per_module: Minimum symbols to include per module
                                     when truncation is needed.
+            verify: Differential mode — check every cached render against
+                    a full render and raise RuntimeError on a mismatch.
+            max_call_edges: Maximum number of call edges to include.
         """
         self.max_symbols = max_symbols
         self.min_symbols_per_module = max(1, min_symbols_per_module)
+        self.verify = verify
+        self.max_call_edges = max(0, max_call_edges)
+
+        # Fragment caches, keyed by module path / section name. Each entry
+        # holds a snapshot of the inputs it was rendered from.
+        self._module_rows: dict[str, tuple[tuple, str]] = {}
+        self._symbol_fragments: dict[str, tuple[tuple, str, int]] = {}
+        self._sections: dict[str, tuple[tuple, str]] = {}
 
     def write(
         self,
@@ -130,14 +206,41 @@ class CodebaseWriter:
         hierarchies: list[Hierarchy],
         dependencies: list[Dependency],
         metadata: CodebaseMeta,
+        calls: list[CallEdge] | None = None,
     ) -> str:
         """Serialize the graph to .codebase.md content.
 
         Returns the full file content as a string: markdown prompt
-        framing wrapping a TOON codeblock.
+        framing wrapping a TOON codeblock. Only the first max_call_edges
+        calls are included (see ReferenceGraph.top_edges).
+
+        Raises:
+            RuntimeError: In verify mode, if the cached render differs
+                from a full render.
         """
-        toon = self._serialize_toon(modules, hierarchies, dependencies, metadata)
-        return f"{_PROMPT_FRAMING}\n\n```toon\n{toon}```\n"
+        if metadata.last_indexed is None:
+            # Pin the timestamp so a verification render sees the same one
+            metadata = replace(metadata, last_indexed=_utc_timestamp())
+
+        calls = (calls or [])[: self.max_call_edges]
+        toon = self._serialize_toon(
+            modules, hierarchies, dependencies, metadata, calls
+        )
+        content = f"{_PROMPT_FRAMING}\n\n```toon\n{toon}```\n"
+
+        if self.verify:
+            # A fresh writer has empty caches, i.e. renders everything
+            expected = CodebaseWriter(
+                self.max_symbols,
+                self.min_symbols_per_module,
+                max_call_edges=self.max_call_edges,
+            ).write(modules, hierarchies, dependencies, metadata, calls)
+            if content != expected:
+                raise RuntimeError(
+                    "Cached .codebase.md render differs from a full render"
+                )
+
+        return content
 
     def write_to_file(
         self,
@@ -146,6 +249,7 @@ class CodebaseWriter:
         hierarchies: list[Hierarchy],
         dependencies: list[Dependency],
         metadata: CodebaseMeta,
+        calls: list[CallEdge] | None = None,
     ) -> None:
         """Write .codebase.md to disk.
 
@@ -155,8 +259,9 @@ class CodebaseWriter:
             hierarchies: Hierarchy list from graph building.
             dependencies: Dependency list from manifest parsing.
             metadata: Codebase metadata.
+            calls: Call edges, most important first (ReferenceGraph.top_edges).
         """
-        content = self.write(modules, hierarchies, dependencies, metadata)
+        content = self.write(modules, hierarchies, dependencies, metadata, calls)
         Path(path).write_text(content, encoding="utf-8")
 
     # ── TOON serialization ─────────────────────────────────────────
@@ -167,6 +272,7 @@ class CodebaseWriter:
         hierarchies: list[Hierarchy],
         dependencies: list[Dependency],
         metadata: CodebaseMeta,
+        calls: list[CallEdge],
     ) -> str:
         """Build the full TOON content string."""
         parts: list[str] = []
@@ -184,6 +290,10 @@ class CodebaseWriter:
             parts.append(self._serialize_hierarchies(hierarchies))
             parts.append("")
 
+        if calls:
+            parts.append(self._serialize_calls(calls))
+            parts.append("")
+
         if dependencies:
             parts.append(self._serialize_dependencies(dependencies))
             parts.append("")
@@ -193,9 +303,7 @@ class CodebaseWriter:
     @staticmethod
     def _serialize_metadata(meta: CodebaseMeta) -> str:
         """Serialize the codebase: metadata block."""
-        timestamp = meta.last_indexed or datetime.now(timezone.utc).strftime(
-            "%Y-%m-%dT%H:%M:%SZ"
-        )
+        timestamp = meta.last_indexed or _utc_timestamp()
         lang_count = len(meta.languages)
         lang_list = ",".join(meta.languages)
 
@@ -207,66 +315,77 @@ class CodebaseWriter:
         ]
         return "\n".join(lines)
 
-    @staticmethod
-    def _serialize_modules(modules: list[Module]) -> str:
+    def _serialize_modules(self, modules: list[Module]) -> str:
         """Serialize the modules table."""
         count = len(modules)
         lines = [f"modules[{count}]{{name,path,key_types,depends_on}}:"]
+        rows: dict[str, tuple[tuple, str]] = {}
 
         for mod in modules:
-            key_types = _pipe_join(mod.key_types) if mod.key_types else ""
-            depends_on = _pipe_join(mod.depends_on) if mod.depends_on else ""
+            key = (mod.name, tuple(mod.key_types), tuple(mod.depends_on))
+            cached = self._module_rows.get(mod.path)
+            if cached is None or cached[0] != key:
+                cached = (key, self._module_row(mod))
+            rows[mod.path] = cached
+            lines.append(cached[1])
+
+        self._module_rows = rows
+        return "\n".join(lines)
 
-            name = _escape_value(mod.name)
-            path = _escape_value(mod.path)
-            key_types_val = _escape_value(key_types)
-            depends_on_val = _escape_value(depends_on)
+    @staticmethod
+    def _module_row(mod: Module) -> str:
+        """Render one modules table row."""
+        key_types = _pipe_join(mod.key_types) if mod.key_types else ""
+        depends_on = _pipe_join(mod.depends_on) if mod.depends_on else ""
 
-            lines.append(f"  {name},{path},{key_types_val},{depends_on_val}")
+        name = _escape_value(mod.name)
+        path = _escape_value(mod.path)
+        key_types_val = _escape_value(key_types)
+        depends_on_val = _escape_value(depends_on)
 
-        return "\n".join(lines)
+        return f"  {name},{path},{key_types_val},{depends_on_val}"
 
     def _serialize_symbols(self, modules: list[Module]) -> str:
         """Serialize the symbols table, respecting max_symbols budget."""
-        module_symbol_pairs: list[tuple[str, list[Symbol]]] = [
+        module_symbol_pairs: list[tuple[str, Sequence[Symbol]]] = [
             (mod.path, mod.symbols) for mod in modules if mod.symbols
         ]
-        all_symbols = [sym for _, symbols in module_symbol_pairs for sym in symbols]
+        total = sum(len(symbols) for _, symbols in module_symbol_pairs)
 
-        truncated = 0
-        if len(all_symbols) > self.max_symbols:
+        # Budget per module path, or None when every symbol fits
+        allocations: dict[str, int] | None = None
+        if total > self.max_symbols:
             allocations = self._allocate_symbol_budget(module_symbol_pairs)
-            symbols_to_write: list[Symbol] = []
-
-            for mod in modules:
-                if not mod.symbols:
-                    continue
-
-                budget = allocations.get(mod.path, 0)
-                if budget <= 0:
-                    continue
-
-                selected = self._select_symbols_for_module(mod.symbols, budget)
-                symbols_to_write.extend(selected)
-
-            truncated = len(all_symbols) - len(symbols_to_write)
-        else:
-            symbols_to_write = all_symbols
-
-        count = len(symbols_to_write)
-        lines = [f"symbols[{count}]{{fqn,kind,file,line,signature}}:"]
 
-        for sym in symbols_to_write:
-            # Line numbers: Kit uses 0-indexed, add 1 for human-readable
-            line_num = sym.line + 1
+        fragments: list[str] = []
+        count = 0
+        cache: dict[str, tuple[tuple, str, int]] = {}
 
-            fqn = _escape_value(sym.fqn)
-            kind = sym.kind
-            file = _escape_value(sym.file)
-            sig = _escape_value(sym.signature)
+        for mod in modules:
+            if not mod.symbols:
+                continue
 
-            lines.append(f"  {fqn},{kind},{file},{line_num},{sig}")
+            budget = None if allocations is None else allocations.get(mod.path, 0)
+            if budget is not None and budget <= 0:
+                continue
 
+            key = (budget, _snapshot(mod.symbols))
+            cached = self._symbol_fragments.get(mod.path)
+            if cached is None or cached[0] != key:
+                if budget is None:
+                    selected = mod.symbols
+                else:
+                    selected = self._select_symbols_for_module(mod.symbols, budget)
+                text = "\n".join(_symbol_row(sym) for sym in selected)
+                cached = (key, text, len(selected))
+            cache[mod.path] = cached
+            fragments.append(cached[1])
+            count += cached[2]
+
+        self._symbol_fragments = cache
+        truncated = total - count
+
+        lines = [f"symbols[{count}]{{fqn,kind,file,line,signature}}:", *fragments]
         if truncated > 0:
             lines.append(f"  # ... {truncated} more symbols omitted")
 
@@ -274,7 +393,7 @@ class CodebaseWriter:
 
     def _allocate_symbol_budget(
         self,
-        module_symbol_pairs: list[tuple[str, list[Symbol]]],
+        module_symbol_pairs: list[tuple[str, Sequence[Symbol]]],
     ) -> dict[str, int]:
         """Allocate symbol budget proportionally across modules."""
         module_counts = [(path, len(symbols)) for path, symbols in module_symbol_pairs]
@@ -343,7 +462,7 @@ class CodebaseWriter:
 
     @staticmethod
     def _select_symbols_for_module(
-        symbols: list[Symbol],
+        symbols: Sequence[Symbol],
         budget: int,
     ) -> list[Symbol]:
         """Pick symbols for one module, preferring type definitions first."""
@@ -357,33 +476,65 @@ class CodebaseWriter:
         remaining = budget - len(type_symbols)
         return type_symbols + other_symbols[:remaining]
 
-    @staticmethod
-    def _serialize_hierarchies(hierarchies: list[Hierarchy]) -> str:
+    def _serialize_hierarchies(self, hierarchies: list[Hierarchy]) -> str:
         """Serialize the hierarchies table."""
         count = len(hierarchies)
-        lines = [f"hierarchies[{count}]{{symbol,relationship,target,file,line}}:"]
+        header = (
+            f"hierarchies[{count}]{{symbol,relationship,target,target_fqn,file,line}}:"
+        )
+        return self._cached_section("hierarchies", header, hierarchies, _hierarchy_row)
 
-        for h in hierarchies:
-            # Line numbers: Kit uses 0-indexed, add 1 for human-readable
-            line_num = h.line + 1
+    def _serialize_calls(self, calls: list[CallEdge]) -> str:
+        """Serialize the calls table."""
+        header = f"calls[{len(calls)}]{{caller,callee}}:"
+        return self._cached_section("calls", header, calls, _call_row)
 
-            symbol = _escape_value(h.symbol)
-            target = _escape_value(h.target)
-            file = _escape_value(h.file)
+    def _serialize_dependencies(self, dependencies: list[Dependency]) -> str:
+        """Serialize the dependencies table."""
+        count = len(dependencies)
+        header = f"dependencies[{count}]{{name,version,category}}:"
+        return self._cached_section(
+            "dependencies", header, dependencies, _dependency_row
+        )
 
-            lines.append(f"  {symbol},{h.relationship},{target},{file},{line_num}")
+    def _cached_section(
+        self,
+        name: str,
+        header: str,
+        items: list[Hierarchy] | list[CallEdge] | list[Dependency],
+        render_row: Callable[..., str],
+    ) -> str:
+        """Render a table of frozen rows, reusing the previous render if equal."""
+        key = tuple(items)
+        cached = self._sections.get(name)
+        if cached is None or cached[0] != key:
+            text = "\n".join([header, *(render_row(item) for item in items)])
+            cached = (key, text)
+            self._sections[name] = cached
+        return cached[1]
 
-        return "\n".join(lines)
 
-    @staticmethod
-    def _serialize_dependencies(dependencies: list[Dependency]) -> str:
-        """Serialize the dependencies table."""
-        count = len(dependencies)
-        lines = [f"dependencies[{count}]{{name,version,category}}:"]
+def _utc_timestamp() -> str:
+    """Current UTC time in the ISO 8601 form used by last_indexed."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        for dep in dependencies:
-            name = _escape_value(dep.name)
-            version = _escape_value(dep.version)
-            lines.append(f"  {name},{version},{dep.category}")
 
-        return "\n".join(lines)
+def split_last_indexed(content: str) -> tuple[str, str | None, str]:
+    """Split rendered .codebase.md content around its last_indexed value.
+
+    Everything but the timestamp is structural content, so comparing
+    before + after tells whether two renders differ in anything that
+    matters to a reader.
+
+    Returns:
+        (before, timestamp, after) — joining the three reproduces content.
+        If there is no last_indexed line, returns (content, None, "").
+    """
+    start = content.find(_LAST_INDEXED_PREFIX)
+    if start == -1:
+        return content, None, ""
+    start += len(_LAST_INDEXED_PREFIX)
+    end = content.find("\n", start)
+    if end == -1:
+        end = len(content)
+    return content[:start], content[start:end], content[end:]
@@ -0,0 +1,131 @@
+"""Benchmark ModuleClusterer.assign on synthetic directory trees.
+
+Run as: python -m tests.bench.clustering [--files 10000 100000] [--depth 6]
+
+Generates monorepo-shaped trees of the requested sizes and times two
+implementations of the adaptive module split over the same input:
+
+- iterative: split every oversized module one directory level per pass
+  until nothing changes, re-counting symbols and re-parsing each path on
+  every pass (the algorithm assign() used before)
+- single-pass: ModuleClusterer.assign(), which aggregates subtree symbol
+  counts in one pass and places each file with one walk down its path
+
+Both must produce the same modules, with files in the same order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import PurePosixPath
+
+from src.core.graph import ModuleClusterer
+
+Assignment = dict[str, dict[str, Sequence]]
+
+
+def generate_tree(num_files: int, depth: int, seed: int = 0) -> dict[str, list]:
+    """Map num_files relative paths (up to depth directories) to symbol lists.
+
+    Symbol lists hold placeholders: the clusterer only looks at their length.
+    """
+    rng = random.Random(seed)
+    dirs = [f"d{i}" for i in range(8)]
+    symbols_by_file: dict[str, list] = {}
+    for i in range(num_files):
+        parts = [rng.choice(("src", "packages", "lib", "tests"))]
+        parts.extend(rng.choice(dirs) for _ in range(rng.randint(0, depth)))
+        parts.append(f"mod_{i}.py")
+        symbols_by_file["/".join(parts)] = [None] * rng.randint(0, 30)
+    return symbols_by_file
+
+
+def iterative_assign(
+    clusterer: ModuleClusterer, symbols_by_file: Mapping[str, Sequence]
+) -> Assignment:
+    """assign() as a fixed-point loop of one-level splits."""
+    module_files: Assignment = {}
+    for file_path, file_symbols in symbols_by_file.items():
+        module_path = ModuleClusterer._module_path_for(file_path)
+        module_files.setdefault(module_path, {})[file_path] = file_symbols
+
+    while True:
+        changed = False
+        next_files: Assignment = {}
+
+        for module_path in sorted(module_files):
+            file_symbol_map = module_files[module_path]
+            symbol_count = ModuleClusterer._symbol_count(file_symbol_map)
+            if symbol_count <= clusterer.max_module_symbols or module_path == ".":
+                next_files[module_path] = file_symbol_map
+                continue
+
+            module_parts = PurePosixPath(module_path).parts
+            split_map: Assignment = {}
+            for file_path, file_symbols in file_symbol_map.items():
+                parent_parts = PurePosixPath(file_path).parts[:-1]
+                if len(parent_parts) <= len(module_parts):
+                    target_path = module_path
+                else:
+                    next_part = parent_parts[len(module_parts)]
+                    target_path = "/".join((*module_parts, next_part))
+                split_map.setdefault(target_path, {})[file_path] = file_symbols
+
+            if set(split_map) == {module_path}:
+                next_files[module_path] = file_symbol_map
+                continue
+
+            changed = True
+            for split_path, split_files in split_map.items():
+                next_files.setdefault(split_path, {}).update(split_files)
+
+        module_files = next_files
+        if not changed:
+            return module_files
+
+
+def same_assignment(a: Assignment, b: Assignment) -> bool:
+    """Equal modules, in the same order, each with files in the same order."""
+    return list(a) == list(b) and all(list(a[m]) == list(b[m]) for m in a)
+
+
+def time_assign(
+    assign: Callable[[], Assignment], repeat: int = 3
+) -> tuple[float, Assignment]:
+    """Best-of-repeat seconds for one call, and the call's result."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = assign()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--max-symbols", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    clusterer = ModuleClusterer(max_module_symbols=args.max_symbols)
+    for num_files in args.files:
+        tree = generate_tree(num_files, args.depth)
+        baseline, expected = time_assign(lambda: iterative_assign(clusterer, tree))
+        single, result = time_assign(lambda: clusterer.assign(tree))
+        status = "identical" if same_assignment(expected, result) else "MISMATCH"
+
+        print(f"{num_files} files -> {len(result)} modules ({status})")
+        for label, seconds in (("iterative", baseline), ("single-pass", single)):
+            print(
+                f"  {label:<12} {seconds * 1000:8.1f}ms  "
+                f"({seconds * 1e6 / num_files:5.2f}us/file, "
+                f"{baseline / seconds:5.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
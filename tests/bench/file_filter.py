@@ -0,0 +1,118 @@
+"""Microbenchmark FileFilter.should_include over synthetic paths.
+
+Run as: python -m tests.bench.file_filter [--paths 100000]
+
+Writes a typical .gitignore to a temp directory, generates paths shaped
+like a monorepo (including ignored build and dependency directories), and
+times three matchers over the same path list:
+
+- uncached: hardcoded-ignore scan plus one pathspec match per spec, per
+  path (the matcher FileFilter used before it was compiled)
+- compiled, cold: a fresh FileFilter, so every path is a cache miss
+- compiled, warm: the same FileFilter again (as in watch mode, where the
+  same paths recur)
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pathspec
+
+from src.core.watcher import HARDCODED_IGNORES, FileFilter
+
+GITIGNORE = """\
+# build output
+*.pyc
+*.log
+*.tmp
+.env
+.DS_Store
+/generated/
+coverage/
+*.min.js
+docs/_build/
+**/snapshots/
+tmp/
+"""
+
+
+def generate_paths(count: int, seed: int = 0) -> list[str]:
+    """Monorepo-shaped relative paths, about a third of them ignored."""
+    rng = random.Random(seed)
+    packages = [f"packages/pkg{i:03d}" for i in range(200)]
+    subdirs = ["src", "src/core", "src/api", "tests", "lib", "snapshots", "tmp"]
+    ignored_dirs = ["node_modules/dep", "build", "dist", "generated", "coverage"]
+    names = ["index.ts", "main.py", "util.go", "app.log", "mod.pyc", "x.min.js"]
+
+    paths: list[str] = []
+    for i in range(count):
+        parts = [rng.choice(packages)]
+        if rng.random() < 0.2:
+            parts.append(rng.choice(ignored_dirs))
+        parts.append(rng.choice(subdirs))
+        parts.append(f"{i % 97}_{rng.choice(names)}")
+        paths.append("/".join(parts))
+    return paths
+
+
+def uncached_matcher(root: Path) -> Callable[[str], bool]:
+    """should_include() without directory caching, memoization or merging."""
+    lines = (root / ".gitignore").read_text().splitlines()
+    spec = pathspec.PathSpec.from_lines("gitignore", lines)
+
+    def should_include(rel_path: str) -> bool:
+        if any(part in HARDCODED_IGNORES for part in rel_path.split("/")):
+            return False
+        return not spec.match_file(rel_path)
+
+    return should_include
+
+
+def time_matcher(matcher: Callable[[str], bool], paths: list[str]) -> float:
+    """Seconds to run the matcher over every path."""
+    t0 = time.perf_counter()
+    for path in paths:
+        matcher(path)
+    return time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    paths = generate_paths(args.paths)
+    with tempfile.TemporaryDirectory(prefix="cg-filter-bench-") as tmp:
+        root = Path(tmp)
+        (root / ".gitignore").write_text(GITIGNORE)
+
+        uncached = uncached_matcher(root)
+        filt = FileFilter(root, cache_size=len(paths))
+        mismatches = sum(uncached(p) != filt.should_include(p) for p in paths)
+
+        baseline = time_matcher(uncached, paths)
+        cold = time_matcher(FileFilter(root).should_include, paths)
+        warm = time_matcher(filt.should_include, paths)
+
+    included = sum(map(filt.should_include, paths))
+    print(f"{len(paths)} paths, {included} included, {mismatches} mismatches")
+    for label, seconds in (
+        ("uncached", baseline),
+        ("compiled, cold", cold),
+        ("compiled, warm", warm),
+    ):
+        print(
+            f"{label:<15} {seconds * 1000:8.1f}ms  "
+            f"({seconds * 1e9 / len(paths):6.0f}ns/path, "
+            f"{baseline / seconds:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark serial vs. threaded content hashing on a synthetic tree.
+
+Run as: python -m tests.bench.hashing [--files 50000] [--workers 0]
+
+Generates a tree of source-sized files (plus a few files large enough to
+take the mmap path) in a temp directory, then times
+ContentHasher.compute_initial() with one worker and with a thread pool,
+and serially with each available hash algorithm. Each configuration is run
+once to warm the page cache, then timed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.core.hashing import BLAKE2B, MMAP_THRESHOLD, SHA256, XXH3, HashAlgorithm
+from src.core.parser import resolve_jobs
+from src.core.watcher import ContentHasher, HashStrategy
+
+# Files per generated directory
+_FILES_PER_DIR = 200
+
+# One in this many files is large enough to be memory-mapped
+_LARGE_FILE_EVERY = 5000
+
+
+def generate_tree(root: Path, num_files: int, seed: int = 0) -> list[str]:
+    """Write num_files synthetic source files under root.
+
+    Sizes follow a rough source-tree distribution: mostly 1-16 KiB, some
+    up to 128 KiB, and a few above MMAP_THRESHOLD.
+
+    Returns:
+        The relative paths of the generated files.
+    """
+    rng = random.Random(seed)
+    line = b"def function_name(argument: int) -> int:  # padding\n"
+    rel_paths: list[str] = []
+
+    for i in range(num_files):
+        rel_dir = f"pkg{i // _FILES_PER_DIR:04d}"
+        rel_path = f"{rel_dir}/mod_{i:06d}.py"
+        if i % _FILES_PER_DIR == 0:
+            (root / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        if i % _LARGE_FILE_EVERY == _LARGE_FILE_EVERY - 1:
+            size = MMAP_THRESHOLD + rng.randint(0, MMAP_THRESHOLD)
+        elif rng.random() < 0.05:
+            size = rng.randint(16 << 10, 128 << 10)
+        else:
+            size = rng.randint(1 << 10, 16 << 10)
+
+        body = line * (size // len(line) + 1)
+        (root / rel_path).write_bytes(f"# {i}\n".encode() + body[:size])
+        rel_paths.append(rel_path)
+
+    return rel_paths
+
+
+def time_hashing(
+    root: Path,
+    rel_paths: list[str],
+    workers: int,
+    algorithm: HashAlgorithm = SHA256,
+) -> float:
+    """Seconds taken by compute_initial() with the given configuration."""
+    ContentHasher(root, HashStrategy(algorithm), workers=workers).compute_initial(
+        rel_paths
+    )  # warm-up
+    t0 = time.perf_counter()
+    ContentHasher(root, HashStrategy(algorithm), workers=workers).compute_initial(
+        rel_paths
+    )
+    return time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Parallel workers (0 = one per CPU)."
+    )
+    args = parser.parse_args(argv)
+    workers = resolve_jobs(args.workers)
+
+    with tempfile.TemporaryDirectory(prefix="cg-hash-bench-") as tmp:
+        root = Path(tmp)
+        t0 = time.perf_counter()
+        rel_paths = generate_tree(root, args.files)
+        total_mb = sum((root / p).stat().st_size for p in rel_paths) / (1 << 20)
+        print(
+            f"Generated {len(rel_paths)} files ({total_mb:.0f} MiB) "
+            f"in {time.perf_counter() - t0:.1f}s"
+        )
+
+        serial = time_hashing(root, rel_paths, workers=1)
+        parallel = time_hashing(root, rel_paths, workers=workers)
+        algorithms = [a for a in (SHA256, BLAKE2B, XXH3) if a is not None]
+        by_algorithm = {
+            a.tag: time_hashing(root, rel_paths, workers=1, algorithm=a)
+            for a in algorithms
+        }
+
+    print(f"serial     (1 worker):  {serial * 1000:8.0f}ms")
+    print(f"parallel ({workers:2d} workers): {parallel * 1000:8.0f}ms")
+    print(f"speedup: {serial / parallel:.2f}x")
+    print()
+    for tag, seconds in by_algorithm.items():
+        print(f"{tag:<12} (1 worker):  {seconds * 1000:8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark symbol extraction: Kit's extract_symbols() vs. declarations only.
+
+Run as: python -m tests.bench.parsing [--files 1000] [--methods 40]
+
+Generates Python files holding one large class each (so Kit decodes every
+method body twice: once for the method, once inside the class body), then
+parses them all in a fresh child process per mode and reports parse
+throughput and the growth of the child's peak RSS:
+
+- kit: CodebaseParser._parse_file_with_kit(), which asks Kit for every
+  symbol's full code just to keep its first line
+- declarations: CodebaseParser.parse_file(), which reads only each
+  definition's first line from the source
+
+Both modes keep the parsed SymbolTables, as the pipeline does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.core.parser import CodebaseParser
+
+MODES = ("kit", "declarations")
+
+
+def generate_tree(root: Path, num_files: int, methods: int) -> list[str]:
+    """Write num_files Python modules, each a class with `methods` methods.
+
+    Returns:
+        The relative paths of the generated files.
+    """
+    body = "".join(
+        f"        value = value * {k} + len(str(value))  # padding padding\n"
+        for k in range(20)
+    )
+    rel_paths: list[str] = []
+    for i in range(num_files):
+        rel_path = f"pkg{i // 100:03d}/mod_{i:05d}.py"
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"class Service{i}(Base):\n", '    """A generated class."""\n']
+        for m in range(methods):
+            lines.append(f"\n    def method_{m}(self, value: int) -> int:\n")
+            lines.append(body)
+            lines.append("        return value\n")
+        path.write_text("".join(lines), encoding="utf-8")
+        rel_paths.append(rel_path)
+    return rel_paths
+
+
+def run_child(mode: str, root: Path) -> dict[str, float]:
+    """Parse every file under root in this process; return the measurements."""
+    parser = CodebaseParser(root)
+    parse = parser._parse_file_with_kit if mode == "kit" else parser.parse_file
+    rel_paths = sorted(p.relative_to(root).as_posix() for p in root.rglob("*.py"))
+
+    parse(rel_paths[0])  # load the grammar and query outside the measurement
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    tables = {path: parse(path) for path in rel_paths}
+    elapsed = time.perf_counter() - t0
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "files": len(tables),
+        "symbols": sum(len(table) for table in tables.values()),
+        "seconds": elapsed,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_growth_mib": (rss_after - rss_before) / 1024,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--methods", type=int, default=40)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--root", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.root)))
+        return
+
+    with tempfile.TemporaryDirectory(prefix="cg-parse-bench-") as tmp:
+        root = Path(tmp)
+        rel_paths = generate_tree(root, args.files, args.methods)
+        total_mb = sum((root / p).stat().st_size for p in rel_paths) / (1 << 20)
+        print(f"Generated {len(rel_paths)} files ({total_mb:.0f} MiB)")
+
+        results = {}
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, "-m", "tests.bench.parsing"]
+                + ["--child", mode, "--root", str(root)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    for mode, r in results.items():
+        print(
+            f"{mode:<13} {r['symbols']:7.0f} symbols  {r['seconds'] * 1000:7.0f}ms  "
+            f"({r['files'] / r['seconds']:6.0f} files/s)  "
+            f"peak RSS +{r['peak_rss_growth_mib']:.1f} MiB"
+        )
+    kit, decl = results["kit"], results["declarations"]
+    print(f"speedup: {kit['seconds'] / decl['seconds']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark ReferenceGraph on a synthetic call graph with 1M+ edges.
+
+Run as: python -m tests.bench.references [--files 20000] [--functions 10]
+        [--calls 6] [--edits 200]
+
+Generates parsed-looking SymbolTables (every function name unique, each
+function calling --calls random others), then reports:
+
+- rebuild: time to resolve every call and build the callee -> callers
+  index, and the memory it retains (tracemalloc)
+- apply: mean time to absorb a one-file edit that also adds or removes a
+  definition other files call
+- edge storage: bytes held by the packed edge arrays, against a set of
+  (caller FQN, callee FQN) tuples holding the same edges
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+from src.core.parser import Symbol, SymbolTable
+from src.core.references import ReferenceGraph
+
+
+def make_table(
+    rng: random.Random, index: int, functions: int, calls: int, total_files: int
+) -> SymbolTable:
+    """File `index`: `functions` functions, each calling `calls` others."""
+    file = f"pkg{index // 100:03d}/mod_{index:05d}.py"
+    module = file[:-3]
+    rows = SymbolTable(
+        [
+            Symbol(
+                name=f"fn_{index}_{j}",
+                kind="fn",
+                file=file,
+                line=j * 10,
+                end_line=j * 10 + 8,
+                signature=f"def fn_{index}_{j}():",
+                fqn=f"{module}::fn_{index}_{j}",
+            )
+            for j in range(functions)
+        ]
+    ).rows()
+    called = [
+        (j, f"fn_{rng.randrange(total_files)}_{rng.randrange(functions)}")
+        for j in range(functions)
+        for _ in range(calls)
+    ]
+    return SymbolTable.from_rows(rows, calls=called)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--functions", type=int, default=10)
+    parser.add_argument("--calls", type=int, default=6)
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    symbols_by_file = {}
+    for i in range(args.files):
+        table = make_table(rng, i, args.functions, args.calls, args.files)
+        symbols_by_file[table.files[0]] = table
+    paths = list(symbols_by_file)
+
+    # Memory is traced in a separate rebuild, which tracemalloc slows down
+    tracemalloc.start()
+    traced = ReferenceGraph()
+    traced.rebuild(symbols_by_file)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+
+    graph = ReferenceGraph()
+    t0 = time.perf_counter()
+    graph.rebuild(symbols_by_file)
+    rebuild = time.perf_counter() - t0
+
+    # Each edit drops the file's last function or brings it back, so the
+    # files calling that function are re-resolved too
+    t0 = time.perf_counter()
+    for _ in range(args.edits):
+        path = rng.choice(paths)
+        table = symbols_by_file[path]
+        if len(table) == args.functions:
+            symbols_by_file[path] = SymbolTable.from_rows(
+                list(table.rows())[:-1],
+                calls=[call for call in table.calls if call[0] < len(table) - 1],
+            )
+        else:
+            index = int(path.rsplit("_", 1)[1][:-3])
+            symbols_by_file[path] = make_table(
+                rng, index, args.functions, args.calls, args.files
+            )
+        graph.apply(symbols_by_file, [path])
+    apply = (time.perf_counter() - t0) / args.edits
+
+    packed = sum(
+        sys.getsizeof(a)
+        for store in (graph._file_edges, graph._callers)
+        for a in store.values()
+    )
+    edges = graph.edges()
+    as_tuples = sys.getsizeof(edges) + len(edges) * sys.getsizeof(("", ""))
+
+    print(f"{args.files} files, {len(graph)} edges")
+    print(f"rebuild    {rebuild:8.2f}s  retains {retained / (1 << 20):6.1f} MiB")
+    print(f"apply      {apply * 1000:8.2f}ms per edit")
+    print(
+        f"edge storage {packed / (1 << 20):6.1f} MiB packed vs "
+        f"{as_tuples / (1 << 20):6.1f} MiB as a set of FQN tuples"
+    )
+
+
+if __name__ == "__main__":
+    main()
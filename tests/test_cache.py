@@ -0,0 +1,206 @@
+"""Tests for the persistent content-hash symbol cache."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from src.core.cache import (
+    HashStore,
+    SymbolCache,
+    cache_version,
+    default_cache_path,
+    default_hash_store_path,
+    make_cache_dir,
+)
+from src.core.parser import Symbol, SymbolTable
+
+
+# ── Helpers ────────────────────────────────────────────────────────
+
+
+def _sym(name: str, file: str = "src/app/main.py", kind: str = "fn") -> Symbol:
+    """Shorthand to create a Symbol for testing."""
+    return Symbol(
+        name=name,
+        kind=kind,
+        file=file,
+        line=3,
+        end_line=8,
+        signature=f"def {name}():",
+        fqn=f"{file.rsplit('.', 1)[0]}::{name}",
+    )
+
+
+# ── SymbolCache ────────────────────────────────────────────────────
+
+
+class TestSymbolCache:
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        cache = SymbolCache(tmp_path / "cache.db")
+        symbols = [_sym("run"), _sym("App", kind="class")]
+        cache.put("h1", symbols, "src/app/main.py")
+        assert cache.get("h1", "src/app/main.py") == symbols
+
+    def test_roundtrip_keeps_type_refs(self, tmp_path: Path) -> None:
+        cache = SymbolCache(tmp_path / "cache.db")
+        rows = SymbolTable([_sym("run"), _sym("App", kind="class")]).rows()
+        table = SymbolTable.from_rows(rows, [(1, "extends", "Base")])
+        cache.put("h1", table, "src/app/main.py")
+        cached = cache.get("h1", "src/app/main.py")
+        assert cached == table
+        assert cached.type_refs == ((1, "extends", "Base"),)
+
+    def test_roundtrip_keeps_calls(self, tmp_path: Path) -> None:
+        cache = SymbolCache(tmp_path / "cache.db")
+        rows = SymbolTable([_sym("run"), _sym("App", kind="class")]).rows()
+        table = SymbolTable.from_rows(rows, calls=[(0, "App"), (1, "print")])
+        cache.put("h1", table, "src/app/main.py")
+        cached = cache.get("h1", "src/app/main.py")
+        assert cached == table
+        assert cached.calls == ((0, "App"), (1, "print"))
+
+    def test_miss_returns_none(self, tmp_path: Path) -> None:
+        cache = SymbolCache(tmp_path / "cache.db")
+        assert cache.get("missing", "a.py") is None
+        assert cache.misses == 1
+
+    def test_empty_symbol_list_is_cached(self, tmp_path: Path) -> None:
+        cache = SymbolCache(tmp_path / "cache.db")
+        cache.put("h1", [], "a.py")
+        assert cache.get("h1", "a.py") == []
+
+    def test_path_fields_rebuilt_for_new_path(self, tmp_path: Path) -> None:
+        """Identical content at another path gets that path's file/fqn."""
+        cache = SymbolCache(tmp_path / "cache.db")
+        cache.put("h1", [_sym("run", file="a/x.py")], "a/x.py")
+        [sym] = cache.get("h1", "b/y.py")
+        assert sym.file == "b/y.py"
+        assert sym.fqn == "b/y::run"
+
+    def test_same_content_keyed_by_extension(self, tmp_path: Path) -> None:
+        """The same bytes parse differently as .ts and .js, so never share."""
+        cache = SymbolCache(tmp_path / "cache.db")
+        cache.put("h1", [_sym("Foo", file="a.ts", kind="interface")], "a.ts")
+        assert cache.get("h1", "a.js") is None
+        cache.put("h1", [], "a.js")
+        assert cache.get("h1", "b.ts") == [_sym("Foo", file="b.ts", kind="interface")]
+        assert cache.get("h1", "b.js") == []
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.db"
+        cache = SymbolCache(path)
+        cache.put("h1", [_sym("run")], "a.py")
+        cache.close()
+
+        reopened = SymbolCache(path)
+        assert reopened.get("h1", "src/app/main.py") == [_sym("run")]
+
+    def test_version_change_clears_entries(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.db"
+        cache = SymbolCache(path, version="1")
+        cache.put("h1", [_sym("run")], "a.py")
+        cache.close()
+
+        assert len(SymbolCache(path, version="1")) == 1
+        assert len(SymbolCache(path, version="2")) == 0
+
+    def test_default_version_includes_kit(self) -> None:
+        assert "kit-" in cache_version()
+
+    def test_lru_eviction(self, tmp_path: Path) -> None:
+        cache = SymbolCache(tmp_path / "cache.db", max_entries=2)
+        cache.put("old", [], "a.py")
+        time.sleep(0.001)
+        cache.put("mid", [], "a.py")
+        time.sleep(0.001)
+        cache.put("new", [], "a.py")
+        time.sleep(0.001)
+        # Touch the oldest entry so "mid" becomes least recently used
+        assert cache.get("old", "a.py") == []
+        cache.flush()
+
+        assert len(cache) == 2
+        assert cache.get("mid", "a.py") is None
+        assert cache.get("old", "a.py") == []
+        assert cache.get("new", "a.py") == []
+
+    def test_corrupt_file_is_recreated(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.db"
+        path.write_bytes(b"not a sqlite database" * 100)
+        cache = SymbolCache(path)
+        assert cache.enabled
+        cache.put("h1", [], "a.py")
+        assert cache.get("h1", "a.py") == []
+
+    def test_default_cache_path(self, tmp_path: Path) -> None:
+        assert default_cache_path(tmp_path) == tmp_path / ".codebase-graph" / "cache.db"
+
+
+# ── HashStore ──────────────────────────────────────────────────────
+
+
+class TestHashStore:
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        store = HashStore(tmp_path / "hashes.db")
+        entries = {"a.py": ("h1", (10, 20, 30)), "b.py": ("h2", (11, 21, 31))}
+        store.save("sha256", entries)
+        assert store.load("sha256") == entries
+
+    def test_load_filters_by_strategy(self, tmp_path: Path) -> None:
+        store = HashStore(tmp_path / "hashes.db")
+        store.save("sha256", {"a.py": ("h1", (1, 2, 3))})
+        assert store.load("git") == {}
+
+    def test_save_replaces_entries(self, tmp_path: Path) -> None:
+        store = HashStore(tmp_path / "hashes.db")
+        store.save("sha256", {"a.py": ("h1", (1, 2, 3))})
+        store.save("sha256", {"b.py": ("h2", (1, 2, 3))})
+        assert set(store.load("sha256")) == {"b.py"}
+
+    def test_persists_across_instances(self, tmp_path: Path) -> None:
+        path = tmp_path / "hashes.db"
+        store = HashStore(path)
+        store.save("sha256", {"a.py": ("h1", (1, 2, 3))})
+        store.close()
+        assert HashStore(path).load("sha256") == {"a.py": ("h1", (1, 2, 3))}
+
+    def test_corrupt_file_is_recreated(self, tmp_path: Path) -> None:
+        path = tmp_path / "hashes.db"
+        path.write_bytes(b"not a sqlite database" * 100)
+        store = HashStore(path)
+        assert store.enabled
+        assert store.load("sha256") == {}
+
+    def test_default_hash_store_path(self, tmp_path: Path) -> None:
+        assert (
+            default_hash_store_path(tmp_path)
+            == tmp_path / ".codebase-graph" / "hashes.db"
+        )
+
+
+# ── Cache directory ────────────────────────────────────────────────
+
+
+class TestMakeCacheDir:
+    def test_new_dir_ignores_itself(self, tmp_path: Path) -> None:
+        SymbolCache(default_cache_path(tmp_path))
+        HashStore(default_hash_store_path(tmp_path))
+        gitignore = tmp_path / ".codebase-graph" / ".gitignore"
+        assert gitignore.read_text(encoding="utf-8") == "*\n"
+
+    def test_existing_default_dir_gets_gitignore(self, tmp_path: Path) -> None:
+        (tmp_path / ".codebase-graph").mkdir()
+        make_cache_dir(tmp_path / ".codebase-graph")
+        assert (tmp_path / ".codebase-graph" / ".gitignore").exists()
+
+    def test_existing_gitignore_kept(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / ".codebase-graph"
+        cache_dir.mkdir()
+        (cache_dir / ".gitignore").write_text("cache.db\n", encoding="utf-8")
+        make_cache_dir(cache_dir)
+        assert (cache_dir / ".gitignore").read_text(encoding="utf-8") == "cache.db\n"
+
+    def test_existing_custom_dir_left_alone(self, tmp_path: Path) -> None:
+        SymbolCache(tmp_path / "cache.db")
+        assert not (tmp_path / ".gitignore").exists()
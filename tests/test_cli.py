@@ -21,6 +21,8 @@ from unittest.mock import patch
 import pytest
 
 from src.cli import build_parser, main, resolve_project_dir, __version__
+from src.core.git import HASH_STRATEGY_NAMES
+from src.core.watcher import make_hash_strategy
 
 
 # ── Fixtures ───────────────────────────────────────────────────────
@@ -142,6 +144,83 @@ class TestBuildParser:
         assert args.output is None
         assert args.format == "toon"
         assert args.verbose is False
+        assert args.jobs == 1
+        assert args.use_cache is True
+
+    def test_no_cache_flag(self):
+        parser = build_parser()
+        args = parser.parse_args(["./proj", "--no-cache"])
+        assert args.use_cache is False
+
+    def test_stats_flag(self):
+        parser = build_parser()
+        assert parser.parse_args(["./proj"]).stats is False
+        assert parser.parse_args(["./proj", "--stats"]).stats is True
+
+    def test_stable_timestamp_flag(self):
+        parser = build_parser()
+        assert parser.parse_args(["./proj"]).stable_timestamp is False
+        args = parser.parse_args(["./proj", "--stable-timestamp"])
+        assert args.stable_timestamp is True
+
+    def test_debounce_flags(self):
+        parser = build_parser()
+        args = parser.parse_args(["./proj"])
+        assert args.debounce_ms is None
+        assert args.max_latency_ms is None
+        args = parser.parse_args(
+            ["./proj", "--debounce-ms", "250", "--max-latency-ms", "2000"]
+        )
+        assert args.debounce_ms == 250
+        assert args.max_latency_ms == 2000
+
+    def test_no_git_flag(self):
+        parser = build_parser()
+        assert parser.parse_args(["./proj"]).git_aware is True
+        assert parser.parse_args(["./proj", "--no-git"]).git_aware is False
+
+    def test_hash_flag(self):
+        parser = build_parser()
+        assert parser.parse_args(["./proj"]).hash_strategy == "sha256"
+        assert parser.parse_args(["./proj", "--hash", "git"]).hash_strategy == "git"
+        args = parser.parse_args(["./proj", "--hash", "blake2b"])
+        assert args.hash_strategy == "blake2b"
+        with pytest.raises(SystemExit):
+            parser.parse_args(["./proj", "--hash", "md5"])
+
+    def test_hash_choices_match_strategies(self):
+        parser = build_parser()
+        for name in HASH_STRATEGY_NAMES:
+            args = parser.parse_args(["./proj", "--hash", name])
+            assert make_hash_strategy(args.hash_strategy) is not None
+
+    def test_building_parser_skips_heavy_imports(self):
+        """--help and --version shouldn't load Kit or tree-sitter."""
+        code = (
+            "import sys\n"
+            "from src.cli import build_parser\n"
+            "build_parser()\n"
+            "print(sorted(m for m in ('kit', 'tree_sitter', 'src.core.watcher')"
+            " if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=str(Path(__file__).parent.parent),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_jobs_flag(self):
+        parser = build_parser()
+        args = parser.parse_args(["./proj", "--jobs", "4"])
+        assert args.jobs == 4
+
+    def test_jobs_flag_short(self):
+        parser = build_parser()
+        args = parser.parse_args(["./proj", "-j", "0"])
+        assert args.jobs == 0
 
     def test_positional_takes_priority_over_dir(self):
         """When both positional and --dir are given, positional wins."""
@@ -258,6 +337,67 @@ class TestOneshotMode:
         default = project / ".codebase.md"
         assert not default.exists(), "Default .codebase.md should not be created"
 
+    def test_oneshot_parallel_jobs(self, tmp_path):
+        """--jobs should produce the same map as a serial run."""
+        project = _make_project(tmp_path)
+        serial_out = tmp_path / "serial.md"
+        parallel_out = tmp_path / "parallel.md"
+
+        main([str(project), "-o", str(serial_out)])
+        main([str(project), "-o", str(parallel_out), "--jobs", "2"])
+
+        def strip_timestamp(text: str) -> str:
+            return "\n".join(
+                line for line in text.splitlines() if "last_indexed" not in line
+            )
+
+        assert strip_timestamp(parallel_out.read_text()) == strip_timestamp(
+            serial_out.read_text()
+        )
+
+    def test_oneshot_writes_symbol_cache(self, tmp_path):
+        project = _make_project(tmp_path)
+        main([str(project)])
+        assert (project / ".codebase-graph" / "cache.db").exists()
+        assert (project / ".codebase-graph" / "hashes.db").exists()
+        assert (project / ".codebase-graph" / ".gitignore").exists()
+
+    def test_oneshot_prints_stats(self, tmp_path, capsys):
+        project = _make_project(tmp_path)
+        main([str(project), "--no-cache"])
+        assert "String pool" not in capsys.readouterr().out
+
+        main([str(project), "--no-cache", "--stats"])
+        assert "String pool:" in capsys.readouterr().out
+
+    def test_oneshot_no_cache(self, tmp_path):
+        project = _make_project(tmp_path)
+        main([str(project), "--no-cache"])
+        assert not (project / ".codebase-graph").exists()
+
+    def test_oneshot_rerun_skips_unchanged_write(self, tmp_path):
+        project = _make_project(tmp_path)
+        out = project / ".codebase.md"
+        main([str(project), "--stable-timestamp"])
+        first = out.read_text(encoding="utf-8")
+        mtime = out.stat().st_mtime_ns
+
+        main([str(project), "--stable-timestamp"])
+        assert out.read_text(encoding="utf-8") == first
+        assert out.stat().st_mtime_ns == mtime
+
+    def test_negative_jobs_exits(self, tmp_path):
+        project = _make_project(tmp_path)
+        with pytest.raises(SystemExit) as exc_info:
+            main([str(project), "--jobs", "-1"])
+        assert exc_info.value.code == 1
+
+    def test_negative_debounce_exits(self, tmp_path):
+        project = _make_project(tmp_path)
+        with pytest.raises(SystemExit) as exc_info:
+            main([str(project), "--watch", "--debounce-ms", "-5"])
+        assert exc_info.value.code == 1
+
     def test_oneshot_empty_project(self, tmp_path):
         """A project with no parseable files should still produce output."""
         project = tmp_path / "empty-proj"
@@ -408,6 +548,22 @@ class TestWatchModeSetup:
         captured = capsys.readouterr()
         assert "Stopped watching." in captured.out
 
+    def test_watch_passes_coalescing_window(self, tmp_path):
+        project = _make_project(tmp_path)
+        from src.cli import run_watch
+
+        with patch("src.core.watcher.CodebaseWatcher") as MockWatcher:
+            mock_watcher = MockWatcher.return_value
+            mock_watcher.watch.side_effect = KeyboardInterrupt()
+            mock_watcher.stop = lambda: None
+
+            run_watch(project, debounce_ms=0, max_latency_ms=300)
+
+        kwargs = MockWatcher.call_args.kwargs
+        assert kwargs["quiet_ms"] == 0
+        assert kwargs["max_latency_ms"] == 300
+        assert kwargs["git_aware"] is True
+
 
 # ── Verbose logging ────────────────────────────────────────────────
 
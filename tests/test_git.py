@@ -0,0 +1,285 @@
+"""Tests for git HEAD tracking and tree diffs."""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.core.git import (
+    GitHeadTracker,
+    TreeChange,
+    _parse_raw_diff,
+    diff_commits,
+    hash_blob,
+    index_oids,
+    modified_files,
+)
+from src.core.watcher import (
+    CodebaseWatcher,
+    ContentHasher,
+    GitBlobStrategy,
+    IncrementalPipeline,
+)
+
+
+# ── Helpers ────────────────────────────────────────────────────────
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@test.com", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """A repo with a main branch and a feature branch that edits files."""
+    _git(tmp_path, "init", "-q", "-b", "main")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("def a():\n    pass\n")
+    (tmp_path / "src" / "b.py").write_text("def b():\n    pass\n")
+    (tmp_path / "README.md").write_text("# repo\n")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+
+    _git(tmp_path, "checkout", "-q", "-b", "feature")
+    (tmp_path / "src" / "a.py").write_text("def a2():\n    pass\n")
+    (tmp_path / "src" / "b.py").unlink()
+    (tmp_path / "src" / "c.py").write_text("def c():\n    pass\n")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "feature")
+    _git(tmp_path, "checkout", "-q", "main")
+    return tmp_path
+
+
+# ── Raw diff parsing ───────────────────────────────────────────────
+
+
+class TestParseRawDiff:
+    def test_parses_entries(self):
+        out = (
+            ":100644 100644 " + "1" * 40 + " " + "2" * 40 + " M\0src/a.py\0"
+            ":000000 100644 " + "0" * 40 + " " + "3" * 40 + " A\0src/new file.py\0"
+        )
+        assert _parse_raw_diff(out) == [
+            TreeChange("src/a.py", "M", "1" * 40, "2" * 40),
+            TreeChange("src/new file.py", "A", "0" * 40, "3" * 40),
+        ]
+
+    def test_skips_mode_only_changes_and_submodules(self):
+        out = (
+            ":100644 100755 " + "1" * 40 + " " + "1" * 40 + " M\0run.py\0"
+            ":160000 160000 " + "4" * 40 + " " + "5" * 40 + " M\0vendor/lib\0"
+        )
+        assert _parse_raw_diff(out) == []
+
+    def test_empty_output(self):
+        assert _parse_raw_diff("") == []
+
+
+# ── diff_commits ───────────────────────────────────────────────────
+
+
+class TestDiffCommits:
+    def test_lists_changed_files(self, repo: Path):
+        changes = diff_commits(repo, "main", "feature")
+        assert {(c.path, c.status) for c in changes} == {
+            ("src/a.py", "M"),
+            ("src/b.py", "D"),
+            ("src/c.py", "A"),
+        }
+
+    def test_paths_relative_to_subdirectory(self, repo: Path):
+        changes = diff_commits(repo / "src", "main", "feature")
+        assert sorted(c.path for c in changes) == ["a.py", "b.py", "c.py"]
+
+    def test_unknown_commit_returns_none(self, repo: Path):
+        assert diff_commits(repo, "main", "no-such-branch") is None
+
+
+# ── Blob ids ───────────────────────────────────────────────────────
+
+
+class TestBlobIds:
+    def test_hash_blob_matches_git(self, repo: Path):
+        path = repo / "src" / "a.py"
+        assert hash_blob(path) == _git(repo, "hash-object", str(path))
+
+    def test_hash_blob_missing_file(self, tmp_path: Path):
+        assert hash_blob(tmp_path / "missing.py") == ""
+
+    def test_index_oids(self, repo: Path):
+        oids = index_oids(repo)
+        assert set(oids) == {"README.md", "src/a.py", "src/b.py"}
+        assert oids["src/a.py"] == _git(repo, "rev-parse", "main:src/a.py")
+
+    def test_index_oids_relative_to_subdirectory(self, repo: Path):
+        assert set(index_oids(repo / "src")) == {"a.py", "b.py"}
+
+    def test_index_oids_outside_repo(self, tmp_path: Path):
+        assert index_oids(tmp_path) is None
+
+    def test_modified_files(self, repo: Path):
+        assert modified_files(repo) == set()
+        (repo / "src" / "a.py").write_text("def changed():\n    pass\n")
+        assert modified_files(repo) == {"src/a.py"}
+        assert modified_files(repo / "src") == {"a.py"}
+
+
+class TestGitBlobStrategy:
+    def test_clean_files_come_from_index(self, repo: Path):
+        (repo / "src" / "a.py").write_text("def changed():\n    pass\n")
+        (repo / "src" / "new.py").write_text("def new():\n    pass\n")
+        strategy = GitBlobStrategy()
+        hasher = ContentHasher(repo, strategy)
+        hasher.compute_initial(["src/a.py", "src/b.py", "src/new.py"])
+
+        # Only the modified and the untracked file were read
+        assert strategy.reused == 1
+        assert strategy.hashed == 2
+        for rel_path in ("src/a.py", "src/b.py", "src/new.py"):
+            expected = _git(repo, "hash-object", rel_path)
+            assert hasher.get(rel_path) == f"git-blob:{expected}"
+
+    def test_unchanged_file_not_reported(self, repo: Path):
+        hasher = ContentHasher(repo, GitBlobStrategy())
+        hasher.compute_initial(["src/a.py"])
+        assert not hasher.check_and_update("src/a.py")
+
+        (repo / "src" / "a.py").write_text("def changed():\n    pass\n")
+        assert hasher.check_and_update("src/a.py")
+
+    def test_falls_back_outside_repo(self, tmp_path: Path):
+        (tmp_path / "a.py").write_text("x = 1\n")
+        strategy = GitBlobStrategy()
+        hasher = ContentHasher(tmp_path, strategy)
+        hasher.compute_initial(["a.py"])
+        assert hasher.get("a.py") == "git-blob:" + hash_blob(tmp_path / "a.py")
+        assert strategy.reused == 0
+
+
+# ── GitHeadTracker ─────────────────────────────────────────────────
+
+
+class TestGitHeadTracker:
+    def test_reads_head_without_git(self, repo: Path):
+        tracker = GitHeadTracker(repo)
+        assert tracker.enabled
+        assert tracker.head == _git(repo, "rev-parse", "HEAD")
+
+    def test_poll_after_checkout(self, repo: Path):
+        tracker = GitHeadTracker(repo)
+        assert tracker.poll() is None
+
+        _git(repo, "checkout", "-q", "feature")
+        changes = tracker.poll()
+        assert sorted(c.path for c in changes) == ["src/a.py", "src/b.py", "src/c.py"]
+        assert tracker.poll() is None
+
+    def test_sync_absorbs_head_move(self, repo: Path):
+        tracker = GitHeadTracker(repo)
+        _git(repo, "checkout", "-q", "feature")
+        tracker.sync()
+        assert tracker.poll() is None
+
+    def test_detached_head(self, repo: Path):
+        tracker = GitHeadTracker(repo)
+        feature = _git(repo, "rev-parse", "feature")
+        _git(repo, "checkout", "-q", "--detach", "feature")
+        assert tracker.read_head() == feature
+
+    def test_packed_refs(self, repo: Path):
+        _git(repo, "pack-refs", "--all")
+        tracker = GitHeadTracker(repo)
+        assert tracker.head == _git(repo, "rev-parse", "HEAD")
+
+    def test_outside_git_is_disabled(self, tmp_path: Path):
+        tracker = GitHeadTracker(tmp_path)
+        assert not tracker.enabled
+        assert tracker.poll() is None
+
+
+# ── Watcher integration ───────────────────────────────────────────
+
+
+class TestWatcherBranchSwitch:
+    def test_head_move_supplies_changed_set(self, repo: Path):
+        watcher = CodebaseWatcher(repo)
+        watcher._git = GitHeadTracker(repo)
+        watcher.hasher.compute_initial(["src/a.py", "src/b.py"])
+
+        _git(repo, "checkout", "-q", "feature")
+        # Only one of the rewritten files got an event so far
+        changed = watcher._resolve_changes(["src/a.py"])
+
+        assert sorted(changed) == ["src/a.py", "src/b.py", "src/c.py"]
+        assert watcher.hasher.get("src/b.py") is None
+
+    def test_without_head_move_hashes_paths(self, repo: Path):
+        watcher = CodebaseWatcher(repo)
+        watcher._git = GitHeadTracker(repo)
+        watcher.hasher.compute_initial(["src/a.py", "src/b.py"])
+
+        (repo / "src" / "b.py").write_text("def b2():\n    pass\n")
+        assert watcher._resolve_changes(["src/a.py", "src/b.py"]) == ["src/b.py"]
+
+    def test_branch_switch_takes_hashes_from_diff(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        _git(tmp_path, "init", "-q", "-b", "main")
+        for i in range(30):
+            (tmp_path / f"m{i}.py").write_text(f"def f{i}():\n    pass\n")
+        _git(tmp_path, "add", "-A")
+        _git(tmp_path, "commit", "-q", "-m", "init")
+        _git(tmp_path, "checkout", "-q", "-b", "feature")
+        for i in range(30):
+            (tmp_path / f"m{i}.py").write_text(f"def g{i}():\n    pass\n")
+        _git(tmp_path, "commit", "-q", "-am", "feature")
+        _git(tmp_path, "checkout", "-q", "main")
+
+        pipeline = IncrementalPipeline(
+            tmp_path, tmp_path / ".codebase.md", hash_strategy=GitBlobStrategy()
+        )
+        pipeline.full_index()
+        watcher = CodebaseWatcher(tmp_path, hasher=pipeline.hasher)
+        watcher._git = GitHeadTracker(tmp_path)
+
+        _git(tmp_path, "checkout", "-q", "feature")
+        # A local edit on top of the switch must still be read
+        (tmp_path / "m0.py").write_text("def edited():\n    pass\n")
+
+        strategy = pipeline.hasher.strategy
+        hashed: list[Path] = []
+        original = strategy.hash_file
+        monkeypatch.setattr(
+            strategy, "hash_file", lambda path: hashed.append(path) or original(path)
+        )
+        changed = watcher._resolve_changes([])
+        pipeline.update_files(changed, rehash=False)
+
+        assert len(changed) == 30
+        assert hashed == [tmp_path / "m0.py"]
+        for path in changed:
+            assert pipeline.hasher.get(path) == original(tmp_path / path)
+        assert "g29" in (tmp_path / ".codebase.md").read_text()
+
+    def test_soft_reset_hashes_files_the_index_keeps(self, repo: Path):
+        watcher = CodebaseWatcher(repo, hasher=ContentHasher(repo, GitBlobStrategy()))
+        _git(repo, "checkout", "-q", "feature")
+        watcher._git = GitHeadTracker(repo)
+        watcher.hasher.compute_initial(["src/a.py", "src/c.py"])
+
+        # HEAD moves back, but the index and work tree keep feature's files
+        _git(repo, "reset", "-q", "--soft", "main")
+        changed = watcher._resolve_changes([])
+
+        assert sorted(changed) == ["src/a.py", "src/b.py", "src/c.py"]
+        strategy = watcher.hasher.strategy
+        assert watcher.hasher.get("src/a.py") == strategy.hash_file(repo / "src/a.py")
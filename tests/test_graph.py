@@ -1,18 +1,26 @@
 """Tests for module clustering, hierarchy extraction, and cross-module deps."""
 
+import random
 from pathlib import Path
 
 import pytest
 
+from src.core import graph as graph_module
 from src.core.graph import (
     Hierarchy,
+    IncrementalGraph,
     Module,
     ModuleClusterer,
+    ModulePathIndex,
+    TypeResolver,
     detect_cross_module_deps,
+    extract_file_hierarchies,
     extract_hierarchies,
+    scan_file_imports,
     _normalize_posix_path,
 )
-from src.core.parser import Symbol
+from src.core.parser import CodebaseParser, Symbol, SymbolTable
+from tests.bench.clustering import generate_tree, iterative_assign, same_assignment
 
 
 # ── Helpers ────────────────────────────────────────────────────────
@@ -209,6 +217,32 @@ class TestModuleClusterer:
         assert modules[0].path == "backend"
         assert len(modules[0].symbols) == 220
 
+    def test_splits_several_levels_in_one_assignment(self):
+        """An oversized chain of single directories splits down to its files."""
+        clusterer = ModuleClusterer(max_module_symbols=5)
+        path = "lib/a/b/c/deep.py"
+        symbols = {
+            path: [_sym(f"f{i}", file=path) for i in range(6)],
+            "lib/a/top.py": [_sym("top", file="lib/a/top.py")],
+        }
+
+        assignment = clusterer.assign(symbols)
+
+        assert list(assignment) == ["lib/a", "lib/a/b/c"]
+        assert list(assignment["lib/a/b/c"]) == [path]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_assign_matches_iterative_splitting(self, seed):
+        """The single-pass split equals splitting one level per pass."""
+        max_symbols = random.Random(seed).choice((20, 80))
+        clusterer = ModuleClusterer(max_module_symbols=max_symbols)
+        tree = generate_tree(800, depth=4, seed=seed)
+        tree.update({"root.py": [None] * 500, "src/app.py": [None] * 500})
+
+        assert same_assignment(
+            clusterer.assign(tree), iterative_assign(clusterer, tree)
+        )
+
 
 # ── Hierarchy extraction tests ─────────────────────────────────────
 
@@ -465,6 +499,141 @@ class TestExtractHierarchies:
         hierarchies = extract_hierarchies(symbols)
         assert hierarchies == []
 
+    def test_uses_captured_type_refs(self):
+        """Tables from a syntax tree skip the signature regexes."""
+        rows = SymbolTable(
+            [
+                _sym("Order", kind="class", file="shop.py", line=4),
+                _sym("Item", kind="class", file="shop.py", line=9),
+            ]
+        ).rows()
+        table = SymbolTable.from_rows(
+            rows,
+            [
+                (0, "extends", "Base"),
+                (0, "extends", "ABC"),
+                (0, "contains", "Item"),
+                (0, "contains", "Order"),
+                (0, "contains", "str"),
+                (0, "contains", "Unknown"),
+            ],
+        )
+
+        hierarchies = extract_hierarchies({"shop.py": table})
+
+        assert [(h.symbol, h.relationship, h.target, h.line) for h in hierarchies] == [
+            ("shop::Order", "extends", "Base", 4),
+            ("shop::Order", "contains", "Item", 4),
+        ]
+
+    def test_parsed_multiline_class_header(self, tmp_path: Path):
+        """Bases and fields past the first line of a class are found."""
+        (tmp_path / "models.py").write_text(
+            "class Item:\n    pass\n\n"
+            "class Order(\n    Base,\n    Mixin,\n):\n"
+            "    items: list[Item]\n",
+            encoding="utf-8",
+        )
+        symbols = CodebaseParser(tmp_path).parse_directory()
+
+        hierarchies = extract_hierarchies(symbols)
+
+        assert [(h.relationship, h.target) for h in hierarchies] == [
+            ("extends", "Base"),
+            ("extends", "Mixin"),
+            ("contains", "Item"),
+        ]
+
+
+# ── Type resolution tests ─────────────────────────────────────────
+
+
+class TestTypeResolver:
+    def _resolver(self, *files: tuple[str, list[str]]) -> TypeResolver:
+        types = TypeResolver()
+        for path, names in files:
+            types.update(path, [_sym(n, kind="class", file=path) for n in names])
+        return types
+
+    def test_unique_name_resolves_without_imports(self):
+        types = self._resolver(("lib/base.py", ["Base"]))
+
+        def scan(path: str) -> list[str]:
+            raise AssertionError("imports scanned for an unambiguous name")
+
+        assert types.resolve("Base", "app.py", scan) == "lib/base::Base"
+        assert types.resolve("Missing", "app.py", scan) is None
+        assert "Base" in types and "Missing" not in types
+
+    def test_own_file_wins(self):
+        types = self._resolver(("a.py", ["Base"]), ("b.py", ["Base"]))
+        assert types.resolve("Base", "b.py", lambda path: ["a"]) == "b::Base"
+
+    def test_imported_module_wins(self):
+        types = self._resolver(
+            ("src/a/models.py", ["Base"]), ("src/b/models.py", ["Base"])
+        )
+        scan = {"app.py": ["src/b/models"], "pkg.py": ["src/a"], "x.py": []}.get
+        assert types.resolve("Base", "app.py", scan) == "src/b/models::Base"
+        assert types.resolve("Base", "pkg.py", scan) == "src/a/models::Base"
+        assert types.resolve("Base", "x.py", scan) is None
+
+    def test_exact_import_beats_package_import(self):
+        types = self._resolver(
+            ("src/a/models.py", ["Base"]), ("src/a/legacy.py", ["Base"])
+        )
+        imports = ["src/a", "src/a/legacy"]
+        assert types.resolve("Base", "app.py", lambda path: imports) == (
+            "src/a/legacy::Base"
+        )
+
+    def test_qualifier_narrows_candidates(self):
+        types = self._resolver(
+            ("src/models.py", ["Base"]), ("src/views.py", ["Base"])
+        )
+        scan = {"app.py": ["src"]}.get
+        assert types.resolve("models.Base", "app.py", scan) == "src/models::Base"
+        assert types.resolve("Base", "app.py", scan) is None
+        # A unique name still needs the qualifier to match
+        assert types.resolve("dspy.Signature", "app.py", scan) is None
+        path = "src/signature.py"
+        types.update(path, [_sym("Signature", kind="class", file=path)])
+        assert types.resolve("dspy.Signature", "app.py", scan) is None
+
+    def test_update_reports_changed_names(self):
+        types = TypeResolver()
+        path = "lib/m.py"
+        first = [_sym("A", kind="class", file=path), _sym("f", file=path)]
+        assert types.update(path, first) == {"A"}
+        assert types.update(path, first) == set()
+        assert types.update(path, [_sym("B", kind="interface", file=path)]) == {
+            "A",
+            "B",
+        }
+        assert types.definitions("B") == ["lib/m::B"]
+        assert types.update(path, None) == {"B"}
+        assert "B" not in types
+
+    def test_extract_hierarchies_resolves_targets(self):
+        symbols_by_file = {
+            "src/a/base.py": [_sym("Base", kind="class", file="src/a/base.py")],
+            "src/b/base.py": [_sym("Base", kind="class", file="src/b/base.py")],
+            "src/app.py": [
+                _sym("App", kind="class", file="src/app.py",
+                     signature="class App(Base):")
+            ],
+        }
+        imports = {"src/app.py": ["src/b/base"]}
+
+        hierarchies = extract_hierarchies(
+            symbols_by_file, lambda path: imports.get(path, [])
+        )
+
+        assert [(h.target, h.target_fqn) for h in hierarchies] == [
+            ("Base", "src/b/base::Base")
+        ]
+        assert extract_hierarchies(symbols_by_file)[0].target_fqn is None
+
 
 # ── Cross-module dependency detection tests ────────────────────────
 
@@ -557,6 +726,297 @@ class TestCrossModuleDeps:
         mod.depends_on = sorted(mod.depends_on)
         assert mod.depends_on == ["alpha", "zebra"]
 
+    def test_scan_imports_callable_replaces_disk_reads(self):
+        """A scan_imports callable supplies targets without touching disk."""
+        modules = ModuleClusterer().cluster(
+            {
+                "src/auth/models.py": [_sym("User", file="src/auth/models.py")],
+                "src/orders/types.py": [_sym("Order", file="src/orders/types.py")],
+            }
+        )
+        scanned: list[str] = []
+
+        def scan(file_path: str) -> list[str]:
+            scanned.append(file_path)
+            return ["src/auth/models"] if file_path.startswith("src/orders") else []
+
+        detect_cross_module_deps(modules, "/nonexistent", scan_imports=scan)
+
+        orders_mod = next(m for m in modules if m.name == "orders")
+        assert orders_mod.depends_on == ["auth"]
+        assert sorted(scanned) == ["src/auth/models.py", "src/orders/types.py"]
+
+
+class TestModulePathIndex:
+    @staticmethod
+    def _mod(path: str, name: str | None = None) -> Module:
+        return Module(name=name or path.rsplit("/", 1)[-1], path=path)
+
+    def test_resolves_module_prefix(self):
+        index = ModulePathIndex([self._mod("src/auth")])
+        assert index.resolve("src/auth/login") == "auth"
+
+    def test_exact_module_path(self):
+        index = ModulePathIndex([self._mod("src/auth")])
+        assert index.resolve("src/auth") == "auth"
+
+    def test_most_specific_module_wins(self):
+        index = ModulePathIndex(
+            [self._mod("lib"), self._mod("lib/core"), self._mod("lib/core/io")]
+        )
+        assert index.resolve("lib/core/io/reader") == "io"
+        assert index.resolve("lib/core/util") == "core"
+        assert index.resolve("lib/misc") == "lib"
+
+    def test_matches_whole_components_only(self):
+        index = ModulePathIndex([self._mod("src/auth")])
+        assert index.resolve("src/authz/login") is None
+
+    def test_root_module_never_matches(self):
+        index = ModulePathIndex([self._mod(".", name="__root__")])
+        assert index.resolve("main") is None
+
+    def test_unknown_path(self):
+        index = ModulePathIndex([self._mod("src/auth")])
+        assert index.resolve("vendor/thing") is None
+
+    def test_deps_use_most_specific_module(self):
+        """Importing from a split submodule depends on it, not its parent."""
+        modules = [
+            Module(name="lib", path="lib", symbols=[_sym("a", file="lib/a.py")]),
+            Module(
+                name="core",
+                path="lib/core",
+                symbols=[_sym("b", file="lib/core/b.py")],
+            ),
+            Module(name="app", path="app", symbols=[_sym("c", file="app/c.py")]),
+        ]
+
+        detect_cross_module_deps(
+            modules,
+            "/nonexistent",
+            scan_imports=lambda f: ["lib/core/b"] if f == "app/c.py" else [],
+        )
+
+        app_mod = next(m for m in modules if m.name == "app")
+        assert app_mod.depends_on == ["core"]
+
+
+class TestScanFileImports:
+    FIXTURES_ROOT = Path(__file__).parent / "fixtures"
+
+    def test_python_targets_are_slash_paths(self):
+        targets = scan_file_imports(
+            "src/services/auth.py", str(self.FIXTURES_ROOT / "py_project")
+        )
+        assert "src/models/user" in targets
+
+    def test_ts_targets_resolved_from_repo_root(self):
+        targets = scan_file_imports(
+            "src/orders/types.ts", str(self.FIXTURES_ROOT / "ts_project")
+        )
+        assert "src/auth/models" in targets
+
+    def test_missing_file_returns_empty(self):
+        assert scan_file_imports("nope.py", str(self.FIXTURES_ROOT)) == []
+
+
+# ── Incremental graph tests ────────────────────────────────────────
+
+
+class TestIncrementalGraph:
+    """IncrementalGraph must always match clustering from scratch."""
+
+    DIRS = ["src/auth", "src/auth/oauth", "src/auth/oauth/v2", "lib", "lib/io", ""]
+
+    @staticmethod
+    def _imports(file_path: str) -> list[str]:
+        # Deterministic fake import scan: every file imports two other dirs
+        seed = sum(map(ord, file_path))
+        dirs = TestIncrementalGraph.DIRS
+        return [dirs[seed % len(dirs)] or "main", dirs[(seed // 7) % len(dirs)]]
+
+    def _file_symbols(
+        self, rng: random.Random, path: str, captured: bool = False
+    ) -> list[Symbol] | SymbolTable:
+        """Random symbols, as a table with type refs if captured is set."""
+        types = ["User", "Token", "Session", "Client", "Reader"]
+        syms = []
+        type_refs = []
+        for i in range(rng.randint(1, 6)):
+            if rng.random() < 0.3:
+                name = rng.choice(types)
+                base = rng.choice(types)
+                field_type = rng.choice(types)
+                syms.append(
+                    _sym(name, kind="class", file=path, line=i,
+                         signature=f"class {name}({base}): {field_type}")
+                )
+                type_refs.append((i, "extends", base))
+                type_refs.append((i, "contains", field_type))
+            else:
+                syms.append(_sym(f"fn{i}", file=path, line=i))
+        if captured:
+            return SymbolTable.from_rows(SymbolTable(syms).rows(), type_refs)
+        return syms
+
+    def _assert_matches_full_build(
+        self,
+        graph: IncrementalGraph,
+        symbols_by_file: dict[str, list[Symbol]],
+        clusterer: ModuleClusterer,
+    ) -> None:
+        expected = clusterer.cluster(symbols_by_file)
+        detect_cross_module_deps(expected, "", scan_imports=self._imports)
+        assert graph.modules == expected
+        assert graph.hierarchies == extract_hierarchies(symbols_by_file, self._imports)
+
+    @pytest.mark.parametrize("captured", [False, True])
+    def test_random_edits_match_full_rebuild(self, captured):
+        rng = random.Random(1234)
+        clusterer = ModuleClusterer(max_module_symbols=12)
+        paths = [
+            f"{d}/f{i}.py" if d else f"f{i}.py" for d in self.DIRS for i in range(4)
+        ]
+        symbols_by_file = {
+            p: self._file_symbols(rng, p, captured) for p in rng.sample(paths, 10)
+        }
+        graph = IncrementalGraph(clusterer, self._imports)
+        graph.rebuild(symbols_by_file)
+
+        patched = 0
+        for _ in range(300):
+            changed = rng.sample(paths, rng.randint(1, 3))
+            for path in changed:
+                if path in symbols_by_file and rng.random() < 0.4:
+                    del symbols_by_file[path]
+                else:
+                    symbols_by_file[path] = self._file_symbols(rng, path, captured)
+            patched += graph.apply(symbols_by_file, changed)
+            self._assert_matches_full_build(graph, symbols_by_file, clusterer)
+
+        # Most edits are absorbed without re-clustering
+        assert patched > 100
+
+    def test_edit_within_threshold_patches_in_place(self):
+        symbols_by_file = {
+            "src/auth/login.py": [_sym("login", file="src/auth/login.py")],
+            "lib/util.py": [_sym("helper", file="lib/util.py")],
+        }
+        graph = IncrementalGraph(ModuleClusterer(), lambda path: [])
+        graph.rebuild(symbols_by_file)
+        lib_module = graph.modules[0]
+
+        symbols_by_file["src/auth/login.py"] = [
+            _sym("login", file="src/auth/login.py"),
+            _sym("Account", kind="class", file="src/auth/login.py"),
+        ]
+        assert graph.apply(symbols_by_file, ["src/auth/login.py"])
+        assert graph.full_rebuilds == 1
+        assert graph.modules[0] is lib_module
+        assert graph.modules[1].key_types == ["Account"]
+
+    def test_new_type_rematches_only_files_mentioning_it(self, monkeypatch):
+        symbols_by_file = {
+            "lib/order.py": [
+                _sym("Order", kind="class", file="lib/order.py",
+                     signature="class Order: item: Item")
+            ],
+            "lib/user.py": [
+                _sym("User", kind="class", file="lib/user.py",
+                     signature="class User: name: str")
+            ],
+        }
+        graph = IncrementalGraph(ModuleClusterer(), lambda path: [])
+        graph.rebuild(symbols_by_file)
+        assert graph.hierarchies == []
+
+        matched: list[Symbol] = []
+        monkeypatch.setattr(
+            graph_module,
+            "extract_file_hierarchies",
+            lambda symbols, known: matched.extend(symbols)
+            or extract_file_hierarchies(symbols, known),
+        )
+        symbols_by_file["lib/item.py"] = [
+            _sym("Item", kind="class", file="lib/item.py", signature="class Item:")
+        ]
+        assert graph.apply(symbols_by_file, ["lib/item.py"])
+
+        assert {s.file for s in matched} == {"lib/item.py", "lib/order.py"}
+        assert [(h.symbol, h.target) for h in graph.hierarchies] == [
+            ("lib/order::Order", "Item")
+        ]
+
+    def test_new_definition_reresolves_only_files_targeting_it(self, monkeypatch):
+        symbols_by_file = {
+            "lib/base.py": [_sym("Base", kind="class", file="lib/base.py")],
+            "lib/app.py": [
+                _sym("App", kind="class", file="lib/app.py",
+                     signature="class App(Base):")
+            ],
+            "lib/other.py": [
+                _sym("Other", kind="class", file="lib/other.py",
+                     signature="class Other(Mixin):")
+            ],
+        }
+        imports = {"lib/app.py": ["lib/base"]}
+        graph = IncrementalGraph(ModuleClusterer(), lambda p: imports.get(p, []))
+        graph.rebuild(symbols_by_file)
+        assert [h.target_fqn for h in graph.hierarchies] == ["lib/base::Base", None]
+
+        matched: list[Symbol] = []
+        monkeypatch.setattr(
+            graph_module,
+            "extract_file_hierarchies",
+            lambda symbols, known: matched.extend(symbols)
+            or extract_file_hierarchies(symbols, known),
+        )
+        # A second Base: App still resolves through its import
+        symbols_by_file["src/base.py"] = [
+            _sym("Base", kind="class", file="src/base.py")
+        ]
+        assert graph.apply(symbols_by_file, ["src/base.py"])
+        assert {s.file for s in matched} == {"src/base.py", "lib/app.py"}
+        assert [h.target_fqn for h in graph.hierarchies] == ["lib/base::Base", None]
+
+        # Without the import it's ambiguous
+        imports["lib/app.py"] = []
+        assert graph.apply(symbols_by_file, ["lib/app.py"])
+        assert [h.target_fqn for h in graph.hierarchies] == [None, None]
+
+        # Removing one definition makes the other unique again
+        del symbols_by_file["lib/base.py"]
+        assert graph.apply(symbols_by_file, ["lib/base.py"])
+        assert [h.target_fqn for h in graph.hierarchies] == ["src/base::Base", None]
+
+    def test_crossing_split_threshold_rebuilds(self):
+        clusterer = ModuleClusterer(max_module_symbols=2)
+        symbols_by_file = {
+            "lib/a/x.py": [_sym("x", file="lib/a/x.py")],
+            "lib/b/y.py": [_sym("y", file="lib/b/y.py")],
+        }
+        graph = IncrementalGraph(clusterer, lambda path: [])
+        graph.rebuild(symbols_by_file)
+        assert [m.path for m in graph.modules] == ["lib"]
+
+        symbols_by_file["lib/b/z.py"] = [_sym("z", file="lib/b/z.py")]
+        assert not graph.apply(symbols_by_file, ["lib/b/z.py"])
+        assert [m.path for m in graph.modules] == ["lib/a", "lib/b"]
+
+    def test_dependencies_follow_changed_imports(self):
+        imports = {"lib/util.py": [], "src/auth/login.py": []}
+        symbols_by_file = {
+            path: [_sym("f", file=path)] for path in imports
+        }
+        graph = IncrementalGraph(ModuleClusterer(), lambda path: imports[path])
+        graph.rebuild(symbols_by_file)
+        assert graph.modules[1].depends_on == []
+
+        imports["src/auth/login.py"] = ["lib/util"]
+        assert graph.apply(symbols_by_file, ["src/auth/login.py"])
+        assert graph.modules[1].depends_on == ["lib"]
+
 
 # ── normalize_posix_path tests ─────────────────────────────────────
 
@@ -0,0 +1,88 @@
+"""Tests for low-level file content hashing."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from src.core import hashing
+from src.core.hashing import (
+    BLAKE2B,
+    SHA256,
+    get_algorithm,
+    update_from_file,
+)
+
+
+def _digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        update_from_file(h, f, path.stat().st_size)
+    return h.hexdigest()
+
+
+class TestUpdateFromFile:
+    def test_small_file(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_bytes(b"x = 1\n")
+        assert _digest(f) == hashlib.sha256(b"x = 1\n").hexdigest()
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        f = tmp_path / "empty.py"
+        f.write_bytes(b"")
+        assert _digest(f) == hashlib.sha256(b"").hexdigest()
+
+    def test_large_file_is_mapped(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(hashing, "MMAP_THRESHOLD", 1024)
+        data = bytes(range(256)) * 64
+        f = tmp_path / "big.bin"
+        f.write_bytes(data)
+        assert _digest(f) == hashlib.sha256(data).hexdigest()
+
+    def test_unmappable_file_falls_back_to_reads(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(*args, **kwargs):
+            raise OSError("cannot map")
+
+        monkeypatch.setattr(hashing, "MMAP_THRESHOLD", 1024)
+        monkeypatch.setattr(hashing.mmap, "mmap", fail)
+        data = b"y" * 4096
+        f = tmp_path / "big.bin"
+        f.write_bytes(data)
+        assert _digest(f) == hashlib.sha256(data).hexdigest()
+
+
+class TestAlgorithms:
+    def test_sha256_digest_is_tagged(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_bytes(b"hello")
+        assert SHA256.digest_file(f) == "sha256:" + hashlib.sha256(b"hello").hexdigest()
+
+    def test_blake2b_digest(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_bytes(b"hello")
+        expected = hashlib.blake2b(b"hello", digest_size=16).hexdigest()
+        assert BLAKE2B.digest_file(f) == f"blake2b-128:{expected}"
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        assert SHA256.digest_file(tmp_path / "missing.py") == ""
+        assert SHA256.hex_file(tmp_path / "missing.py") == ""
+
+    def test_get_algorithm(self) -> None:
+        assert get_algorithm("sha256") is SHA256
+        assert get_algorithm("blake2b") is BLAKE2B
+
+    def test_xxh3_without_xxhash_falls_back(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(hashing, "XXH3", None)
+        assert get_algorithm("xxh3") is BLAKE2B
+
+    def test_unknown_algorithm(self) -> None:
+        with pytest.raises(ValueError, match="md5"):
+            get_algorithm("md5")
@@ -1,10 +1,22 @@
 """Smoke tests for CodebaseParser wrapping Kit."""
 
+import pickle
 from pathlib import Path
 
 import pytest
 
-from src.core.parser import CodebaseParser, Symbol, _normalize_kind, _make_fqn
+from src.core import parser as parser_module
+from src.core.parser import (
+    CodebaseParser,
+    Symbol,
+    SymbolTable,
+    _chunk,
+    _make_fqn,
+    _normalize_kind,
+    filter_kinds,
+    resolve_jobs,
+)
+from src.core.strings import STRINGS
 
 
 # The repo root is the project root (where pyproject.toml lives)
@@ -55,6 +67,118 @@ class TestMakeFqn:
         assert _make_fqn("a/b/c/d.tsx", "Foo") == "a/b/c/d::Foo"
 
 
+def _sym(name: str, kind: str = "fn", file: str = "src/app/main.py") -> Symbol:
+    """Shorthand to create a Symbol with a consistent fqn."""
+    return Symbol(
+        name=name,
+        kind=kind,
+        file=file,
+        line=3,
+        end_line=8,
+        signature=f"def {name}():",
+        fqn=_make_fqn(file, name),
+    )
+
+
+class TestSymbolTable:
+    def test_round_trips_symbols(self):
+        symbols = [_sym("a"), _sym("B", kind="class"), _sym("c", file="lib/x.ts")]
+        table = SymbolTable(symbols)
+        assert list(table) == symbols
+        assert len(table) == 3
+        assert table == symbols
+
+    def test_indexing(self):
+        symbols = [_sym("a"), _sym("b", file="lib/x.ts"), _sym("c")]
+        table = SymbolTable(symbols)
+        assert table[1] == symbols[1]
+        assert table[-1] == symbols[2]
+        assert table[1:] == symbols[1:]
+        with pytest.raises(IndexError):
+            table[3]
+
+    def test_file_stored_once_per_run(self):
+        table = SymbolTable(
+            [_sym("a"), _sym("b"), _sym("c", file="lib/x.ts"), _sym("d")]
+        )
+        assert table.files == ["src/app/main.py", "lib/x.ts", "src/app/main.py"]
+
+    def test_concat_matches_chained_symbols(self):
+        first = [_sym("a"), _sym("b")]
+        second = [_sym("c", file="lib/x.ts")]
+        table = SymbolTable.concat([SymbolTable(first), second, SymbolTable()])
+        assert table == first + second
+        assert table == SymbolTable(first + second)
+        assert table.files == ["src/app/main.py", "lib/x.ts"]
+
+    def test_concat_merges_runs_of_same_file(self):
+        table = SymbolTable.concat([SymbolTable([_sym("a")]), [_sym("b")]])
+        assert table.files == ["src/app/main.py"]
+
+    def test_unknown_kind_preserved(self):
+        table = SymbolTable([_sym("a", kind="some_new_thing")])
+        assert table[0].kind == "some_new_thing"
+
+    def test_rows_and_of_kinds(self):
+        symbols = [_sym("a"), _sym("B", kind="class"), _sym("I", kind="interface")]
+        table = SymbolTable(symbols)
+        assert list(table.rows())[1] == (
+            "B", "class", "src/app/main.py", 3, 8, "def B():"
+        )
+        assert list(table.of_kinds({"class", "interface"})) == symbols[1:]
+        assert list(filter_kinds(symbols, {"class"})) == [symbols[1]]
+
+    def test_pickle_round_trip(self):
+        table = SymbolTable([_sym("a"), _sym("b", kind="some_other_kind")])
+        assert pickle.loads(pickle.dumps(table)) == table
+
+        with_refs = SymbolTable.from_rows(table.rows(), [(1, "extends", "Base")])
+        copy = pickle.loads(pickle.dumps(with_refs))
+        assert copy == with_refs
+        assert copy.type_refs == ((1, "extends", "Base"),)
+        assert copy != table
+
+        with_calls = SymbolTable.from_rows(table.rows(), calls=[(0, "b")])
+        assert pickle.loads(pickle.dumps(with_calls)).calls == ((0, "b"),)
+
+    def test_concat_offsets_type_refs(self):
+        first = SymbolTable.from_rows(
+            SymbolTable([_sym("A"), _sym("B")]).rows(), [(1, "extends", "A")]
+        )
+        second = SymbolTable.from_rows(
+            SymbolTable([_sym("C")]).rows(), [(0, "contains", "B")]
+        )
+        table = SymbolTable.concat([first, SymbolTable(), second])
+        assert table.type_refs == ((1, "extends", "A"), (2, "contains", "B"))
+        assert SymbolTable.concat([first, [_sym("D")]]).type_refs is None
+
+    def test_concat_offsets_calls(self):
+        first = SymbolTable.from_rows(
+            SymbolTable([_sym("A"), _sym("B")]).rows(), calls=[(1, "A")]
+        )
+        second = SymbolTable.from_rows(SymbolTable([_sym("C")]).rows(), calls=[])
+        table = SymbolTable.concat([first, second, first])
+        assert table.calls == ((1, "A"), (4, "A"))
+        assert SymbolTable.concat([first, [_sym("D")]]).calls is None
+
+    def test_only_paths_go_into_the_shared_pool(self):
+        table = SymbolTable.from_rows(
+            SymbolTable([_sym("pool_probe_fn", file="pool/probe.py")]).rows(),
+            [(0, "extends", "PoolProbeBase")],
+            calls=[(0, "pool_probe_callee")],
+        )
+        assert table.files == ["pool/probe.py"]
+        assert "pool/probe.py" in STRINGS
+        for name in ("pool_probe_fn", "PoolProbeBase", "pool_probe_callee"):
+            assert name not in STRINGS
+
+    def test_not_equal_to_different_symbols(self):
+        table = SymbolTable([_sym("a")])
+        assert table != SymbolTable([_sym("b")])
+        assert table != [_sym("a"), _sym("b")]
+        assert SymbolTable() == []
+
+
 # ── TypeScript fixture tests ───────────────────────────────────────
 
 
@@ -148,6 +272,130 @@ class TestParsePython:
         assert fn_symbols[0].kind == "fn"
 
 
+# ── Declaration extraction tests ──────────────────────────────────
+
+
+class TestDeclarationExtraction:
+    @pytest.mark.parametrize(
+        "file_path",
+        [
+            "tests/fixtures/sample.py",
+            "tests/fixtures/sample.ts",
+            "tests/fixtures/ts_project/src/auth/models.ts",
+            "src/core/parser.py",
+        ],
+    )
+    def test_matches_kit_extraction(self, parser: CodebaseParser, file_path: str):
+        # Kit's path captures no type references, so compare the symbols
+        kit_symbols = parser._parse_file_with_kit(file_path)
+        assert list(parser.parse_file(file_path)) == list(kit_symbols)
+        assert kit_symbols.type_refs is None
+
+    def test_signature_is_first_line_only(self, tmp_path: Path):
+        (tmp_path / "mod.py").write_text(
+            "class Config(\n    Base,\n):\n    name: str\n\n"
+            "def run(\n    x: int,\n) -> int:\n    return x\n",
+            encoding="utf-8",
+        )
+        symbols = CodebaseParser(tmp_path).parse_file("mod.py")
+        signatures = {s.name: s.signature for s in symbols}
+        assert signatures == {"Config": "class Config(", "run": "def run("}
+        assert [(s.line, s.end_line) for s in symbols] == [(0, 3), (5, 8)]
+
+    def test_captures_python_type_refs(self, tmp_path: Path):
+        (tmp_path / "mod.py").write_text(
+            "class Order(\n    Base[T],\n    mixins.Audited,\n    metaclass=Meta,\n):\n"
+            "    items: list[\n        OrderItem\n    ]\n"
+            "    owner: Optional['User'] = None\n\n"
+            "    def total(self) -> Money:\n        amount: Decimal = 0\n",
+            encoding="utf-8",
+        )
+        table = CodebaseParser(tmp_path).parse_file("mod.py")
+        assert table.type_refs == (
+            (0, "extends", "Base"),
+            (0, "extends", "mixins.Audited"),
+            (0, "contains", "list"),
+            (0, "contains", "OrderItem"),
+            (0, "contains", "Optional"),
+            (0, "contains", "User"),
+        )
+
+    def test_captures_typescript_type_refs(self, tmp_path: Path):
+        (tmp_path / "mod.ts").write_text(
+            "export class Service<T>\n  extends Base<T>\n"
+            "  implements Runnable, ns.Closeable<T> {\n"
+            "  repo: Repo<User>;\n  run(x: Arg): Result { return x; }\n}\n"
+            "interface Config { db: DbConfig; nested: { retry: Retry } }\n"
+            "type Row = { id: Id };\n"
+            "function helper(): void { let local: Local; }\n",
+            encoding="utf-8",
+        )
+        table = CodebaseParser(tmp_path).parse_file("mod.ts")
+        refs = [(table[i].name, rel, target) for i, rel, target in table.type_refs]
+        assert refs == [
+            ("Service", "extends", "Base"),
+            ("Service", "implements", "Runnable"),
+            ("Service", "implements", "ns.Closeable"),
+            ("Service", "contains", "Repo"),
+            ("Service", "contains", "User"),
+            ("Config", "contains", "DbConfig"),
+            ("Config", "contains", "Retry"),
+            ("Row", "contains", "Id"),
+        ]
+
+    def test_captures_python_calls(self, tmp_path: Path):
+        (tmp_path / "mod.py").write_text(
+            "import os\n\nsetup()\n\n"
+            "class Service(Base):\n"
+            "    def run(self):\n"
+            "        def inner():\n            return helper(1)\n"
+            "        self.log(os.path.join('a'))\n        helper(2)\n"
+            "        self.repo.save({}.get('k'))\n"
+            "        return Result(inner(), cls.build())\n\n"
+            "def helper(x):\n    return str(x)\n",
+            encoding="utf-8",
+        )
+        table = CodebaseParser(tmp_path).parse_file("mod.py")
+        calls = [(table[row].name, name) for row, name in table.calls]
+        # Nested functions aren't symbols: their calls belong to run().
+        # Calls on other objects (os.path.join, self.repo.save, {}.get)
+        # aren't recorded.
+        assert calls == [
+            ("run", "helper"),
+            ("run", "self.log"),
+            ("run", "Result"),
+            ("run", "inner"),
+            ("run", "self.build"),
+            ("helper", "str"),
+        ]
+
+    def test_captures_typescript_calls(self, tmp_path: Path):
+        (tmp_path / "mod.ts").write_text(
+            "export class Service {\n"
+            "  run(): Result {\n    this.repo.save(build());\n"
+            "    this.log(items.map(String));\n"
+            "    return new Result(build());\n  }\n}\n"
+            "function build(): Item { return makeItem(); }\n",
+            encoding="utf-8",
+        )
+        table = CodebaseParser(tmp_path).parse_file("mod.ts")
+        calls = [(table[row].name, name) for row, name in table.calls]
+        assert calls == [
+            ("run", "build"),
+            ("run", "self.log"),
+            ("run", "Result"),
+            ("build", "makeItem"),
+        ]
+
+    def test_falls_back_to_kit_without_query_cursor(
+        self, parser: CodebaseParser, monkeypatch: pytest.MonkeyPatch
+    ):
+        fallback = SymbolTable([_sym("from_kit")])
+        monkeypatch.setattr(parser, "_parse_file_with_kit", lambda path: fallback)
+        monkeypatch.delattr(parser_module.tree_sitter, "QueryCursor")
+        assert parser.parse_file("tests/fixtures/sample.py") is fallback
+
+
 # ── Directory parsing tests ───────────────────────────────────────
 
 
@@ -172,6 +420,69 @@ class TestParseDirectory:
             )
 
 
+class TestParallelParse:
+    def test_parallel_matches_serial(self, parser: CodebaseParser):
+        serial = parser.parse_directory(subpath="tests/fixtures")
+        parallel = CodebaseParser(REPO_ROOT, jobs=2).parse_directory(
+            subpath="tests/fixtures"
+        )
+        assert parallel == serial
+        assert list(parallel) == list(serial), "File order should be deterministic"
+
+    def test_parse_files_preserves_input_order(self):
+        files = [
+            "tests/fixtures/sample.ts",
+            "tests/fixtures/sample.py",
+            "tests/fixtures/ts_project/src/auth/models.ts",
+        ]
+        result = CodebaseParser(REPO_ROOT, jobs=2).parse_files(files)
+        assert list(result) == files
+
+    def test_iter_parse_files_yields_every_file_in_order(self):
+        files = [
+            "tests/fixtures/sample.ts",
+            "tests/fixtures/sample.py",
+            "tests/fixtures/ts_project/src/auth/models.ts",
+            "README.md",
+        ]
+        for jobs in (1, 2):
+            parser = CodebaseParser(REPO_ROOT, jobs=jobs)
+            streamed = list(parser.iter_parse_files(files))
+            assert [path for path, _ in streamed] == files
+            assert streamed[-1] == ("README.md", [])
+
+    def test_iter_parse_directory_matches_parse_directory(
+        self, parser: CodebaseParser
+    ):
+        streamed = parser.iter_parse_directory(subpath="tests/fixtures")
+        assert {path: syms for path, syms in streamed if syms} == (
+            parser.parse_directory(subpath="tests/fixtures")
+        )
+
+    def test_iter_parse_files_stops_early(self):
+        files = CodebaseParser(REPO_ROOT).list_files(subpath="tests/fixtures")
+        stream = CodebaseParser(REPO_ROOT, jobs=2).iter_parse_files(files)
+        first_path, _ = next(stream)
+        stream.close()  # cancels the remaining batches without hanging
+        assert first_path == files[0]
+
+    def test_list_files_only_supported(self, parser: CodebaseParser):
+        files = parser.list_files(subpath="tests/fixtures")
+        assert "tests/fixtures/sample.py" in files
+        assert all(Path(f).suffix in {".ts", ".tsx", ".py"} for f in files)
+
+    def test_chunk_preserves_order_and_covers_all(self):
+        items = [f"f{i}.py" for i in range(1000)]
+        chunks = _chunk(items, workers=4)
+        assert [item for chunk in chunks for item in chunk] == items
+        assert max(len(chunk) for chunk in chunks) <= 64
+
+    def test_resolve_jobs(self):
+        assert resolve_jobs(3) == 3
+        assert resolve_jobs(0) >= 1
+        assert resolve_jobs(None) >= 1
+
+
 # ── Edge case tests ───────────────────────────────────────────────
 
 
@@ -0,0 +1,233 @@
+"""Tests for the symbol-level call graph."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from src.core.parser import CodebaseParser, Symbol, SymbolTable
+from src.core.references import CallEdge, ReferenceGraph
+
+
+# ── Helpers ────────────────────────────────────────────────────────
+
+
+def _table(
+    file: str,
+    names: list[str],
+    calls: list[tuple[int, str]] = (),
+    kind: str = "fn",
+) -> SymbolTable:
+    """A parsed-looking table: one symbol per name, plus the calls by row."""
+    rows = SymbolTable(
+        [
+            Symbol(
+                name=name,
+                kind=kind,
+                file=file,
+                line=i * 10,
+                end_line=i * 10 + 5,
+                signature=f"def {name}():",
+                fqn=f"{file.rsplit('.', 1)[0]}::{name}",
+            )
+            for i, name in enumerate(names)
+        ]
+    ).rows()
+    return SymbolTable.from_rows(rows, calls=list(calls))
+
+
+# ── ReferenceGraph ─────────────────────────────────────────────────
+
+
+class TestReferenceGraph:
+    def test_resolves_unique_definition(self):
+        graph = ReferenceGraph()
+        graph.rebuild(
+            {
+                "app.py": _table("app.py", ["main"], [(0, "login"), (0, "print")]),
+                "auth.py": _table("auth.py", ["login"]),
+            }
+        )
+        assert graph.edges() == {CallEdge("app::main", "auth::login")}
+        assert graph.callers("auth::login") == ["app::main"]
+        assert graph.callers("app::main") == []
+        assert graph.callers("missing::name") == []
+        assert len(graph) == 1
+
+    def test_local_definition_wins(self):
+        graph = ReferenceGraph()
+        graph.rebuild(
+            {
+                "a.py": _table("a.py", ["run", "helper"], [(0, "helper")]),
+                "b.py": _table("b.py", ["helper"]),
+            }
+        )
+        assert graph.edges() == {CallEdge("a::run", "a::helper")}
+
+    def test_ambiguous_name_stays_unresolved(self):
+        graph = ReferenceGraph()
+        graph.rebuild(
+            {
+                "app.py": _table("app.py", ["main"], [(0, "helper")]),
+                "a.py": _table("a.py", ["helper"]),
+                "b.py": _table("b.py", ["helper"]),
+            }
+        )
+        assert graph.edges() == set()
+
+    def test_ignores_self_calls_and_non_callables(self):
+        graph = ReferenceGraph()
+        graph.rebuild(
+            {
+                "app.py": _table("app.py", ["main"], [(0, "main"), (0, "VERSION")]),
+                "consts.py": _table("consts.py", ["VERSION"], kind="variable"),
+            }
+        )
+        assert graph.edges() == set()
+
+    def test_tables_without_calls_define_but_do_not_call(self):
+        plain = SymbolTable(list(_table("auth.py", ["login"])))
+        assert plain.calls is None
+        graph = ReferenceGraph()
+        graph.rebuild(
+            {
+                "app.py": _table("app.py", ["main"], [(0, "login")]),
+                "auth.py": plain,
+            }
+        )
+        assert graph.edges() == {CallEdge("app::main", "auth::login")}
+
+    def test_new_definition_makes_calls_ambiguous(self):
+        symbols_by_file = {
+            "app.py": _table("app.py", ["main"], [(0, "helper")]),
+            "a.py": _table("a.py", ["helper"]),
+        }
+        graph = ReferenceGraph()
+        graph.rebuild(symbols_by_file)
+        assert len(graph) == 1
+
+        symbols_by_file["b.py"] = _table("b.py", ["helper"])
+        graph.apply(symbols_by_file, ["b.py"])
+        assert graph.edges() == set()
+
+        del symbols_by_file["a.py"]
+        graph.apply(symbols_by_file, ["a.py"])
+        assert graph.edges() == {CallEdge("app::main", "b::helper")}
+
+    def test_removing_file_drops_its_edges(self):
+        symbols_by_file = {
+            "app.py": _table("app.py", ["main"], [(0, "login")]),
+            "cli.py": _table("cli.py", ["run"], [(0, "login")]),
+            "auth.py": _table("auth.py", ["login"]),
+        }
+        graph = ReferenceGraph()
+        graph.rebuild(symbols_by_file)
+        assert graph.callers("auth::login") == ["app::main", "cli::run"]
+
+        del symbols_by_file["cli.py"]
+        graph.apply(symbols_by_file, ["cli.py"])
+        assert graph.callers("auth::login") == ["app::main"]
+        assert len(graph) == 1
+
+    def test_top_edges_ranks_by_caller_count(self):
+        graph = ReferenceGraph()
+        graph.rebuild(
+            {
+                "app.py": _table(
+                    "app.py",
+                    ["main", "setup", "teardown"],
+                    [(0, "load"), (0, "save"), (1, "save"), (2, "save")],
+                ),
+                "db.py": _table("db.py", ["load", "save"]),
+            }
+        )
+        assert graph.top_edges(10) == [
+            CallEdge("app::main", "db::save"),
+            CallEdge("app::setup", "db::save"),
+            CallEdge("app::teardown", "db::save"),
+            CallEdge("app::main", "db::load"),
+        ]
+        assert graph.top_edges(2) == graph.top_edges(10)[:2]
+        assert graph.top_edges(0) == []
+
+    def _parsed_graph(self, root: Path, files: dict[str, str]) -> ReferenceGraph:
+        for path, source in files.items():
+            (root / path).write_text(source, encoding="utf-8")
+        parser = CodebaseParser(root)
+        graph = ReferenceGraph()
+        graph.rebuild({path: parser.parse_file(path) for path in files})
+        return graph
+
+    def test_calls_on_other_objects_are_not_resolved(self, tmp_path: Path):
+        graph = self._parsed_graph(
+            tmp_path,
+            {
+                "watcher.py": "class Coalescer:\n"
+                "    def add(self, path):\n        pass\n\n"
+                "    def get(self, path):\n        pass\n",
+                "cache.py": "class Cache:\n"
+                "    def close(self):\n        pass\n\n"
+                "    def _disable(self, conn):\n        conn.close()\n",
+                "graph.py": "def rebuild(paths):\n"
+                "    seen = set()\n    seen.add(paths)\n"
+                "    return {}.get('k')\n",
+            },
+        )
+        assert graph.edges() == set()
+
+    def test_plain_calls_do_not_resolve_to_methods(self, tmp_path: Path):
+        graph = self._parsed_graph(
+            tmp_path,
+            {
+                "store.py": "class Store:\n    def get(self):\n        pass\n",
+                "app.py": "def main():\n    return get()\n",
+            },
+        )
+        assert graph.edges() == set()
+
+    def test_self_calls_resolve_within_the_class(self, tmp_path: Path):
+        graph = self._parsed_graph(
+            tmp_path,
+            {
+                "service.py": "class Service:\n"
+                "    def run(self):\n        return self.load()\n\n"
+                "    def load(self):\n        return self.missing()\n\n"
+                "class Client:\n"
+                "    def fetch(self):\n        return self.run()\n",
+                "other.py": "class Other:\n    def missing(self):\n        pass\n",
+            },
+        )
+        assert graph.edges() == {CallEdge("service::run", "service::load")}
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_random_edits_match_full_rebuild(self, seed):
+        rng = random.Random(seed)
+        names = [f"f{i}" for i in range(12)]
+        paths = [f"pkg/m{i}.py" for i in range(8)]
+
+        def random_table(path: str) -> SymbolTable:
+            defined = rng.sample(names, rng.randint(0, 4))
+            calls = [
+                (rng.randrange(len(defined)), rng.choice(names))
+                for _ in range(rng.randint(0, 8) if defined else 0)
+            ]
+            return _table(path, defined, calls)
+
+        symbols_by_file = {path: random_table(path) for path in paths[:5]}
+        graph = ReferenceGraph()
+        graph.rebuild(symbols_by_file)
+
+        for _ in range(200):
+            changed = rng.sample(paths, rng.randint(1, 3))
+            for path in changed:
+                if path in symbols_by_file and rng.random() < 0.3:
+                    del symbols_by_file[path]
+                else:
+                    symbols_by_file[path] = random_table(path)
+            graph.apply(symbols_by_file, changed)
+
+            expected = ReferenceGraph()
+            expected.rebuild(symbols_by_file)
+            assert graph.edges() == expected.edges()
+            assert len(graph) == len(expected)
+            assert graph.top_edges(5) == expected.top_edges(5)
@@ -0,0 +1,44 @@
+"""Tests for the shared string interning pool."""
+
+from __future__ import annotations
+
+import sys
+
+from src.core.strings import StringPool
+
+
+def _copy(value: str) -> str:
+    """An equal string that is a distinct object."""
+    return "".join(list(value))
+
+
+class TestStringPool:
+    def test_equal_strings_share_one_object(self):
+        pool = StringPool()
+        first = pool.intern(_copy("src/app/main.py"))
+        second = pool.intern(_copy("src/app/main.py"))
+        assert first is second
+        assert len(pool) == 1
+        assert "src/app/main.py" in pool
+
+    def test_counts_replaced_copies(self):
+        pool = StringPool()
+        value = _copy("src/app/main.py")
+        pool.intern(value)
+        pool.intern(value)  # same object: nothing to save
+        duplicate = _copy(value)
+        pool.intern(duplicate)
+
+        stats = pool.stats()
+        assert stats.strings == 1
+        assert stats.lookups == 3
+        assert stats.shared == 1
+        assert stats.bytes_saved == sys.getsizeof(duplicate)
+        assert stats.pooled_bytes == sys.getsizeof(value)
+
+    def test_distinct_strings_kept_apart(self):
+        pool = StringPool()
+        assert pool.intern("a") == "a"
+        assert pool.intern("b") == "b"
+        assert len(pool) == 2
+        assert pool.stats().shared == 0
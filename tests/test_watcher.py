@@ -3,21 +3,32 @@
 from __future__ import annotations
 
 import os
+import random
+import subprocess
 import time
 from pathlib import Path
 
+import pathspec
 import pytest
+import watchfiles
 
+from src.core import watcher as watcher_module
+from src.core.cache import HashStore, SymbolCache
+from src.core.git import HASH_STRATEGY_NAMES, hash_blob
 from src.core.parser import Symbol
 from src.core.watcher import (
     HARDCODED_IGNORES,
+    ChangeCoalescer,
     CodebaseWatcher,
     ContentHasher,
     FileFilter,
+    HashStrategy,
     IncrementalPipeline,
     PipelineState,
     _hash_file,
+    make_hash_strategy,
 )
+from src.core.writer import split_last_indexed
 
 
 # ── Helpers ────────────────────────────────────────────────────────
@@ -42,6 +53,12 @@ def _sym(
     )
 
 
+def _without_last_indexed(content: str) -> tuple[str, str]:
+    """Output with its `last_indexed` timestamp cut out, for comparisons."""
+    before, _, after = split_last_indexed(content)
+    return before, after
+
+
 def _make_gitignore(tmp_path: Path, lines: list[str]) -> None:
     """Write a .gitignore file in the given directory."""
     (tmp_path / ".gitignore").write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -241,6 +258,321 @@ class TestFileFilterEdgeCases:
         assert filt.should_include("config.env")
 
 
+def _reference_include(root: Path, rel_path: str) -> bool:
+    """FileFilter's decision computed directly with pathspec, no caching."""
+    if any(part in HARDCODED_IGNORES for part in rel_path.split("/")):
+        return False
+    for name in (".gitignore", ".codebasegraphignore"):
+        ignore_file = root / name
+        if ignore_file.is_file():
+            spec = pathspec.PathSpec.from_lines(
+                "gitignore", ignore_file.read_text().splitlines()
+            )
+            if spec.match_file(rel_path):
+                return False
+    return True
+
+
+def _git_include(root: Path, rel_paths: list[str]) -> dict[str, bool]:
+    """git's own decision for each path (`git check-ignore`), plus hardcoded ignores.
+
+    The paths don't need to exist; every component but the last is treated
+    as a directory, as FileFilter does.
+    """
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    result = subprocess.run(
+        ["git", "check-ignore", "--no-index", "--stdin", "-z"],
+        cwd=root,
+        input="\0".join(rel_paths),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode in (0, 1), result.stderr
+    ignored = set(result.stdout.split("\0"))
+    return {
+        rel_path: rel_path not in ignored
+        and not any(part in HARDCODED_IGNORES for part in rel_path.split("/"))
+        for rel_path in rel_paths
+    }
+
+
+class TestFileFilterCompiled:
+    """The compiled, cached matcher agrees with plain pathspec matching."""
+
+    PATTERNS = [
+        "*.log",
+        "generated/",
+        "/dist",
+        "docs/**/*.md",
+        "**/fixtures",
+        "tmp?",
+        "secret.py",
+        "a/*/c",
+    ]
+
+    def _random_paths(self, count: int) -> list[str]:
+        rng = random.Random(7)
+        names = [
+            "src", "lib", "generated", "dist", "docs", "fixtures", "tmp1",
+            "a", "b", "c", "node_modules", "build", "api",
+        ]
+        files = ["main.py", "run.log", "secret.py", "guide.md", "index.ts", "c"]
+        paths = []
+        for _ in range(count):
+            dirs = rng.choices(names, k=rng.randint(0, 4))
+            paths.append("/".join([*dirs, rng.choice(files)]))
+        return paths
+
+    def test_matches_pathspec(self, tmp_path: Path) -> None:
+        _make_gitignore(tmp_path, self.PATTERNS[:5])
+        (tmp_path / ".codebasegraphignore").write_text(
+            "\n".join(self.PATTERNS[5:]) + "\n"
+        )
+        filt = FileFilter(tmp_path)
+        assert filt._ignore_regex is not None
+        for rel_path in self._random_paths(2000):
+            assert filt.should_include(rel_path) == _reference_include(
+                tmp_path, rel_path
+            ), rel_path
+
+    def test_matches_git_with_negation(self, tmp_path: Path) -> None:
+        _make_gitignore(tmp_path, [*self.PATTERNS, "!src/run.log", "!fixtures/"])
+        filt = FileFilter(tmp_path)
+        assert filt._ignore_regex is None
+        paths = self._random_paths(2000)
+        expected = _git_include(tmp_path, paths)
+        for rel_path in paths:
+            assert filt.should_include(rel_path) == expected[rel_path], rel_path
+
+    def test_excluded_directory_short_circuits(self, tmp_path: Path) -> None:
+        _make_gitignore(tmp_path, ["generated/"])
+        filt = FileFilter(tmp_path)
+        for i in range(50):
+            assert not filt.should_include(f"generated/deep/f{i}.py")
+        # The directory decisions were computed once each
+        assert filt._dir_excluded.cache_info().misses == 2
+
+    def test_cache_is_bounded(self, tmp_path: Path) -> None:
+        filt = FileFilter(tmp_path, cache_size=8)
+        for i in range(100):
+            assert filt.should_include(f"src/f{i}.py")
+        assert filt._cached_include.cache_info().currsize == 8
+
+
+def _touch(root: Path, *rel_paths: str) -> None:
+    for rel_path in rel_paths:
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+
+
+class TestFileFilterWalk:
+    """Traversal that prunes ignored directories."""
+
+    def test_lists_included_source_files_in_order(self, tmp_path: Path) -> None:
+        _touch(
+            tmp_path,
+            "src/b.py",
+            "src/a/z.ts",
+            "src/a.py",
+            "main.py",
+            "README.md",
+            "src/debug.log",
+        )
+        filt = FileFilter(tmp_path)
+        assert list(filt.walk()) == ["main.py", "src/a/z.ts", "src/a.py", "src/b.py"]
+
+    def test_ignored_directories_are_not_read(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _touch(
+            tmp_path,
+            "src/app.py",
+            "node_modules/dep/index.js",
+            "pkg/generated/api.py",
+            "pkg/lib.py",
+        )
+        _make_gitignore(tmp_path / "pkg", ["generated/"])
+
+        scanned: list[str] = []
+        real_scandir = os.scandir
+
+        def recording_scandir(path):
+            scanned.append(Path(path).relative_to(tmp_path).as_posix())
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", recording_scandir)
+        assert list(FileFilter(tmp_path).walk()) == ["pkg/lib.py", "src/app.py"]
+        assert sorted(scanned) == [".", "pkg", "src"]
+
+    def test_extensions(self, tmp_path: Path) -> None:
+        _touch(tmp_path, "a.py", "b.ts")
+        assert list(FileFilter(tmp_path).walk(extensions={".ts"})) == ["b.ts"]
+
+    def test_symlinked_directory_not_followed(self, tmp_path: Path) -> None:
+        _touch(tmp_path, "real/a.py")
+        (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+        assert list(FileFilter(tmp_path).walk()) == ["real/a.py"]
+
+    def test_matches_should_include(self, tmp_path: Path) -> None:
+        _touch(
+            tmp_path,
+            "src/a.py",
+            "src/gen/b.py",
+            "src/c.gen.py",
+            "build/d.py",
+            "lib/e.py",
+        )
+        _make_gitignore(tmp_path, ["*.gen.py", "/lib"])
+        _make_gitignore(tmp_path / "src", ["gen/"])
+        filt = FileFilter(tmp_path)
+        assert list(filt.walk()) == ["src/a.py"]
+
+
+class TestFileFilterNestedGitignore:
+    """Nested .gitignore files apply relative to their own directory."""
+
+    def test_nested_patterns_are_relative(self, tmp_path: Path) -> None:
+        (tmp_path / "packages" / "web").mkdir(parents=True)
+        _make_gitignore(tmp_path / "packages" / "web", ["gen/", "/local.py"])
+        filt = FileFilter(tmp_path)
+        assert not filt.should_include("packages/web/gen/api.py")
+        assert not filt.should_include("packages/web/src/gen/api.py")
+        assert not filt.should_include("packages/web/local.py")
+        assert filt.should_include("packages/web/src/local.py")
+        # Outside the nested directory the rules don't apply
+        assert filt.should_include("gen/api.py")
+        assert filt.should_include("packages/api/gen/api.py")
+
+    def test_nested_negation_overrides_root(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg").mkdir()
+        _make_gitignore(tmp_path, ["*.gen.py"])
+        _make_gitignore(tmp_path / "pkg", ["!keep.gen.py"])
+        filt = FileFilter(tmp_path)
+        assert not filt.should_include("other.gen.py")
+        assert not filt.should_include("pkg/other.gen.py")
+        assert filt.should_include("pkg/keep.gen.py")
+
+    def test_nested_negation_keeps_custom_ignore(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg").mkdir()
+        _make_codebasegraphignore(tmp_path, ["keep.gen.py"])
+        _make_gitignore(tmp_path / "pkg", ["*.py", "!keep.gen.py"])
+        filt = FileFilter(tmp_path)
+        assert not filt.should_include("pkg/keep.gen.py")
+
+    def test_dir_negation_does_not_reinclude_files(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg" / "a").mkdir(parents=True)
+        _make_gitignore(tmp_path / "pkg", ["*.py"])
+        _make_gitignore(tmp_path / "pkg" / "a", ["!gen/"])
+        filt = FileFilter(tmp_path)
+        assert filt.should_include_dir("pkg/a/gen")
+        assert not filt.should_include("pkg/a/gen/g.py")
+
+    def test_nested_negations_match_git(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg" / "a" / "b").mkdir(parents=True)
+        _make_gitignore(tmp_path, ["*.log", "gen/", "!keep/"])
+        _make_gitignore(tmp_path / "pkg", ["*.py", "!*.keep.py", "out/", "!gen/"])
+        _make_gitignore(tmp_path / "pkg" / "a", ["!gen/", "!out/", "!*.log", "keep/"])
+        _make_gitignore(tmp_path / "pkg" / "a" / "b", ["!*.py", "gen/*", "!gen/x.py"])
+        dirs = ["", "pkg/", "pkg/a/", "pkg/a/b/", "pkg/c/"]
+        subdirs = ["", "gen/", "out/", "keep/", "gen/out/", "keep/gen/"]
+        files = ["x.py", "y.keep.py", "run.log", "index.ts"]
+        paths = [f"{d}{s}{f}" for d in dirs for s in subdirs for f in files]
+
+        filt = FileFilter(tmp_path)
+        expected = _git_include(tmp_path, paths)
+        for rel_path in paths:
+            assert filt.should_include(rel_path) == expected[rel_path], rel_path
+
+    def test_should_include_dir(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg").mkdir()
+        _make_gitignore(tmp_path / "pkg", ["generated/"])
+        filt = FileFilter(tmp_path)
+        assert not filt.should_include_dir("pkg/generated")
+        assert not filt.should_include_dir("pkg/generated/deep")
+        assert not filt.should_include_dir("src/node_modules")
+        assert filt.should_include_dir("pkg/src")
+        assert filt.should_include_dir("")
+
+    def test_negation_disables_directory_pruning(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg").mkdir()
+        _make_gitignore(tmp_path / "pkg", ["generated/*", "!generated/keep.py"])
+        filt = FileFilter(tmp_path)
+        assert filt.should_include_dir("pkg/generated")
+        assert filt.should_include("pkg/generated/keep.py")
+        assert not filt.should_include("pkg/generated/other.py")
+
+    def test_invalidate_nested(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg").mkdir()
+        filt = FileFilter(tmp_path)
+        assert filt.should_include("pkg/gen/api.py")
+
+        _make_gitignore(tmp_path / "pkg", ["gen/"])
+        assert filt.should_include("pkg/gen/api.py")  # cached decision
+        assert filt.invalidate("pkg/.gitignore")
+        assert not filt.should_include("pkg/gen/api.py")
+
+    def test_invalidate_root(self, tmp_path: Path) -> None:
+        filt = FileFilter(tmp_path)
+        assert filt.should_include("debug.log")
+        _make_codebasegraphignore(tmp_path, ["*.log"])
+        assert filt.invalidate(".codebasegraphignore")
+        assert not filt.should_include("debug.log")
+
+    def test_invalidate_ignores_other_files(self, tmp_path: Path) -> None:
+        filt = FileFilter(tmp_path)
+        assert not filt.invalidate("src/main.py")
+        assert not filt.invalidate("pkg/.codebasegraphignore")
+
+    def test_watcher_invalidates_on_ignore_change(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg").mkdir()
+        watcher = CodebaseWatcher(tmp_path)
+        assert watcher._is_relevant("pkg/gen/api.py")
+
+        _make_gitignore(tmp_path / "pkg", ["gen/"])
+        changes = {
+            (watchfiles.Change.added, str(tmp_path / "pkg" / ".gitignore")),
+            (watchfiles.Change.modified, str(tmp_path / "pkg" / "gen" / "api.py")),
+        }
+        assert watcher._relevant_paths(changes) == []
+
+
+# ═══════════════════════════════════════════════════════════════════
+# HashStrategy Tests
+# ═══════════════════════════════════════════════════════════════════
+
+
+class TestHashStrategies:
+    """Every selectable strategy behaves the same through the base interface."""
+
+    @pytest.mark.parametrize("name", HASH_STRATEGY_NAMES)
+    def test_shared_interface(self, tmp_path: Path, name: str) -> None:
+        (tmp_path / "a.py").write_text("hello")
+        strategy = make_hash_strategy(name)
+
+        assert isinstance(strategy, HashStrategy)
+        assert strategy.name == strategy.algorithm.name
+        assert strategy.tag == strategy.algorithm.tag
+
+        digest = strategy.hash_file(tmp_path / "a.py")
+        assert digest == strategy.algorithm.digest_file(tmp_path / "a.py")
+        assert digest.startswith(f"{strategy.tag}:")
+        assert strategy.hash_file(tmp_path / "missing.py") == ""
+        assert strategy.hash_many(tmp_path, ["a.py", "missing.py"]) == {
+            "a.py": digest,
+            "missing.py": "",
+        }
+        assert strategy.blob_hash(hash_blob(tmp_path / "a.py")) in (None, digest)
+
+    def test_git_strategy_hashes_blob_ids(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("hello")
+        strategy = make_hash_strategy("git")
+        assert strategy.name == "git"
+        assert strategy.hash_file(tmp_path / "a.py") == (
+            "git-blob:" + hash_blob(tmp_path / "a.py")
+        )
+
+
 # ═══════════════════════════════════════════════════════════════════
 # ContentHasher Tests
 # ═══════════════════════════════════════════════════════════════════
@@ -327,6 +659,146 @@ class TestContentHasher:
         hasher.compute_initial(["a.py", "b.py"])
         assert hasher.hashes["a.py"] != hasher.hashes["b.py"]
 
+    def test_default_strategy_is_sha256(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("hello")
+        hasher = ContentHasher(tmp_path)
+        hasher.compute_initial(["a.py"])
+        assert hasher.strategy.name == "sha256"
+        assert hasher.get("a.py") == "sha256:" + _hash_file(tmp_path / "a.py")
+
+    def test_algorithm_option(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("hello")
+        hasher = ContentHasher(tmp_path, HashStrategy("blake2b"))
+        hasher.compute_initial(["a.py"])
+        digest = hasher.get("a.py")
+        assert digest.startswith("blake2b-128:")
+        assert len(digest.partition(":")[2]) == 32
+        assert digest != ContentHasher(tmp_path).strategy.hash_file(tmp_path / "a.py")
+
+    def test_parallel_matches_serial(self, tmp_path: Path) -> None:
+        rel_paths = [f"f{i}.py" for i in range(100)]
+        for i, rel_path in enumerate(rel_paths):
+            (tmp_path / rel_path).write_text(f"x = {i}\n")
+        serial = ContentHasher(tmp_path)
+        serial.compute_initial(rel_paths)
+        parallel = ContentHasher(tmp_path, workers=4)
+        parallel.compute_initial(rel_paths + ["missing.py"])
+        assert parallel.hashes == {**serial.hashes, "missing.py": ""}
+
+    def test_custom_strategy(self, tmp_path: Path) -> None:
+        class SizeStrategy(HashStrategy):
+            def hash_file(self, path: Path) -> str:
+                return str(path.stat().st_size) if path.exists() else ""
+
+        (tmp_path / "a.py").write_text("hello")
+        hasher = ContentHasher(tmp_path, SizeStrategy())
+        hasher.compute_initial(["a.py"])
+        assert hasher.get("a.py") == "5"
+        (tmp_path / "a.py").write_text("world")
+        assert not hasher.check_and_update("a.py")
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Backdate a file's mtime so its hash isn't racily clean."""
+    old = time.time_ns() - seconds * 1_000_000_000
+    os.utime(path, ns=(old, old))
+
+
+class TestStatFastPath:
+    """Tests for skipping reads when a file's stat data is unchanged."""
+
+    def test_unchanged_stat_skips_read(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_text("hello")
+        _age(f)
+        hasher = ContentHasher(tmp_path)
+        hasher.compute_initial(["a.py"])
+        mtime = f.stat().st_mtime_ns
+
+        # Same size, same mtime, same inode: content is trusted unchanged
+        f.write_text("world")
+        os.utime(f, ns=(mtime, mtime))
+        assert not hasher.check_and_update("a.py")
+        assert hasher.stat_hits == 1
+
+    def test_changed_stat_rehashes(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_text("hello")
+        _age(f)
+        hasher = ContentHasher(tmp_path)
+        hasher.compute_initial(["a.py"])
+
+        f.write_text("hello world")
+        assert hasher.check_and_update("a.py")
+        assert hasher.stat_hits == 0
+
+    def test_touch_without_change(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_text("hello")
+        _age(f)
+        hasher = ContentHasher(tmp_path)
+        hasher.compute_initial(["a.py"])
+
+        _age(f, seconds=30)
+        assert not hasher.check_and_update("a.py")
+        assert hasher.stat_hits == 0
+        # The re-read recorded the new stat data
+        assert not hasher.check_and_update("a.py")
+        assert hasher.stat_hits == 1
+
+    def test_racily_clean_file_is_rehashed(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_text("hello")
+        hasher = ContentHasher(tmp_path)
+        hasher.compute_initial(["a.py"])
+        mtime = f.stat().st_mtime_ns
+
+        # Rewritten within the racy window, stat data identical
+        f.write_text("world")
+        os.utime(f, ns=(mtime, mtime))
+        assert hasher.check_and_update("a.py")
+        assert hasher.stat_hits == 0
+
+    def test_deleted_file(self, tmp_path: Path) -> None:
+        f = tmp_path / "a.py"
+        f.write_text("hello")
+        _age(f)
+        hasher = ContentHasher(tmp_path)
+        hasher.compute_initial(["a.py"])
+        f.unlink()
+        assert hasher.check_and_update("a.py")
+        assert hasher.get("a.py") is None
+
+    def test_store_reused_across_instances(self, tmp_path: Path) -> None:
+        for name in ("a.py", "b.py"):
+            (tmp_path / name).write_text(name)
+            _age(tmp_path / name)
+        store = HashStore(tmp_path / "hashes.db")
+        first = ContentHasher(tmp_path, store=store)
+        first.compute_initial(["a.py", "b.py"])
+        assert first.stat_hits == 0
+
+        (tmp_path / "b.py").write_text("changed")
+        _age(tmp_path / "b.py", seconds=30)
+        second = ContentHasher(tmp_path, store=store)
+        second.compute_initial(["a.py", "b.py"])
+        assert second.stat_hits == 1
+        assert second.hashes == {
+            "a.py": "sha256:" + _hash_file(tmp_path / "a.py"),
+            "b.py": "sha256:" + _hash_file(tmp_path / "b.py"),
+        }
+
+    def test_store_ignores_other_algorithm(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("hello")
+        _age(tmp_path / "a.py")
+        store = HashStore(tmp_path / "hashes.db")
+        ContentHasher(tmp_path, store=store).compute_initial(["a.py"])
+
+        hasher = ContentHasher(tmp_path, HashStrategy("blake2b"), store)
+        hasher.compute_initial(["a.py"])
+        assert hasher.stat_hits == 0
+        assert hasher.get("a.py").startswith("blake2b-128:")
+
 
 class TestHashFile:
     """Tests for the _hash_file utility function."""
@@ -405,6 +877,14 @@ class TestIncrementalPipeline:
         # Should have found symbols from our fixture files
         assert len(pipeline.state.symbols_by_file) > 0
 
+    def test_full_index_shares_path_strings(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
+        pipeline.full_index()
+
+        for path, table in pipeline.state.symbols_by_file.items():
+            assert table.files[0] is path
+
     def test_incremental_update_reparses_changed_file(self, tmp_path: Path) -> None:
         repo = _setup_git_repo(tmp_path)
         pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
@@ -522,6 +1002,106 @@ class TestIncrementalPipelineStateManagement:
             if f != "src/core/models.py":
                 assert f in current_files
 
+    def test_update_rescans_imports_only_for_changed_files(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import src.core.watcher as watcher_module
+
+        repo = _setup_git_repo(tmp_path)
+        pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
+        pipeline.full_index()
+        assert set(pipeline.state.imports_by_file) == set(
+            pipeline.state.symbols_by_file
+        )
+
+        scanned: list[str] = []
+        original = watcher_module.scan_file_imports
+
+        def counting_scan(file_path: str, project_root: str) -> list[str]:
+            scanned.append(file_path)
+            return original(file_path, project_root)
+
+        monkeypatch.setattr(watcher_module, "scan_file_imports", counting_scan)
+
+        (repo / "src" / "core" / "utils.py").write_text(
+            "from src.core import models\n\ndef helper():\n    return True\n",
+            encoding="utf-8",
+        )
+        pipeline.update_files(["src/core/utils.py"])
+
+        assert scanned == ["src/core/utils.py"]
+        assert pipeline.state.imports_by_file["src/core/utils.py"][1] == [
+            "src/core"
+        ]
+
+    def test_remove_files_drops_cached_imports(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
+        pipeline.full_index()
+        pipeline.remove_files(["src/core/utils.py"])
+        assert "src/core/utils.py" not in pipeline.state.imports_by_file
+
+    def test_update_patches_graph_incrementally(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
+        pipeline.full_index()
+
+        (repo / "src" / "core" / "utils.py").write_text(
+            "from src.core import models\n\nclass Helper:\n    pass\n",
+            encoding="utf-8",
+        )
+        content = pipeline.update_files(["src/core/utils.py"])
+
+        assert pipeline._graph.full_rebuilds == 1
+        fresh = IncrementalPipeline(repo, tmp_path / "fresh.md")
+        # The two runs may straddle a second boundary
+        assert _without_last_indexed(content) == _without_last_indexed(
+            fresh.full_index()
+        )
+        assert pipeline.state.modules == fresh.state.modules
+        assert pipeline.state.hierarchies == fresh.state.hierarchies
+
+    def test_update_refreshes_call_graph(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
+        pipeline.full_index()
+        assert pipeline.state.references.callers("src/core/models::User") == []
+
+        (repo / "src" / "core" / "utils.py").write_text(
+            "def helper():\n    return User()\n", encoding="utf-8"
+        )
+        content = pipeline.update_files(["src/core/utils.py"])
+
+        references = pipeline.state.references
+        assert references.callers("src/core/models::User") == [
+            "src/core/utils::helper"
+        ]
+        assert "src/core/utils::helper,src/core/models::User" in content
+
+    def test_manifests_reparsed_only_when_changed(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        repo = _setup_git_repo(tmp_path)
+        pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
+        pipeline.full_index()
+
+        parsed: list[Path] = []
+        original = pipeline._manifest_parser.parse
+        monkeypatch.setattr(
+            pipeline._manifest_parser,
+            "parse",
+            lambda root: parsed.append(root) or original(root),
+        )
+        pipeline.update_files(["src/core/models.py"])
+        assert parsed == []
+
+        (repo / "package.json").write_text(
+            '{"dependencies": {"express": "^4.18.2"}}', encoding="utf-8"
+        )
+        pipeline.update_files(["src/core/models.py"])
+        assert len(parsed) == 1
+        assert [d.name for d in pipeline.state.dependencies] == ["express"]
+
     def test_modules_rebuilt_on_update(self, tmp_path: Path) -> None:
         repo = _setup_git_repo(tmp_path)
         pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
@@ -534,11 +1114,267 @@ class TestIncrementalPipelineStateManagement:
         assert len(pipeline.state.modules) == initial_modules
 
 
+class TestIncrementalPipelineOutput:
+    """Tests for skipping output writes when only last_indexed changes."""
+
+    @pytest.fixture(autouse=True)
+    def _ticking_clock(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        import src.core.writer as writer_module
+
+        ticks = iter(range(10_000))
+        monkeypatch.setattr(
+            writer_module,
+            "_utc_timestamp",
+            lambda: f"2026-01-01T00:00:{next(ticks):02d}Z",
+        )
+
+    def _comment_edit(self, repo: Path) -> str:
+        path = repo / "src" / "core" / "utils.py"
+        path.write_text(path.read_text(encoding="utf-8") + "# note\n", encoding="utf-8")
+        return "src/core/utils.py"
+
+    def test_new_timestamp_is_written_by_default(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        output = repo / ".codebase.md"
+        pipeline = IncrementalPipeline(repo, output)
+        pipeline.full_index()
+
+        content = pipeline.update_files([self._comment_edit(repo)])
+
+        assert pipeline.output_changed
+        assert pipeline.writes_skipped == 0
+        assert output.read_text(encoding="utf-8") == content
+        assert "last_indexed: 2026-01-01T00:00:01Z" in content
+
+    def test_unchanged_structure_skips_write(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        output = repo / ".codebase.md"
+        pipeline = IncrementalPipeline(repo, output, stable_timestamp=True)
+        pipeline.full_index()
+        assert pipeline.output_changed
+        written = output.read_text(encoding="utf-8")
+
+        pipeline.update_files([self._comment_edit(repo)])
+
+        assert not pipeline.output_changed
+        assert pipeline.writes_skipped == 1
+        assert output.read_text(encoding="utf-8") == written
+
+    def test_structural_change_is_written(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        output = repo / ".codebase.md"
+        pipeline = IncrementalPipeline(repo, output)
+        pipeline.full_index()
+
+        (repo / "src" / "core" / "utils.py").write_text(
+            "def renamed():\n    pass\n", encoding="utf-8"
+        )
+        content = pipeline.update_files(["src/core/utils.py"])
+
+        assert pipeline.output_changed
+        assert output.read_text(encoding="utf-8") == content
+        assert "renamed" in content
+
+    def test_stable_timestamp_returns_content_on_disk(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        output = repo / ".codebase.md"
+        pipeline = IncrementalPipeline(repo, output, stable_timestamp=True)
+        first = pipeline.full_index()
+
+        content = pipeline.update_files([self._comment_edit(repo)])
+
+        assert content == first == output.read_text(encoding="utf-8")
+        assert pipeline.state.metadata.last_indexed == "2026-01-01T00:00:00Z"
+
+    def test_existing_output_read_on_startup(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        output = repo / ".codebase.md"
+        IncrementalPipeline(repo, output, stable_timestamp=True).full_index()
+        mtime = output.stat().st_mtime_ns
+
+        restarted = IncrementalPipeline(repo, output, stable_timestamp=True)
+        restarted.full_index()
+
+        assert not restarted.output_changed
+        assert output.stat().st_mtime_ns == mtime
+
+    def test_deleted_output_is_rewritten(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        output = repo / ".codebase.md"
+        pipeline = IncrementalPipeline(repo, output)
+        pipeline.full_index()
+        output.unlink()
+
+        pipeline.update_files([self._comment_edit(repo)])
+
+        assert pipeline.output_changed
+        assert output.exists()
+
+
+class TestIncrementalPipelineCache:
+    """Tests for the persistent symbol cache integration."""
+
+    def _pipeline(self, repo: Path) -> IncrementalPipeline:
+        cache = SymbolCache(repo / ".codebase-graph" / "cache.db")
+        return IncrementalPipeline(repo, repo / ".codebase.md", cache=cache)
+
+    def test_warm_restart_parses_nothing(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        cold = self._pipeline(repo)
+        cold.full_index()
+
+        warm = self._pipeline(repo)
+        parsed: list[str] = []
+        original = warm._parser.iter_parse_files
+        warm._parser.iter_parse_files = lambda paths: (  # type: ignore[method-assign]
+            parsed.extend(paths) or original(paths)
+        )
+        warm.full_index()
+
+        assert parsed == []
+        assert warm.state.symbols_by_file == cold.state.symbols_by_file
+
+    def test_same_content_under_two_extensions(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        source = "interface Foo {\n  id: string;\n}\n"
+        (repo / "src" / "a.ts").write_text(source, encoding="utf-8")
+        (repo / "src" / "a.js").write_text(source, encoding="utf-8")
+        uncached = IncrementalPipeline(repo, tmp_path / "uncached.md")
+        uncached.full_index()
+
+        self._pipeline(repo).full_index()
+        warm = self._pipeline(repo)
+        warm.full_index()
+
+        for path in ("src/a.ts", "src/a.js"):
+            assert list(warm.state.symbols_by_file.get(path, [])) == list(
+                uncached.state.symbols_by_file.get(path, [])
+            )
+        assert any(s.name == "Foo" for s in warm.state.symbols_by_file["src/a.ts"])
+
+    def test_warm_restart_reparses_only_changed(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        self._pipeline(repo).full_index()
+
+        (repo / "src" / "core" / "utils.py").write_text(
+            "def helper():\n    return True\n\ndef other():\n    return 1\n",
+            encoding="utf-8",
+        )
+
+        warm = self._pipeline(repo)
+        parsed: list[str] = []
+        original = warm._parser.iter_parse_files
+        warm._parser.iter_parse_files = lambda paths: (  # type: ignore[method-assign]
+            parsed.extend(paths) or original(paths)
+        )
+        warm.full_index()
+
+        assert parsed == ["src/core/utils.py"]
+        names = {s.name for s in warm.state.symbols_by_file["src/core/utils.py"]}
+        assert names == {"helper", "other"}
+
+    def test_update_files_populates_cache(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        pipeline = self._pipeline(repo)
+        pipeline.full_index()
+
+        models = repo / "src" / "core" / "models.py"
+        models.write_text("class Admin:\n    pass\n", encoding="utf-8")
+        pipeline.update_files(["src/core/models.py"])
+
+        content_hash = pipeline.hasher.get("src/core/models.py")
+        assert content_hash
+        cached = pipeline._cache.get(content_hash, "src/core/models.py")
+        assert [s.name for s in cached] == ["Admin"]
+
+    def test_full_index_records_hashes(self, tmp_path: Path) -> None:
+        repo = _setup_git_repo(tmp_path)
+        pipeline = IncrementalPipeline(repo, repo / ".codebase.md")
+        pipeline.full_index()
+        assert pipeline.hasher.get("src/core/models.py")
+
+
 # ═══════════════════════════════════════════════════════════════════
 # CodebaseWatcher Tests
 # ═══════════════════════════════════════════════════════════════════
 
 
+class TestChangeCoalescer:
+    """Tests for merging change batches into bursts."""
+
+    class _Clock:
+        def __init__(self) -> None:
+            self.now = 0.0
+
+        def __call__(self) -> float:
+            return self.now
+
+        def advance(self, ms: int) -> None:
+            self.now += ms / 1000
+
+    def test_flushes_after_quiet_period(self) -> None:
+        clock = self._Clock()
+        coalescer = ChangeCoalescer(quiet_ms=100, max_latency_ms=1000, clock=clock)
+        coalescer.add(["a.py", "b.py"])
+        clock.advance(50)
+        coalescer.add(["a.py", "c.py"])
+        clock.advance(99)
+        assert not coalescer.ready()
+        clock.advance(1)
+        assert coalescer.ready()
+        assert coalescer.drain() == ["a.py", "b.py", "c.py"]
+        assert not coalescer.ready()
+
+    def test_max_latency_caps_a_continuous_burst(self) -> None:
+        clock = self._Clock()
+        coalescer = ChangeCoalescer(quiet_ms=100, max_latency_ms=300, clock=clock)
+        for i in range(3):
+            coalescer.add([f"f{i}.py"])
+            clock.advance(90)
+            assert not coalescer.ready()
+        coalescer.add(["f3.py"])
+        clock.advance(30)
+        assert coalescer.ready()
+
+    def test_due_in_ms(self) -> None:
+        clock = self._Clock()
+        coalescer = ChangeCoalescer(quiet_ms=100, max_latency_ms=300, clock=clock)
+        assert coalescer.due_in_ms() is None
+        coalescer.add(["a.py"])
+        assert coalescer.due_in_ms() == 100
+        clock.advance(80)
+        coalescer.add(["b.py"])
+        assert coalescer.due_in_ms() == 100
+        clock.advance(180)
+        coalescer.add(["c.py"])
+        assert coalescer.due_in_ms() == 40  # capped by max_latency_ms
+        clock.advance(50)
+        assert coalescer.due_in_ms() == 0
+        coalescer.drain()
+        assert coalescer.due_in_ms() is None
+
+    def test_zero_quiet_flushes_every_batch(self) -> None:
+        coalescer = ChangeCoalescer(quiet_ms=0, max_latency_ms=0)
+        coalescer.add(["a.py"])
+        assert coalescer.ready()
+
+    def test_metrics(self) -> None:
+        clock = self._Clock()
+        coalescer = ChangeCoalescer(quiet_ms=100, clock=clock)
+        for _ in range(5):
+            coalescer.add(["a.py", "b.py"])
+        coalescer.add([])  # empty batches don't count
+        assert coalescer.rebuilds_saved == 4
+        clock.advance(100)
+        assert coalescer.drain() == ["a.py", "b.py"]
+
+        assert coalescer.batches == 5
+        assert coalescer.flushes == 1
+        assert coalescer.rebuilds_saved == 4
+        assert coalescer.paths_received == 10
+        assert coalescer.paths_flushed == 2
+
+
 class TestCodebaseWatcher:
     """Tests for the watchfiles-based file watcher."""
 
@@ -607,6 +1443,110 @@ class TestCodebaseWatcher:
             watcher.stop()
             time.sleep(0.2)
 
+    @staticmethod
+    def _fake_notifier(
+        monkeypatch: pytest.MonkeyPatch, results: list[object]
+    ) -> tuple[list[tuple[object, ...]], list[tuple[object, ...]]]:
+        """Replace the Rust notifier with one replaying results, then stopping.
+
+        Returns the constructor arguments and the watch() calls it receives.
+        """
+        created: list[tuple[object, ...]] = []
+        waits: list[tuple[object, ...]] = []
+        pending = iter(results)
+
+        class FakeNotify:
+            def __init__(self, *args: object) -> None:
+                created.append(args)
+
+            def __enter__(self) -> "FakeNotify":
+                return self
+
+            def __exit__(self, *exc: object) -> None:
+                pass
+
+            def watch(self, debounce, step, timeout_ms, stop_event):
+                waits.append((debounce, timeout_ms))
+                result = next(pending, "stop")
+                if result == "timeout":
+                    time.sleep(timeout_ms / 1000)
+                return result
+
+        monkeypatch.setattr(watcher_module, "RustNotify", FakeNotify)
+        return created, waits
+
+    def test_idle_watcher_waits_without_short_timeout(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Only a pending burst makes the notifier wake up on a short timeout."""
+        _, waits = self._fake_notifier(
+            monkeypatch,
+            [{(watchfiles.Change.modified.value, str(tmp_path / "a.py"))}, "timeout"],
+        )
+        (tmp_path / "a.py").write_text("x = 1")
+        changes: list[list[str]] = []
+        watcher = CodebaseWatcher(tmp_path, quiet_ms=100, git_aware=False)
+        watcher.watch(changes.append)
+
+        timeouts = [timeout for _, timeout in waits]
+        assert changes == [["a.py"]]
+        assert timeouts[0] == timeouts[2] == watcher_module.IDLE_TIMEOUT_MS
+        assert 0 < timeouts[1] <= 100
+
+    def test_zero_window_flushes_each_batch(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _, waits = self._fake_notifier(
+            monkeypatch,
+            [{(watchfiles.Change.modified.value, str(tmp_path / "a.py"))}],
+        )
+        (tmp_path / "a.py").write_text("x = 1")
+        changes: list[list[str]] = []
+        watcher = CodebaseWatcher(
+            tmp_path, quiet_ms=0, max_latency_ms=0, git_aware=False
+        )
+        watcher.watch(changes.append)
+
+        assert changes == [["a.py"]]
+        assert [debounce for debounce, _ in waits] == [0, 0]
+
+    def test_notifier_uses_watchfiles_defaults(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        created, _ = self._fake_notifier(monkeypatch, [])
+        monkeypatch.setenv("WATCHFILES_FORCE_POLLING", "1")
+        CodebaseWatcher(tmp_path, git_aware=False).watch(lambda files: None)
+
+        [(paths, _debug, force_polling, *_)] = created
+        assert paths == [str(tmp_path.resolve())]
+        assert force_polling is True
+
+    def test_watcher_coalesces_burst(self, tmp_path: Path) -> None:
+        """A burst of writes should produce far fewer callbacks than writes."""
+        changes: list[list[str]] = []
+
+        watcher = CodebaseWatcher(
+            tmp_path, on_change=changes.append, quiet_ms=300, max_latency_ms=5000
+        )
+        watcher.start_background()
+
+        try:
+            time.sleep(0.3)
+            # Spaced out enough for watchfiles to report separate batches
+            for i in range(10):
+                (tmp_path / f"mod{i}.py").write_text(f"x = {i}")
+                time.sleep(0.08)
+
+            time.sleep(1.5)
+
+            all_changed = [f for batch in changes for f in batch]
+            assert sorted(all_changed) == sorted(f"mod{i}.py" for i in range(10))
+            assert len(changes) <= 2
+            assert watcher.coalescer.rebuilds_saved >= 1
+        finally:
+            watcher.stop()
+            time.sleep(0.2)
+
     def test_watcher_filters_ignored_files(self, tmp_path: Path) -> None:
         """Files in ignored directories should not trigger callbacks."""
         changes: list[list[str]] = []
@@ -7,12 +7,14 @@ import pytest
 from src.core.graph import Hierarchy, Module
 from src.core.manifest import Dependency
 from src.core.parser import Symbol
+from src.core.references import CallEdge
 from src.core.writer import (
     CodebaseMeta,
     CodebaseWriter,
     _escape_value,
     _pipe_join,
     _PROMPT_FRAMING,
+    split_last_indexed,
 )
 
 
@@ -382,7 +384,7 @@ class TestSerializeHierarchies:
         ]
         result = self.writer._serialize_hierarchies(hierarchies)
         assert result.startswith(
-            "hierarchies[1]{symbol,relationship,target,file,line}:"
+            "hierarchies[1]{symbol,relationship,target,target_fqn,file,line}:"
         )
 
     def test_hierarchy_line_numbers_1_indexed(self):
@@ -397,7 +399,7 @@ class TestSerializeHierarchies:
         lines = result.strip().split("\n")
         row = lines[1].strip()
         fields = _split_toon_row(row)
-        assert fields[4] == "1"
+        assert fields[5] == "1"
 
     def test_extends_relationship(self):
         h = Hierarchy(
@@ -425,6 +427,17 @@ class TestSerializeHierarchies:
         assert "implements" in result
         assert "Authenticatable" in result
 
+    def test_target_fqn_column(self):
+        hierarchies = [
+            Hierarchy("a::X", "extends", "Y", "a.py", 1, "lib/base::Y"),
+            Hierarchy("a::X", "implements", "Z", "a.py", 1),
+        ]
+        rows = self.writer._serialize_hierarchies(hierarchies).split("\n")[1:]
+        assert [_split_toon_row(row.strip())[2:4] for row in rows] == [
+            ["Y", "lib/base::Y"],
+            ["Z", ""],
+        ]
+
     def test_count_matches(self):
         hierarchies = [
             Hierarchy("a::X", "extends", "Y", "a.py", 1),
@@ -571,6 +584,26 @@ class TestWrite:
         )
         assert "hierarchies[1]" in result
 
+    def test_output_includes_calls_bounded(self):
+        calls = [CallEdge(f"a::caller{i}", "b::target") for i in range(3)]
+        result = CodebaseWriter(max_call_edges=2).write(
+            modules=[],
+            hierarchies=[],
+            dependencies=[],
+            metadata=_meta(),
+            calls=calls,
+        )
+        assert "calls[2]{caller,callee}:\n  a::caller0,b::target\n" in result
+        assert "a::caller2" not in result
+
+    def test_output_omits_empty_calls(self):
+        import re
+
+        result = self.writer.write(
+            modules=[], hierarchies=[], dependencies=[], metadata=_meta()
+        )
+        assert not re.search(r"calls\[\d+\]\{", result)
+
     def test_output_includes_dependencies_when_present(self):
         deps = [Dependency("express", "^4.18.2", "runtime")]
         result = self.writer.write(
@@ -775,6 +808,115 @@ class TestEdgeCases:
         assert "Trust these locations" in result
 
 
+# ── Fragment cache ────────────────────────────────────────────────
+
+
+class TestFragmentCache:
+    """Cached renders must be byte-identical to full renders."""
+
+    def _graph(self, n_modules: int = 4) -> tuple[list[Module], list[Hierarchy]]:
+        modules = [
+            _mod(
+                f"m{i}",
+                f"src/m{i}",
+                symbols=[
+                    _sym(f"f{j}", file=f"src/m{i}/a.py", line=j) for j in range(5)
+                ],
+                key_types=[f"T{i}"],
+            )
+            for i in range(n_modules)
+        ]
+        hierarchies = [
+            Hierarchy(
+                symbol=f"src/m{i}/a::T{i}",
+                relationship="extends",
+                target="Base",
+                file=f"src/m{i}/a.py",
+                line=1,
+            )
+            for i in range(n_modules)
+        ]
+        return modules, hierarchies
+
+    @pytest.mark.parametrize("max_symbols", [500, 7])
+    def test_edits_match_full_render(self, max_symbols):
+        writer = CodebaseWriter(max_symbols=max_symbols, verify=True)
+        modules, hierarchies = self._graph()
+        deps = [Dependency("pytest", ">=8.0", "dev")]
+
+        writer.write(modules, hierarchies, deps, _meta())
+
+        # Edit one module's symbols in place, as IncrementalGraph does
+        modules[1].symbols[2] = _sym("renamed", file="src/m1/a.py", line=2)
+        writer.write(modules, hierarchies, deps, _meta())
+
+        # Grow one module (shifts truncation budgets) and change deps
+        modules[3].symbols.append(_sym("Extra", kind="class", file="src/m3/a.py"))
+        modules[0].depends_on = ["m3"]
+        hierarchies = hierarchies[1:]
+        deps = [*deps, Dependency("x", "1", "runtime")]
+        writer.write(modules, hierarchies, deps, _meta())
+
+        # Drop a module entirely
+        writer.write(modules[1:], hierarchies, deps, _meta())
+
+    def test_unchanged_modules_are_not_rerendered(self, monkeypatch):
+        import src.core.writer as writer_module
+
+        writer = CodebaseWriter()
+        modules, hierarchies = self._graph()
+        writer.write(modules, hierarchies, [], _meta())
+
+        rendered: list[str] = []
+        original = writer_module._symbol_row
+        monkeypatch.setattr(
+            writer_module,
+            "_symbol_row",
+            lambda sym: rendered.append(sym.file) or original(sym),
+        )
+        modules[2].symbols = [_sym("changed", file="src/m2/a.py")]
+        writer.write(modules, hierarchies, [], _meta())
+
+        assert rendered == ["src/m2/a.py"]
+
+    def test_verify_detects_stale_fragment(self):
+        writer = CodebaseWriter(verify=True)
+        modules, hierarchies = self._graph()
+        writer.write(modules, hierarchies, [], _meta())
+
+        # Corrupt a cached fragment while keeping its key valid
+        key, _, count = writer._symbol_fragments["src/m0"]
+        writer._symbol_fragments["src/m0"] = (key, "  bogus", count)
+
+        with pytest.raises(RuntimeError, match="differs from a full render"):
+            writer.write(modules, hierarchies, [], _meta())
+
+    def test_generated_timestamp_is_shared_with_verification(self):
+        writer = CodebaseWriter(verify=True)
+        meta = CodebaseMeta(name="proj", languages=["python"])
+        result = writer.write([], [], [], meta)
+        assert "last_indexed: " in result
+        assert meta.last_indexed is None
+
+
+class TestSplitLastIndexed:
+    def test_splits_around_timestamp(self):
+        content = CodebaseWriter().write([], [], [], _meta())
+        before, timestamp, after = split_last_indexed(content)
+        assert timestamp == "2026-02-15T21:00:00Z"
+        assert before + timestamp + after == content
+        assert before.endswith("last_indexed: ")
+
+    def test_same_structure_different_time(self):
+        writer = CodebaseWriter()
+        a = split_last_indexed(writer.write([], [], [], _meta(last_indexed="t1")))
+        b = split_last_indexed(writer.write([], [], [], _meta(last_indexed="t2")))
+        assert (a[0], a[2]) == (b[0], b[2])
+
+    def test_missing_timestamp(self):
+        assert split_last_indexed("no metadata") == ("no metadata", None, "")
+
+
 # ── Round-trip / structure validation ─────────────────────────────
 
 